@@ -0,0 +1,102 @@
+# _*_ coding: utf-8 _*_
+import typing
+
+import pytest  # type: ignore
+
+from .corpus import get_skipped_examples, load_corpus, measure_peak_memory
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+PEAK_MEMORY_REPORT: typing.Dict[str, typing.Dict[str, int]] = dict()
+INSTANCE_MEMORY_REPORT: typing.Dict[str, typing.Dict[str, int]] = dict()
+PYTHON_CALLS_REPORT: typing.Dict[str, float] = dict()
+
+
+def pytest_addoption(parser):
+    """ """
+    group = parser.getgroup("fhir-benchmark")
+    group.addoption(
+        "--fhir-resource-type",
+        action="append",
+        default=None,
+        help="Only benchmark given resource type(s), comma separated value "
+        "or option can be repeated.",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize every benchmark by resource type found in the corpus."""
+    if "resource_type" not in metafunc.fixturenames:
+        return
+    selected = metafunc.config.getoption("fhir_resource_type")
+    if selected:
+        selected = [t.strip() for val in selected for t in val.split(",")]
+    corpus = load_corpus(selected)
+    metafunc.parametrize("resource_type", list(corpus.keys()))
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    """ """
+    return load_corpus()
+
+
+@pytest.fixture
+def examples(corpus, resource_type):
+    """All examples (file name, raw bytes, json data) of the resource type."""
+    return corpus[resource_type]
+
+
+@pytest.fixture
+def run_benchmark(benchmark, request, resource_type, examples):
+    """Benchmarks ``func`` over the examples, records the number of resources
+    per round and the peak memory of one round."""
+
+    def runner(func, *args):
+        benchmark.group = request.function.__name__
+        benchmark.extra_info["resources"] = len(examples)
+        benchmark.extra_info["skipped"] = len(
+            get_skipped_examples().get(resource_type, ())
+        )
+        peak = measure_peak_memory(lambda: func(*args))
+        benchmark.extra_info["peak_memory"] = peak
+        PEAK_MEMORY_REPORT.setdefault(benchmark.group, {})[resource_type] = peak
+        return benchmark(func, *args)
+
+    return runner
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Peak memory per benchmark group and resource type, memory per instance
+    per storage mode, Python calls per validated element, examples of the corpus
+    those failed to parse."""
+    if PEAK_MEMORY_REPORT:
+        terminalreporter.section("peak memory (KiB per round)")
+        for group, values in sorted(PEAK_MEMORY_REPORT.items()):
+            terminalreporter.write_line(group)
+            for resource_type, peak in sorted(values.items()):
+                terminalreporter.write_line(
+                    f"    {resource_type:<40} {peak / 1024:>12.1f}"
+                )
+    if INSTANCE_MEMORY_REPORT:
+        terminalreporter.section("memory per instance (KiB)")
+        for resource_type, values in sorted(INSTANCE_MEMORY_REPORT.items()):
+            terminalreporter.write_line(resource_type)
+            for mode, size in sorted(values.items()):
+                terminalreporter.write_line(f"    {mode:<40} {size / 1024:>12.1f}")
+    if PYTHON_CALLS_REPORT:
+        terminalreporter.section("python calls per validated element (parse_obj)")
+        for resource_type, calls in sorted(PYTHON_CALLS_REPORT.items()):
+            terminalreporter.write_line(f"    {resource_type:<40} {calls:>12.1f}")
+    skipped = get_skipped_examples()
+    if skipped:
+        terminalreporter.section(
+            f"skipped examples, failed to parse "
+            f"({sum(len(v) for v in skipped.values())})"
+        )
+        for resource_type, items in sorted(
+            skipped.items(), key=lambda item: str(item[0])
+        ):
+            terminalreporter.write_line(f"{resource_type} ({len(items)})")
+            for name, error in items:
+                terminalreporter.write_line(f"    {name}: {error}")
@@ -0,0 +1,169 @@
+# _*_ coding: utf-8 _*_
+"""Example corpus loader shared by all benchmarks.
+
+The corpus is the official FHIR R4 examples archive, the same one that is
+used by ``fhir.resources.tests.fixtures``. Set ``FHIR_UNITTEST_DATADIR`` to
+an already extracted directory (any directory with ``*.json`` resources works)
+to avoid the download.
+"""
+import gc
+import hashlib
+import os
+import pathlib
+import sys
+import tracemalloc
+import typing
+import zipfile
+from collections import OrderedDict
+
+from fhir.resources import get_fhir_model_class
+from fhir.resources.fhirabstractmodel import FHIRAbstractModel
+from fhir.resources.tests.fixtures import (
+    CACHE_PATH,
+    EXAMPLE_RESOURCES_URL,
+    download_and_store,
+)
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+# small fixtures of the test suite, used by benchmarks of single resources
+STATIC_PATH = pathlib.Path(__file__).parent.parent / "tests" / "static"
+
+CorpusItem = typing.Tuple[str, bytes, typing.Dict[str, typing.Any]]
+_CORPUS: typing.Optional[typing.Dict[str, typing.List[CorpusItem]]] = None
+# resource type (``None`` if unknown) -> [(file name, error), ...]
+_SKIPPED: typing.Dict[typing.Optional[str], typing.List[typing.Tuple[str, str]]] = {}
+
+
+def get_corpus_dir() -> pathlib.Path:
+    """Returns the directory that contains example json files,
+    downloads and extracts the archive into ``.cache`` if required."""
+    if "FHIR_UNITTEST_DATADIR" in os.environ:
+        return pathlib.Path(os.environ["FHIR_UNITTEST_DATADIR"])
+
+    if not os.path.exists(CACHE_PATH):
+        os.makedirs(CACHE_PATH)
+
+    file_id = hashlib.md5(EXAMPLE_RESOURCES_URL.encode()).hexdigest()
+    archive = pathlib.Path(CACHE_PATH) / (file_id + ".zip")
+    if not archive.exists():
+        download_and_store(EXAMPLE_RESOURCES_URL, str(archive))
+
+    target = pathlib.Path(CACHE_PATH) / file_id
+    if not target.exists():
+        with zipfile.ZipFile(archive) as z:
+            z.extractall(target)
+
+    zip_dir_name = pathlib.Path(EXAMPLE_RESOURCES_URL).name[:-4]
+    if (target / zip_dir_name).exists():
+        return target / zip_dir_name
+    return target
+
+
+def load_corpus(
+    resource_types: typing.Optional[typing.Iterable[str]] = None,
+) -> typing.Dict[str, typing.List[CorpusItem]]:
+    """Returns examples grouped by ``resourceType`` as
+    ``{resource_type: [(file name, raw bytes, parsed json), ...]}``.
+
+    Examples which cannot be parsed with the current models are not
+    benchmarked, they are recorded (see ``get_skipped_examples()``) and reported
+    with the results, so a parse regression doesn't pass for a speed-up.
+    """
+    global _CORPUS
+    if _CORPUS is None:
+        loads = FHIRAbstractModel.__config__.json_loads
+        corpus: typing.Dict[str, typing.List[CorpusItem]] = dict()
+        for path in sorted(get_corpus_dir().glob("*.json")):
+            raw = path.read_bytes()
+            resource_type = None
+            try:
+                data = loads(raw)
+                resource_type = data["resourceType"]
+                get_fhir_model_class(resource_type).parse_obj(data)
+            except Exception as exc:  # noqa: B902
+                error = " ".join(str(exc).split())[:200]
+                _SKIPPED.setdefault(resource_type, []).append(
+                    (path.name, f"{exc.__class__.__name__}: {error}")
+                )
+                continue
+            corpus.setdefault(resource_type, []).append((path.name, raw, data))
+        _CORPUS = OrderedDict(sorted(corpus.items()))
+
+    if resource_types is None:
+        return _CORPUS
+    resource_types = set(resource_types)
+    return OrderedDict((k, v) for k, v in _CORPUS.items() if k in resource_types)
+
+
+def get_skipped_examples() -> typing.Dict[
+    typing.Optional[str], typing.List[typing.Tuple[str, str]]
+]:
+    """Examples of the loaded corpus (see ``load_corpus()``) those failed to parse,
+    grouped by ``resourceType`` (``None`` when not known) as
+    ``{resource_type: [(file name, error), ...]}``."""
+    return _SKIPPED
+
+
+def measure_peak_memory(func: typing.Callable[[], typing.Any]) -> int:
+    """Runs ``func`` once and returns peak allocated memory in bytes."""
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    tracemalloc.clear_traces()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        if not started:
+            tracemalloc.stop()
+
+
+def measure_retained_memory(
+    func: typing.Callable[[], typing.Any], count: int = 100
+) -> int:
+    """Calls ``func`` ``count`` times and returns average memory in bytes those
+    are retained by each result (i.e. memory per model instance)."""
+    func()
+    gc.collect()
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        results = [func() for _ in range(count)]
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        if not started:
+            tracemalloc.stop()
+    del results
+    return retained // count
+
+
+def count_python_calls(func: typing.Callable[[], typing.Any]) -> int:
+    """Runs ``func`` once and returns the number of Python function calls (frames)
+    made, calls of C/Cython functions (i.e. compiled pydantic) are not counted."""
+    calls = 0
+
+    def profile(frame, event, arg):
+        nonlocal calls
+        if event == "call":
+            calls += 1
+
+    sys.setprofile(profile)
+    try:
+        func()
+    finally:
+        sys.setprofile(None)
+    return calls
+
+
+def count_elements(data: typing.Any) -> int:
+    """Number of JSON objects (resources, complex elements, primitive extensions)
+    in parsed json, each of them is validated as model."""
+    if isinstance(data, dict):
+        return 1 + sum(count_elements(v) for v in data.values())
+    if isinstance(data, list):
+        return sum(count_elements(v) for v in data)
+    return 0
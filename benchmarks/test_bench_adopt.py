@@ -0,0 +1,83 @@
+# _*_ coding: utf-8 _*_
+"""``Bundle`` assembly from 100k already validated resources (``Patient`` and
+``Observation`` made of the ``tests/static`` fixtures), default validation vs
+adoption mode (``fhir.resources.utils.adopt.adopting``)."""
+import json
+
+import pytest  # type: ignore
+
+from fhir.resources.bundle import Bundle, BundleEntry
+from fhir.resources.observation import Observation
+from fhir.resources.patient import Patient
+from fhir.resources.utils.adopt import adopting
+
+from .corpus import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+COUNT = 100000
+
+
+@pytest.fixture(scope="module")
+def resources():
+    """ """
+    patient = Patient.parse_obj(
+        json.loads((STATIC_PATH / "Patient-with-ext.json").read_bytes())
+    )
+    observation = Observation.parse_obj(
+        json.loads((STATIC_PATH / "Observation.json").read_bytes())
+    )
+    return [(patient, observation)[i % 2].copy() for i in range(COUNT)]
+
+
+@pytest.fixture(scope="module")
+def entries(resources):
+    """ """
+    return [BundleEntry(resource=resource) for resource in resources]
+
+
+def assemble_validated(resources):
+    """ """
+    return Bundle(
+        type="collection",
+        entry=[BundleEntry(resource=resource) for resource in resources],
+    )
+
+
+def assemble_adopted(resources):
+    """ """
+    with adopting():
+        bundle = Bundle(type="collection")
+        bundle.entry = [BundleEntry(resource=resource) for resource in resources]
+    return bundle
+
+
+def assign_entries(entries):
+    """ """
+    bundle = Bundle(type="collection")
+    bundle.entry = entries
+    return bundle
+
+
+def assign_entries_adopted(entries):
+    """ """
+    with adopting():
+        return assign_entries(entries)
+
+
+@pytest.mark.parametrize("assemble", [assemble_validated, assemble_adopted])
+def test_bundle_assembly(benchmark, resources, assemble):
+    """ """
+    benchmark.group = "bundle assembly"
+    benchmark.extra_info["resources"] = COUNT
+    bundle = benchmark(assemble, resources)
+    assert bundle.entry[1].resource is resources[1]
+
+
+@pytest.mark.parametrize("assign", [assign_entries, assign_entries_adopted])
+def test_bundle_entry_assignment(benchmark, entries, assign):
+    """ """
+    benchmark.group = "bundle entry assignment"
+    benchmark.extra_info["entries"] = COUNT
+    bundle = benchmark(assign, entries)
+    assert bundle.entry[1] is entries[1]
@@ -0,0 +1,115 @@
+# _*_ coding: utf-8 _*_
+"""Extension heavy resources (US Core like ``Patient``, nested extensions and
+extensions of primitive elements), 1000 ``Patient`` per round."""
+import pytest  # type: ignore
+
+from fhir.resources.patient import Patient
+from fhir.resources.tabular import extract_extension
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+COUNT = 1000
+US_CORE = "http://hl7.org/fhir/us/core/StructureDefinition"
+
+
+def make_patient(index):
+    """ """
+    race = {
+        "url": f"{US_CORE}/us-core-race",
+        "extension": [
+            {
+                "url": "ombCategory",
+                "valueCoding": {
+                    "system": "urn:oid:2.16.840.1.113883.6.238",
+                    "code": "2106-3",
+                    "display": "White",
+                },
+            },
+            {"url": "text", "valueString": "White"},
+        ],
+    }
+    return {
+        "resourceType": "Patient",
+        "id": f"p{index}",
+        "extension": [
+            race,
+            {"url": f"{US_CORE}/us-core-birthsex", "valueCode": "F"},
+            {
+                "url": "http://hl7.org/fhir/StructureDefinition/patient-birthPlace",
+                "valueAddress": {"city": "Boston", "state": "MA", "country": "US"},
+            },
+        ]
+        + [
+            {"url": f"http://example.org/ext-{i}", "valueBoolean": True}
+            for i in range(5)
+        ],
+        "gender": "female",
+        "birthDate": "1987-02-20",
+        "_birthDate": {
+            "extension": [
+                {
+                    "url": "http://hl7.org/fhir/StructureDefinition/patient-birthTime",
+                    "valueDateTime": "1987-02-20T09:30:00-05:00",
+                }
+            ]
+        },
+    }
+
+
+@pytest.fixture(scope="module")
+def patients():
+    """ """
+    return [make_patient(index) for index in range(COUNT)]
+
+
+def test_parse_extensions(benchmark, patients):
+    """ """
+    benchmark.group = "extension"
+    benchmark.extra_info["resources"] = COUNT
+
+    def parse():
+        return [Patient.parse_obj(data) for data in patients]
+
+    models = benchmark(parse)
+    assert models[0].extension[1].valueCode == "F"
+
+
+@pytest.fixture(scope="module")
+def models(patients):
+    """ """
+    return [Patient.parse_obj(data) for data in patients]
+
+
+def test_get_extension_value(benchmark, models):
+    """Lookups of 3 URLs (one nested, one on primitive element) per ``Patient``,
+    repeated lookups are served by the URL index of the instance."""
+    benchmark.group = "extension"
+    benchmark.extra_info["resources"] = COUNT
+    race = f"{US_CORE}/us-core-race"
+    birth_sex = f"{US_CORE}/us-core-birthsex"
+    birth_time = "http://hl7.org/fhir/StructureDefinition/patient-birthTime"
+
+    def lookup():
+        return [
+            (
+                model.get_extension(race).get_extension_value("text"),
+                model.get_extension_value(birth_sex),
+                model.birthDate__ext.get_extension_value(birth_time),
+            )
+            for model in models
+        ]
+
+    values = benchmark(lookup)
+    assert values[0][:2] == ("White", "F")
+
+
+def test_extract_extension(benchmark, models):
+    """ """
+    benchmark.group = "extension"
+    benchmark.extra_info["resources"] = COUNT
+
+    def extract():
+        return extract_extension(models, (f"{US_CORE}/us-core-race", "text"))
+
+    values = benchmark(extract)
+    assert values[0] == "White"
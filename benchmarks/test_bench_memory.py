@@ -0,0 +1,48 @@
+# _*_ coding: utf-8 _*_
+"""Memory per model instance, standard vs compact (``FHIRAbstractModel.compact()``)
+storage, over the ``tests/static`` fixtures. Bundle is made of fixtures."""
+import json
+
+import pytest  # type: ignore
+
+from fhir.resources import get_fhir_model_class
+
+from .conftest import INSTANCE_MEMORY_REPORT
+from .corpus import STATIC_PATH, measure_retained_memory
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def load_data(model_name):
+    """ """
+    patient = json.loads((STATIC_PATH / "Patient-with-ext.json").read_bytes())
+    observation = json.loads((STATIC_PATH / "Observation.json").read_bytes())
+    if model_name == "Patient":
+        return patient
+    if model_name == "Observation":
+        return observation
+    return {
+        "resourceType": "Bundle",
+        "type": "collection",
+        "entry": [{"resource": patient}, {"resource": observation}] * 10,
+    }
+
+
+@pytest.mark.parametrize("model_name", ["Patient", "Observation", "Bundle"])
+@pytest.mark.parametrize("mode", ["standard", "compact"])
+def test_instance_memory(benchmark, model_name, mode):
+    """ """
+    klass = get_fhir_model_class(model_name)
+    data = load_data(model_name)
+
+    def build():
+        model = klass.parse_obj(data)
+        if mode == "compact":
+            model.compact()
+        return model
+
+    size = measure_retained_memory(build)
+    benchmark.group = "instance memory"
+    benchmark.extra_info["memory_per_instance"] = size
+    INSTANCE_MEMORY_REPORT.setdefault(model_name, {})[mode] = size
+    benchmark(build)
@@ -0,0 +1,58 @@
+# _*_ coding: utf-8 _*_
+"""Parse and validate benchmarks, one round is one pass over every example
+of the resource type."""
+from fhir.resources import construct_fhir_element, get_fhir_model_class
+
+from .conftest import PYTHON_CALLS_REPORT
+from .corpus import count_elements, count_python_calls
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def test_construct_fhir_element(run_benchmark, resource_type, examples):
+    """ """
+
+    def construct():
+        for _, _, data in examples:
+            construct_fhir_element(resource_type, data)
+
+    run_benchmark(construct)
+
+
+def test_parse_raw(run_benchmark, resource_type, examples):
+    """ """
+    klass = get_fhir_model_class(resource_type)
+
+    def parse_raw():
+        for _, raw, _ in examples:
+            klass.parse_raw(raw)
+
+    run_benchmark(parse_raw)
+
+
+def test_parse_obj(run_benchmark, resource_type, examples):
+    """ """
+    klass = get_fhir_model_class(resource_type)
+
+    def parse_obj():
+        for _, _, data in examples:
+            klass.parse_obj(data)
+
+    run_benchmark(parse_obj)
+
+
+def test_parse_obj_python_calls(benchmark, resource_type, examples):
+    """Python calls (frames) per validated element, counted over one pass; fewer
+    frames is what binding complex element fields to model class is about."""
+    klass = get_fhir_model_class(resource_type)
+
+    def parse_obj():
+        for _, _, data in examples:
+            klass.parse_obj(data)
+
+    elements = sum(count_elements(data) for _, _, data in examples)
+    calls = count_python_calls(parse_obj) / elements
+    PYTHON_CALLS_REPORT[resource_type] = calls
+    benchmark.group = "python calls per element"
+    benchmark.extra_info["python_calls_per_element"] = calls
+    benchmark.pedantic(parse_obj, rounds=1)
@@ -0,0 +1,42 @@
+# _*_ coding: utf-8 _*_
+"""Validation of polymorphic ``Resource`` typed fields (``Bundle.entry.resource``),
+10000-entry ``Bundle`` of mixed resource types made of the ``tests/static``
+fixtures."""
+import json
+
+import pytest  # type: ignore
+
+from fhir.resources.bundle import Bundle
+
+from .corpus import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+COUNT = 10000
+
+
+@pytest.fixture(scope="module")
+def bundle_data():
+    """ """
+    patient = json.loads((STATIC_PATH / "Patient-with-ext.json").read_bytes())
+    observation = json.loads((STATIC_PATH / "Observation.json").read_bytes())
+    # small resources, so dispatch cost is not hidden by validation of big trees
+    resources = [
+        {"resourceType": "Patient", "id": "example", "gender": patient["gender"]},
+        {"resourceType": "Observation", "status": "final", "code": observation["code"]},
+        {"resourceType": "Basic", "code": observation["code"]},
+        {"resourceType": "Binary", "contentType": "text/plain"},
+    ]
+    return {
+        "resourceType": "Bundle",
+        "type": "collection",
+        "entry": [{"resource": resources[i % len(resources)]} for i in range(COUNT)],
+    }
+
+
+def test_polymorphic_bundle(benchmark, bundle_data):
+    """ """
+    benchmark.group = "polymorphic dispatch"
+    benchmark.extra_info["entries"] = COUNT
+    bundle = benchmark(Bundle.parse_obj, bundle_data)
+    assert bundle.entry[1].resource.resource_type == "Observation"
@@ -0,0 +1,57 @@
+# _*_ coding: utf-8 _*_
+"""Serialization benchmarks, one round is one pass over every (already parsed)
+example of the resource type."""
+import pytest  # type: ignore
+
+from fhir.resources import get_fhir_model_class
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+@pytest.fixture
+def models(resource_type, examples):
+    """ """
+    klass = get_fhir_model_class(resource_type)
+    return [klass.parse_obj(data) for _, _, data in examples]
+
+
+def test_dict(run_benchmark, models):
+    """ """
+
+    def to_dict():
+        for model in models:
+            model.dict()
+
+    run_benchmark(to_dict)
+
+
+def test_json(run_benchmark, models):
+    """ """
+
+    def to_json():
+        for model in models:
+            model.json()
+
+    run_benchmark(to_json)
+
+
+def test_xml(run_benchmark, models):
+    """ """
+    pytest.importorskip("lxml")
+
+    def to_xml():
+        for model in models:
+            model.xml()
+
+    run_benchmark(to_xml)
+
+
+def test_yaml(run_benchmark, models):
+    """ """
+    pytest.importorskip("yaml")
+
+    def to_yaml():
+        for model in models:
+            model.yaml()
+
+    run_benchmark(to_yaml)
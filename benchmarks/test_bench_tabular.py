@@ -0,0 +1,58 @@
+# _*_ coding: utf-8 _*_
+"""Columnar extraction (``fhir.resources.tabular.extract_columns``) vs naive
+attribute access in python loop, over many ``Observation`` models made of the
+``tests/static`` fixture."""
+import json
+
+import pytest  # type: ignore
+
+from fhir.resources.observation import Observation
+from fhir.resources.tabular import extract_columns
+
+from .corpus import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+COUNT = 10000
+PATHS = [
+    "subject.reference",
+    "code.coding[0].code",
+    "valueQuantity.value",
+    "effectiveDateTime",
+]
+
+
+@pytest.fixture(scope="module")
+def models():
+    """ """
+    data = json.loads((STATIC_PATH / "Observation.json").read_bytes())
+    model = Observation.parse_obj(data)
+    return [model.copy() for _ in range(COUNT)]
+
+
+def extract_naive(models):
+    """ """
+    columns = {path: list() for path in PATHS}
+    for model in models:
+        subject = model.subject
+        columns["subject.reference"].append(subject and subject.reference)
+        code = None
+        if model.code and model.code.coding:
+            code = model.code.coding[0].code
+        columns["code.coding[0].code"].append(code)
+        quantity = model.valueQuantity
+        columns["valueQuantity.value"].append(quantity and quantity.value)
+        columns["effectiveDateTime"].append(model.effectiveDateTime)
+    return columns
+
+
+@pytest.mark.parametrize("mode", ["naive", "extract_columns"])
+def test_extract_columns(benchmark, models, mode):
+    """ """
+    benchmark.group = "tabular extraction"
+    benchmark.extra_info["resources"] = COUNT
+    if mode == "naive":
+        result = benchmark(extract_naive, models)
+    else:
+        result = benchmark(extract_columns, models, PATHS)
+    assert len(result["subject.reference"]) == COUNT
@@ -0,0 +1,86 @@
+# _*_ coding: utf-8 _*_
+"""XML benchmarks over the ``tests/static`` fixtures (XML files as they are and
+JSON files serialized as XML), one round is one pass over every fixture.
+Both the single pass loader/stream writer and the ``Node`` based paths are
+measured, all of them share the per class XML metadata."""
+import io
+import typing
+
+import pytest  # type: ignore
+
+from fhir.resources import get_fhir_model_class
+
+from .corpus import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+etree = pytest.importorskip("lxml.etree")
+
+
+@pytest.fixture(scope="module")
+def xml_fixtures() -> typing.List[typing.Tuple[typing.Any, bytes]]:
+    """(model class, XML bytes) of every static fixture."""
+    fixtures = list()
+    for path in sorted(STATIC_PATH.glob("*.xml")):
+        raw = path.read_bytes()
+        klass = get_fhir_model_class(etree.QName(etree.fromstring(raw)).localname)
+        fixtures.append((klass, raw))
+    for path in sorted(STATIC_PATH.glob("*.json")):
+        model = get_fhir_model_class(path.name.split("-")[0].split(".")[0])
+        raw = model.parse_file(path).xml(return_bytes=True)
+        fixtures.append((model, raw))
+    return fixtures
+
+
+@pytest.fixture(scope="module")
+def xml_models(xml_fixtures):
+    """ """
+    return [
+        klass.parse_raw(raw, content_type="text/xml") for klass, raw in xml_fixtures
+    ]
+
+
+def test_xml_loads(benchmark, xml_fixtures):
+    """ """
+    from fhir.resources.utils.xml import xml_loads
+
+    def loads():
+        for klass, raw in xml_fixtures:
+            xml_loads(klass, raw)
+
+    benchmark.group = "xml"
+    benchmark(loads)
+
+
+def test_xml_node_loads(benchmark, xml_fixtures):
+    """ """
+    from fhir.resources.utils.xml import Node
+
+    def loads():
+        for klass, raw in xml_fixtures:
+            Node.from_element(etree.fromstring(raw)).to_fhir(klass)
+
+    benchmark.group = "xml"
+    benchmark(loads)
+
+
+def test_xml_dumps(benchmark, xml_models):
+    """ """
+
+    def dumps():
+        for model in xml_models:
+            model.xml()
+
+    benchmark.group = "xml"
+    benchmark(dumps)
+
+
+def test_xml_dump_stream(benchmark, xml_models):
+    """ """
+
+    def dump():
+        for model in xml_models:
+            model.xml(stream=io.BytesIO())
+
+    benchmark.group = "xml"
+    benchmark(dump)
@@ -204,6 +204,59 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
         setattr(validator, "__manually_injected__", True)  # noqa:B010
         setattr(cls, func_name, validator)
 
+    @classmethod
+    def one_of_many_fields(cls) -> typing.Dict[str, typing.List[str]]:
+        """https://www.hl7.org/fhir/formats.html#choice
+        Choice of data types elements (``nnn[x]``), mapping of element name and
+        its fields; only one of the fields could have value.
+        """
+        return {}
+
+    @classmethod
+    @lru_cache(maxsize=None, typed=True)
+    def get_element_rules(
+        cls: Type["FHIRAbstractModel"],
+    ) -> typing.Tuple[typing.Tuple[typing.List[str], bool], ...]:
+        """Resolved table of ``one_of_many_fields()`` (fields and required flag),
+        built once per class and checked by ``validate_element_rules``."""
+        one_of_many_fields = list()
+        for prefix, fields in cls.one_of_many_fields().items():
+            extra = cls.__fields__[fields[0]].field_info.extra
+            if extra["one_of_many"] != prefix:
+                raise ConfigError(
+                    f"{cls} field '{fields[0]}' doesn't belong to "
+                    f"choice element '{prefix}'."
+                )
+            one_of_many_fields.append((fields, extra["one_of_many_required"] is True))
+        return tuple(one_of_many_fields)
+
+    @root_validator(pre=True, allow_reuse=True)
+    def validate_element_rules(
+        cls, values: typing.Dict[str, Any]
+    ) -> typing.Dict[str, Any]:
+        """Checks class level rules from ``get_element_rules()``.
+
+        https://www.hl7.org/fhir/formats.html#choice
+        Elements that have a choice of data type cannot repeat - they must have a
+        maximum cardinality of 1. When constructing an instance of an element with a
+        choice of types, the authoring system must create a single element with a
+        data type chosen from among the list of permitted data types.
+        """
+        for fields, required in cls.get_element_rules():
+            found = False
+            for field in fields:
+                if values.get(field) is not None:
+                    if found is True:
+                        raise ValueError(
+                            "Any of one field value is expected from "
+                            f"this list {fields}, but got multiple!"
+                        )
+                    found = True
+            if required is True and found is False:
+                raise ValueError(f"Expect any of field value from this list {fields}.")
+
+        return values
+
     @classmethod
     @lru_cache(maxsize=1024, typed=True)
     def has_resource_base(cls) -> bool:
@@ -17,8 +17,11 @@ from pydantic.types import (
 )
 from pydantic.validators import bool_validator, parse_date, parse_datetime, parse_time
 
-from .fhirabstractmodel import FHIRAbstractModel
-from .fhirtypesvalidators import run_validator_for_fhir_type
+from fhir.resources.utils.intern import intern_value
+from fhir.resources.utils.valuecache import CachedConstrainedStr, ValueCacheMixin
+
+from .fhirabstractmodel import FHIRAbstractModel, WrongResourceType
+from .fhirtypesvalidators import FHIR_TYPE_VALIDATORS
 
 if TYPE_CHECKING:
     from pydantic.types import CallableGenerator
@@ -103,6 +106,11 @@ class String(ConstrainedStr):
     regex = re.compile(r"[ \r\n\t\S]+")
     __visit_name__ = "string"
 
+    @classmethod
+    def validate(cls, value: str) -> str:
+        """ """
+        return intern_value(super().validate(value), cls.__visit_name__)
+
 
 class Base64Binary(ConstrainedBytes):
     """A stream of bytes, base64 encoded (RFC 4648 )"""
@@ -111,7 +119,7 @@ class Base64Binary(ConstrainedBytes):
     __visit_name__ = "base64Binary"
 
 
-class Code(ConstrainedStr):
+class Code(CachedConstrainedStr):
     """Indicates that the value is taken from a set of controlled
     strings defined elsewhere (see Using codes for further discussion).
     Technically, a code is restricted to a string which has at least one
@@ -121,8 +129,13 @@ class Code(ConstrainedStr):
     regex = re.compile(r"^[^\s]+(\s[^\s]+)*$")
     __visit_name__ = "code"
 
+    @classmethod
+    def validate(cls, value: str) -> str:
+        """ """
+        return intern_value(super().validate(value), cls.__visit_name__)
+
 
-class Id(ConstrainedStr, Primitive):
+class Id(CachedConstrainedStr, Primitive):
     """Any combination of upper- or lower-case ASCII letters
     ('A'..'Z', and 'a'..'z', numerals ('0'..'9'), '-' and '.',
     with a length limit of 64 characters.
@@ -138,6 +151,11 @@ class Id(ConstrainedStr, Primitive):
     max_length = 64
     __visit_name__ = "id"
 
+    @classmethod
+    def validate(cls, value: str) -> str:
+        """ """
+        return intern_value(super().validate(value), cls.__visit_name__)
+
     @classmethod
     def configure_constraints(
         cls, min_length: int = None, max_length: int = None, regex: Pattern = None
@@ -171,6 +189,8 @@ class Id(ConstrainedStr, Primitive):
         if regex is not None:
             cls.regex = regex
 
+        cls.clear_value_cache()
+
 
 class Uuid(UUID, Primitive):
     """A UUID (aka GUID) represented as a URI (RFC 4122 );
@@ -212,7 +232,7 @@ class PositiveInt(ConstrainedInt):
     gt = 0
 
 
-class Uri(ConstrainedStr):
+class Uri(CachedConstrainedStr):
     """A Uniform Resource Identifier Reference (RFC 3986 ).
     Note: URIs are case sensitive.
     For UUID (urn:uuid:53fefa32-fcbb-4ff8-8a92-55ee120877b7)
@@ -226,8 +246,13 @@ class Uri(ConstrainedStr):
     __visit_name__ = "uri"
     regex = re.compile(r"\S*")
 
+    @classmethod
+    def validate(cls, value: str) -> str:
+        """ """
+        return intern_value(super().validate(value), cls.__visit_name__)
+
 
-class Oid(ConstrainedStr):
+class Oid(CachedConstrainedStr):
     """An OID represented as a URI (RFC 3001 ); e.g. urn:oid:1.2.3.4.5"""
 
     __visit_name__ = "oid"
@@ -247,7 +272,7 @@ class Xhtml(ConstrainedStr):
     __visit_name__ = "xhtml"
 
 
-class Date(datetime.date):
+class Date(ValueCacheMixin, datetime.date):
     """A date, or partial date (e.g. just year or year + month)
     as used in human communication. The format is YYYY, YYYY-MM, or YYYY-MM-DD,
     e.g. 2018, 1973-06, or 1905-08-23.
@@ -274,20 +299,31 @@ class Date(datetime.date):
             # default handler
             return parse_date(value)
 
+        validated = cls.__value_cache__.get(value)
+        if validated is None:
+            validated = cls._validate_str(value)
+            cls.__value_cache__.set(value, validated)
+        return validated
+
+    @classmethod
+    def _validate_str(cls, value: str) -> Union[datetime.date, str]:
+        """ """
         match = FHIR_DATE_PARTS.match(value)
 
-        if not match:
+        if match is None:
             if not cls.regex.match(value):
                 raise DateError()
-        elif not match.groupdict().get("day"):
-            if match.groupdict().get("month") and int(match.groupdict()["month"]) > 12:
+            return parse_date(value)
+        month, day = match.group("month", "day")
+        if day is None:
+            if month is not None and int(month) > 12:
                 raise DateError()
             # we keep original
             return value
         return parse_date(value)
 
 
-class DateTime(datetime.datetime):
+class DateTime(ValueCacheMixin, datetime.datetime):
     """A date, date-time or partial date (e.g. just year or year + month) as used
     in human communication. The format is YYYY, YYYY-MM, YYYY-MM-DD or
     YYYY-MM-DDThh:mm:ss+zz:zz, e.g. 2018, 1973-06, 1905-08-23,
@@ -323,17 +359,23 @@ class DateTime(datetime.datetime):
         if not isinstance(value, str):
             # default handler
             return parse_datetime(value)
+
+        validated = cls.__value_cache__.get(value)
+        if validated is None:
+            validated = cls._validate_str(value)
+            cls.__value_cache__.set(value, validated)
+        return validated
+
+    @classmethod
+    def _validate_str(cls, value: str) -> Union[datetime.datetime, datetime.date, str]:
+        """ """
         match = FHIR_DATE_PARTS.match(value)
-        if match:
-            if (
-                match.groupdict().get("year")
-                and match.groupdict().get("month")
-                and match.groupdict().get("day")
-            ):
+        if match is not None:
+            month, day = match.group("month", "day")
+            if day is not None:
                 return parse_date(value)
-            elif match.groupdict().get("year") and match.groupdict().get("month"):
-                if int(match.groupdict()["month"]) > 12:
-                    raise DateError()
+            if month is not None and int(month) > 12:
+                raise DateError()
             # we don't want to loose actual information, so keep as string
             return value
         if not cls.regex.match(value):
@@ -342,7 +384,7 @@ class DateTime(datetime.datetime):
         return parse_datetime(value)
 
 
-class Instant(datetime.datetime):
+class Instant(ValueCacheMixin, datetime.datetime):
     """An instant in time in the format YYYY-MM-DDThh:mm:ss.sss+zz:zz
     (e.g. 2015-02-07T13:28:17.239+02:00 or 2017-01-01T00:00:00Z).
     The time SHALL specified at least to the second and SHALL include a time zone.
@@ -370,10 +412,16 @@ class Instant(datetime.datetime):
     @classmethod
     def validate(cls, value):
         """ """
-        if isinstance(value, str):
+        if not isinstance(value, str):
+            return parse_datetime(value)
+
+        validated = cls.__value_cache__.get(value)
+        if validated is None:
             if not cls.regex.match(value):
                 raise DateTimeError()
-        return parse_datetime(value)
+            validated = parse_datetime(value)
+            cls.__value_cache__.set(value, validated)
+        return validated
 
 
 class Time(datetime.time):
@@ -423,7 +471,13 @@ class AbstractType(dict):
     def __get_validators__(cls) -> "CallableGenerator":
         from . import fhirtypesvalidators
 
-        yield getattr(fhirtypesvalidators, cls.__resource_type__.lower() + "_validator")
+        validator = fhirtypesvalidators.FHIR_TYPE_VALIDATORS.get(cls.__resource_type__)
+        if validator is None:
+            # not registered in ``MODEL_CLASSES``
+            validator = getattr(
+                fhirtypesvalidators, cls.__resource_type__.lower() + "_validator"
+            )
+        yield validator
 
     @classmethod
     def is_primitive(cls) -> bool:
@@ -462,26 +516,27 @@ class AbstractBaseType(dict):
 
     @classmethod
     def validate(cls, v, values, config, field):
-        """ """
+        """Polymorphic value is dispatched by ``resourceType`` to the validator of
+        the concrete model class through ``FHIR_TYPE_VALIDATORS``."""
         if isinstance(v, (bytes, str)):
-            input_data = load_str_bytes(v)
-            resource_type = input_data.get("resourceType", None)
-        elif isinstance(v, FHIRAbstractModel):
+            # parsed once, validator gets the dict
+            v = load_str_bytes(v, json_loads=FHIRAbstractModel.__config__.json_loads)
+        if v.__class__ is not dict and isinstance(v, FHIRAbstractModel):
             resource_type = v.resource_type
         else:
             resource_type = v.get("resourceType", None)
-
-        if resource_type is None or resource_type == cls.__resource_type__:
-            from . import fhirtypesvalidators
-
-            v = getattr(
-                fhirtypesvalidators, cls.__resource_type__.lower() + "_validator"
-            )(v)
-            return v
-
-        type_class = get_fhir_type_class(resource_type)
-        v = run_validator_for_fhir_type(type_class, v, values, config, field)
-        return v
+            if resource_type is None:
+                resource_type = cls.__resource_type__
+
+        try:
+            validator = FHIR_TYPE_VALIDATORS[resource_type]
+        except KeyError:
+            # validation error of the field, not ``LookupError``
+            raise WrongResourceType(
+                error=f"'{resource_type}' is not a valid FHIR "
+                f"{cls.__fhir_release__} resource type."
+            )
+        return validator(v)
 
 
 class Canonical(Uri):
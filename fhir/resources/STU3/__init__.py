@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import IO, Any, Dict, Union
+
+from fhir.resources.utils import XMLBundleEntryStream, bundle_entry_stream
+from fhir.resources.utils.jsonstream import BundleEntryStream
 
 from .fhirabstractmodel import FHIRAbstractModel
 from .fhirtypesvalidators import get_fhir_model_class
@@ -25,4 +28,24 @@ def construct_fhir_element(
     return klass.parse_obj(data)
 
 
-__all__ = ["get_fhir_model_class", "construct_fhir_element"]
+def iter_bundle_entries(
+    source: Union[str, Path, IO],
+    *,
+    chunk_size: int = 64 * 1024,
+    content_type: str = None,
+) -> Union[BundleEntryStream, XMLBundleEntryStream]:
+    """Streams through ``Bundle.entry`` of JSON or XML (``.xml`` file or
+    ``content_type`` ends with ``xml``) document (file path or file like object)
+    and yields validated ``BundleEntry`` one at a time. ``Bundle`` header
+    (``type``, ``total``, ``link`` etc.) is available up front as ``header``
+    attribute of returned iterable."""
+    return bundle_entry_stream(
+        source,
+        get_fhir_model_class("Bundle"),
+        get_fhir_model_class("BundleEntry"),
+        chunk_size=chunk_size,
+        content_type=content_type,
+    )
+
+
+__all__ = ["get_fhir_model_class", "construct_fhir_element", "iter_bundle_entries"]
@@ -1,13 +1,27 @@
 # -*- coding: utf-8 -*-
+import importlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import IO, Any, Dict, Iterable, List, Optional, Set, Tuple, Type, Union
+
+from pydantic.error_wrappers import ErrorWrapper, ValidationError
+from pydantic.utils import ROOT_KEY
 
 from .fhirabstractmodel import FHIRAbstractModel
 from .fhirtypesvalidators import get_fhir_model_class
+from .utils import XMLBundleEntryStream, bundle_entry_stream
+from .utils.jsonstream import BundleEntryStream
 
 __fhir_version__ = "4.0.1"
 __version__ = "6.2.0b3"
 
+FHIR_RELEASES = {
+    "R4": "fhir.resources",
+    "STU3": "fhir.resources.STU3",
+    "DSTU2": "fhir.resources.DSTU2",
+}
+
 
 def construct_fhir_element(
     element_type: str, data: Union[Dict[str, Any], str, bytes, Path]
@@ -26,4 +40,231 @@ def construct_fhir_element(
     return klass.parse_obj(data)
 
 
-__all__ = ["get_fhir_model_class", "construct_fhir_element"]
+def iter_bundle_entries(
+    source: Union[str, Path, IO],
+    *,
+    chunk_size: int = 64 * 1024,
+    content_type: str = None,
+) -> Union[BundleEntryStream, XMLBundleEntryStream]:
+    """Streams through ``Bundle.entry`` of JSON or XML (``.xml`` file or
+    ``content_type`` ends with ``xml``) document (file path or file like object)
+    and yields validated ``BundleEntry`` one at a time. ``Bundle`` header
+    (``type``, ``total``, ``link`` etc.) is available up front as ``header``
+    attribute of returned iterable."""
+    return bundle_entry_stream(
+        source,
+        get_fhir_model_class("Bundle"),
+        get_fhir_model_class("BundleEntry"),
+        chunk_size=chunk_size,
+        content_type=content_type,
+    )
+
+
+def warmup(
+    release: str = "R4",
+    resource_types: Iterable[str] = None,
+    *,
+    lazy: bool = False,
+    xml: bool = False,
+) -> int:
+    """Imports and prepares model classes of the FHIR release up front, so the
+    first request of a (forked) worker process doesn't pay module import and
+    class construction latency. Cached class level metadata (``has_resource_base``,
+    ``get_resource_type``, validation rules, alias mapping, serialization,
+    construct, adoption and sparse validation plans) are built as well.
+    DSTU2 classes have validation rules only.
+
+    :param release: one of ``R4``, ``STU3``, ``DSTU2``.
+    :param resource_types: names of model classes to be prepared, including all
+        classes reachable through their fields. All classes of the release are
+        prepared when not provided.
+    :param lazy: builds ``parse_obj_lazy()`` subclasses (``get_lazy_class``) too,
+        those are new classes, so off by default.
+    :param xml: builds XML descriptors (``utils.xml.get_xml_descriptor``) too,
+        requires ``lxml``.
+
+    Returns the number of prepared model classes.
+    Tips: call from pre-fork master (i.e. gunicorn ``preload_app``) and follow
+    with ``gc.freeze()``, so that children share the memory pages.
+    """
+    try:
+        validators = importlib.import_module(
+            FHIR_RELEASES[release] + ".fhirtypesvalidators"
+        )
+    except KeyError:
+        raise LookupError(
+            f"'{release}' is not valid FHIR release, "
+            f"possible values are {', '.join(FHIR_RELEASES)}."
+        )
+    if resource_types is None:
+        # ``list`` is shadowed here by ``fhir.resources.list`` module, once imported.
+        resource_types = tuple(validators.MODEL_CLASSES.keys())
+
+    if xml is True:
+        from .utils.xml import get_xml_descriptor
+
+    prepared: Set[Type[FHIRAbstractModel]] = set()
+
+    def prepare(klass: Type[FHIRAbstractModel]):
+        if klass in prepared:
+            return
+        prepared.add(klass)
+
+        klass.has_resource_base()
+        klass.get_resource_type()
+        klass.get_element_rules()
+        if hasattr(klass, "get_serialization_plan"):
+            klass.get_alias_mapping()
+            klass.get_serialization_plan()
+            klass.get_construct_plan()
+            klass.get_adoption_plan()
+            klass.get_sparse_plan()
+            if lazy is True:
+                klass.get_lazy_class()
+            if xml is True:
+                get_xml_descriptor(klass)
+
+        for field in klass.__fields__.values():
+            type_name = getattr(field.type_, "__resource_type__", None)
+            if type_name in validators.MODEL_CLASSES:
+                prepare(validators.get_fhir_model_class(type_name))
+
+    for resource_type in resource_types:
+        try:
+            klass = validators.get_fhir_model_class(resource_type)
+        except KeyError:
+            raise LookupError(
+                f"'{resource_type}' is not valid FHIRModel (element type) name!"
+            )
+        prepare(klass)
+    return len(prepared)
+
+
+RawResource = Union[Dict[str, Any], str, bytes, Path]
+ConstructResult = Tuple[Optional[FHIRAbstractModel], Optional[ValidationError]]
+
+
+def _construct_items(
+    release: str, items: List[Tuple[int, RawResource]]
+) -> List[Tuple[int, Optional[FHIRAbstractModel], Optional[ValidationError]]]:
+    """Validates ``(index, raw resource)`` items, errors are collected per item.
+    Executed by worker of ``construct_fhir_elements``."""
+    validators = importlib.import_module(
+        FHIR_RELEASES[release] + ".fhirtypesvalidators"
+    )
+    json_loads = FHIRAbstractModel.__config__.json_loads
+    results = []
+    for index, item in items:
+        klass = None
+        try:
+            if isinstance(item, (str, bytes)):
+                data = json_loads(item)
+            elif isinstance(item, Path):
+                data = json_loads(item.read_bytes())
+            else:
+                data = item
+            if not isinstance(data, dict):
+                raise ValueError("Resource must be JSON object.")
+            resource_type = data.get("resourceType")
+            try:
+                klass = validators.get_fhir_model_class(resource_type)
+            except KeyError:
+                pass
+            if klass is None or not klass.has_resource_base():
+                raise LookupError(f"'{resource_type}' is not valid FHIR resource type!")
+            results.append((index, klass.parse_obj(data), None))
+        except ValidationError as exc:
+            results.append((index, None, exc))
+        except (ValueError, LookupError, OSError) as exc:
+            error = ValidationError(
+                [ErrorWrapper(exc, loc=ROOT_KEY)], klass or FHIRAbstractModel
+            )
+            results.append((index, None, error))
+    return results
+
+
+def _init_worker(release: str, resource_types: Iterable[str]) -> None:
+    """Warms up the model classes of the batch in worker process."""
+    validators = importlib.import_module(
+        FHIR_RELEASES[release] + ".fhirtypesvalidators"
+    )
+    warmup(
+        release, [name for name in resource_types if name in validators.MODEL_CLASSES]
+    )
+
+
+def construct_fhir_elements(
+    iterable: Iterable[RawResource],
+    *,
+    workers: int = None,
+    executor: str = "process",
+    release: str = "R4",
+    chunk_size: int = 64,
+) -> List[ConstructResult]:
+    """Validates batch of raw resources (``dict``, JSON ``str``/``bytes`` or file
+    ``Path``) of mixed types, model class is picked by ``resourceType``.
+    Returns ``(model, None)`` or ``(None, ValidationError)`` per item in the
+    order of ``iterable``, so one invalid resource doesn't abort the batch.
+
+    :param workers: number of workers, items are grouped by ``resourceType``
+        and validated in chunks of ``chunk_size``. Validated in the calling
+        thread when not provided.
+    :param executor: ``process`` (each worker warms up model classes of the
+        batch first, see ``warmup()``) or ``thread``.
+    :param release: one of ``R4``, ``STU3``, ``DSTU2``.
+    """
+    if release not in FHIR_RELEASES:
+        raise LookupError(
+            f"'{release}' is not valid FHIR release, "
+            f"possible values are {', '.join(FHIR_RELEASES)}."
+        )
+    if executor not in ("process", "thread"):
+        raise ValueError(
+            f"'{executor}' is not valid executor, possible values are "
+            "process, thread."
+        )
+    items = [(index, item) for index, item in enumerate(iterable)]
+    results: List[ConstructResult] = [(None, None)] * len(items)
+    if workers is None or workers <= 1 or len(items) <= chunk_size:
+        for index, model, error in _construct_items(release, items):
+            results[index] = (model, error)
+        return results
+
+    # raw JSON items are dispatched by the worker, grouped under ``None``.
+    groups: Dict[Optional[str], List[Tuple[int, RawResource]]] = {}
+    for index, item in items:
+        resource_type = None
+        if isinstance(item, dict):
+            resource_type = item.get("resourceType")
+            if not isinstance(resource_type, str):
+                resource_type = None
+        groups.setdefault(resource_type, []).append((index, item))
+    # ``range`` is shadowed here by ``fhir.resources.range`` module, once imported.
+    chunks = []
+    for group in groups.values():
+        start = 0
+        while start < len(group):
+            chunks.append(group[start : start + chunk_size])
+            start += chunk_size
+    if executor == "process":
+        pool: Union[ProcessPoolExecutor, ThreadPoolExecutor] = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(release, [name for name in groups if name is not None]),
+        )
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+    with pool:
+        for chunk_results in pool.map(_construct_items, repeat(release), chunks):
+            for index, model, error in chunk_results:
+                results[index] = (model, error)
+    return results
+
+
+__all__ = [
+    "get_fhir_model_class",
+    "construct_fhir_element",
+    "construct_fhir_elements",
+    "iter_bundle_entries",
+    "warmup",
+]
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 """Base class for all FHIR elements. """
 import abc
+import copy
+import datetime
+import decimal
+import functools
 import inspect
 import logging
 import pathlib
@@ -8,16 +12,39 @@ import typing
 from collections import OrderedDict
 from enum import Enum
 from functools import lru_cache
+from uuid import UUID
 
 from pydantic import BaseModel, Extra, Field
 from pydantic.class_validators import ROOT_VALIDATOR_CONFIG_KEY, root_validator
 from pydantic.error_wrappers import ErrorWrapper, ValidationError
-from pydantic.errors import ConfigError, PydanticValueError
-from pydantic.fields import ModelField
+from pydantic.errors import (
+    ConfigError,
+    ExtraError,
+    MissingError,
+    NoneIsNotAllowedError,
+    PydanticValueError,
+)
+from pydantic.fields import SHAPE_LIST, ModelField
+from pydantic.main import validate_model
 from pydantic.parse import Protocol
+from pydantic.typing import get_args, get_origin
 from pydantic.utils import ROOT_KEY, sequence_like
 
-from fhir.resources.utils import load_file, load_str_bytes, xml_dumps, yaml_dumps
+from fhir.resources.utils import (
+    load_file,
+    load_str_bytes,
+    xml_dump,
+    xml_dumps,
+    yaml_dumps,
+)
+from fhir.resources.utils.adopt import is_adopting
+from fhir.resources.utils.errors import (
+    FHIRPathError,
+    make_operation_outcome,
+    validate_collect,
+)
+from fhir.resources.utils.jsonstream import json_dump
+from fhir.resources.utils.lazy import LazyValue
 
 try:
     import orjson
@@ -48,13 +75,141 @@ except ImportError:
 if typing.TYPE_CHECKING:
     from pydantic.typing import TupleGenerator
     from pydantic.types import StrBytes
-    from pydantic.typing import AnyCallable
+    from pydantic.typing import AnyCallable, DictAny
     from pydantic.main import Model
 
 __author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
 
 logger = logging.getLogger(__name__)
 FHIR_COMMENTS_FIELD_NAME = "fhir_comments"
+# ``__fields_set__`` shared by compact instances, see ``FHIRAbstractModel.compact()``
+COMPACT_FIELDS_SETS: typing.Dict[typing.FrozenSet[str], typing.FrozenSet[str]] = {}
+
+
+def _required_primitive_errors(
+    alias: str,
+    is_present: bool,
+    ext_field: ModelField,
+    values: typing.Dict[str, typing.Any],
+) -> typing.List[ErrorWrapper]:
+    """Errors for required primitive element without value, unless the
+    extension (``_element``) explains why the value is absent."""
+    ext_value = values.get(ext_field.alias, None)
+    errors: typing.List[ErrorWrapper] = []
+    if ext_value is not None:
+        if isinstance(ext_value, dict):
+            if len(ext_value.get("extension", [])) > 0:
+                return errors
+        elif (
+            getattr(ext_value.__class__, "get_resource_type", lambda: "")()
+            == "FHIRPrimitiveExtension"
+        ):
+            if ext_value.extension and len(ext_value.extension) > 0:
+                return errors
+        else:
+            for validator in ext_field.type_.__get_validators__():
+                try:
+                    ext_value = validator(v=ext_value)
+                except ValidationError as exc:
+                    errors.append(ErrorWrapper(exc, loc=ext_field.alias))
+            if len(errors) > 0:
+                return errors
+            if ext_value.extension and len(ext_value.extension) > 0:
+                return errors
+    if is_present:
+        errors.append(ErrorWrapper(NoneIsNotAllowedError(), loc=alias))
+    else:
+        errors.append(ErrorWrapper(MissingError(), loc=alias))
+    return errors
+
+
+def _is_adoptable(
+    value: typing.Any,
+    model_name: typing.Optional[str],
+    is_list: bool,
+    get_fhir_model_class: typing.Callable[[str], typing.Type["FHIRAbstractModel"]],
+) -> bool:
+    """Whether the value is instance of the exact (registered) model class (or list
+    of those), ``model_name`` is ``None`` for polymorphic ``Resource`` field."""
+    if is_list:
+        if value.__class__ is not list:
+            return False
+        for item in value:
+            if not _is_adoptable(item, model_name, False, get_fhir_model_class):
+                return False
+        return True
+    klass = value.__class__
+    if model_name is None:
+        if not isinstance(value, FHIRAbstractModel):
+            return False
+        model_name = klass.get_resource_type()
+    try:
+        return klass is get_fhir_model_class(model_name)
+    except KeyError:
+        return False
+
+
+def _get_extension_value(
+    extension: "FHIRAbstractModel", default: typing.Any
+) -> typing.Any:
+    """``value[x]`` of ``Extension``, only the stored elements are looked at (i.e.
+    single ``value[x]`` of sparse ``Extension``), ``value[x]__ext`` are not values."""
+    for name, value in extension.__dict__.items():
+        if name[:5] == "value" and name[-5:] != "__ext" and value is not None:
+            if value.__class__ is LazyValue:
+                return getattr(extension, name)
+            return value
+    return default
+
+
+def _get_trusted_converter(
+    type_: typing.Any, fhirtypes: typing.Any, fhirtypesvalidators: typing.Any
+) -> typing.Optional[typing.Callable[[typing.Any], typing.Any]]:
+    """Value converter for ``construct_trusted()``, ``None`` means value is taken
+    as it is. Complex types are constructed recursively, primitives are only
+    converted into the same python type as validation would produce."""
+    if get_origin(type_) is typing.Union:
+        # i.e. ``typing.Optional[FHIRPrimitiveExtensionType]`` as list item
+        args = [arg for arg in get_args(type_) if arg is not type(None)]
+        if len(args) != 1:
+            return None
+        type_ = args[0]
+    if not inspect.isclass(type_):
+        return None
+    get_fhir_model_class = fhirtypesvalidators.get_fhir_model_class
+
+    if issubclass(type_, fhirtypes.AbstractType):
+        model_name = type_.__resource_type__
+
+        def construct_model(value):
+            if isinstance(value, FHIRAbstractModel):
+                return value
+            return get_fhir_model_class(model_name).construct_trusted(value)
+
+        return construct_model
+
+    if issubclass(type_, fhirtypes.AbstractBaseType):
+        base_name = type_.__resource_type__
+
+        def construct_polymorphic(value):
+            if isinstance(value, FHIRAbstractModel):
+                return value
+            model_name = value.get("resourceType", base_name)
+            return get_fhir_model_class(model_name).construct_trusted(value)
+
+        return construct_polymorphic
+
+    if issubclass(type_, (datetime.date, datetime.time)):
+        return type_.validate
+    if issubclass(type_, decimal.Decimal):
+        return (
+            lambda v: v if isinstance(v, decimal.Decimal) else decimal.Decimal(str(v))
+        )
+    if issubclass(type_, bytes):
+        return lambda v: v.encode() if isinstance(v, str) else v
+    if issubclass(type_, UUID):
+        return lambda v: UUID(v) if isinstance(v, str) else v
+    return None
 
 
 class WrongResourceType(PydanticValueError):
@@ -71,8 +226,17 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
         None, alias="fhir_comments", element_property=False
     )
 
+    # only given elements are validated and stored, see ``validate_sparse()``
+    __fhir_sparse__ = False
+
+    # URL index of ``extension`` element, see ``get_extensions()``; compact
+    # instance flag, see ``compact()``
+    __slots__ = ("_fhir_extension_index", "_fhir_compact")
+
     def __init__(__pydantic_self__, **data: typing.Any) -> None:
         """ """
+        if data and is_adopting() and __pydantic_self__._adopt_values(data):
+            return
         resource_type = data.pop("resource_type", None)
         errors = []
         if (
@@ -102,8 +266,120 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
         if errors:
             raise ValidationError(errors, __pydantic_self__.__class__)
 
+        if __pydantic_self__.__fhir_sparse__:
+            cls = __pydantic_self__.__class__
+            values, fields_set, error = cls.validate_sparse(data)
+            if error is not None:
+                raise error
+            object.__setattr__(__pydantic_self__, "__dict__", values)
+            object.__setattr__(__pydantic_self__, "__fields_set__", fields_set)
+            if cls.__private_attributes__:
+                __pydantic_self__._init_private_attributes()
+            return
         BaseModel.__init__(__pydantic_self__, **data)
 
+    def __getattr__(self, name: str) -> typing.Any:
+        """Value of the field that is not stored by compact instance (see
+        ``compact()``) or instance of sparse class (see ``validate_sparse()``)
+        is the class level default."""
+        field = self.__class__.__fields__.get(name, None)
+        if field is not None and (
+            self.__fhir_sparse__ or getattr(self, "_fhir_compact", False)
+        ):
+            return field.default
+        raise AttributeError(
+            f"'{self.__class__.__name__}' object has no attribute '{name}'"
+        )
+
+    def __getstate__(self) -> "DictAny":
+        """ """
+        state = super().__getstate__()
+        if getattr(self, "_fhir_compact", False):
+            state["__fhir_compact__"] = True
+        return state
+
+    def __setstate__(self, state: "DictAny") -> None:
+        """ """
+        super().__setstate__(state)
+        if state.get("__fhir_compact__", False):
+            object.__setattr__(self, "_fhir_compact", True)
+
+    def _copy_and_set_values(
+        self: "Model",
+        values: typing.Dict[str, typing.Any],
+        fields_set: typing.Set[str],
+        *,
+        deep: bool,
+    ) -> "Model":
+        """Copy of compact instance (values are taken from the stored fields) is
+        compact as well."""
+        model = super()._copy_and_set_values(values, fields_set, deep=deep)
+        if getattr(self, "_fhir_compact", False):
+            object.__setattr__(model, "_fhir_compact", True)
+        return model
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        """ """
+        if self.__fields_set__.__class__ is frozenset:
+            # shared by compact instances
+            object.__setattr__(self, "__fields_set__", set(self.__fields_set__))
+        if name == "extension":
+            object.__setattr__(self, "_fhir_extension_index", None)
+        if is_adopting() and self._adopt(name, value):
+            return
+        super().__setattr__(name, value)
+
+    def _adopt(self, name: str, value: typing.Any) -> bool:
+        """Stores instance of the exact target class (or list of those) of complex
+        element field by reference, see ``fhir.resources.utils.adopt``. ``False``
+        means the value has to be validated."""
+        from . import fhirtypesvalidators
+
+        cls = self.__class__
+        plan, _ = cls.get_adoption_plan()
+        item = plan.get(name)
+        if item is None or item[0] != name or cls.__post_root_validators__:
+            return False
+        if len(cls.__pre_root_validators__) > 1:
+            # only ``validate_element_rules`` is known to be indifferent
+            return False
+        if not _is_adoptable(
+            value, item[1], item[2], fhirtypesvalidators.get_fhir_model_class
+        ):
+            return False
+        self.__dict__[name] = value
+        self.__fields_set__.add(name)
+        return True
+
+    def _adopt_values(self, data: typing.Dict[str, typing.Any]) -> bool:
+        """``__init__()`` of class without required elements, from instances those
+        can be adopted (see ``_adopt()``) only; ``False`` means the data has to
+        be validated."""
+        from . import fhirtypesvalidators
+
+        cls = self.__class__
+        plan, optional = cls.get_adoption_plan()
+        if not optional or cls.__post_root_validators__:
+            return False
+        if len(cls.__pre_root_validators__) > 1:
+            return False
+        get_fhir_model_class = fhirtypesvalidators.get_fhir_model_class
+        values = dict(cls.get_construct_plan()[1])
+        fields_set = set()
+        for key, value in data.items():
+            item = plan.get(key)
+            if item is None or not _is_adoptable(
+                value, item[1], item[2], get_fhir_model_class
+            ):
+                return False
+            values[item[0]] = value
+            fields_set.add(item[0])
+        object.__setattr__(self, "__dict__", values)
+        object.__setattr__(self, "__fields_set__", fields_set)
+        if cls.__private_attributes__:
+            self._init_private_attributes()
+        return True
+
     @classmethod
     def add_root_validator(
         cls: typing.Type["Model"],
@@ -187,6 +463,94 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
         """
         return []
 
+    @classmethod
+    def one_of_many_fields(cls) -> typing.Dict[str, typing.List[str]]:
+        """https://www.hl7.org/fhir/formats.html#choice
+        Choice of data types elements (``nnn[x]``), mapping of element name and
+        its fields; only one of the fields could have value.
+        """
+        return {}
+
+    @classmethod
+    def required_primitive_fields(cls) -> typing.List[typing.Tuple[str, str]]:
+        """https://www.hl7.org/fhir/extensibility.html#Special-Case
+        Required primitive elements, pairs of field name and ``__ext`` field name;
+        either value or extension must be present.
+        """
+        return []
+
+    @classmethod
+    @lru_cache(maxsize=None, typed=True)
+    def get_element_rules(
+        cls: typing.Type["FHIRAbstractModel"],
+    ) -> typing.Tuple[
+        typing.Tuple[typing.Tuple[str, ModelField], ...],
+        typing.Tuple[typing.Tuple[typing.List[str], bool], ...],
+    ]:
+        """Resolved tables of ``required_primitive_fields()`` (alias and ``__ext``
+        field) and ``one_of_many_fields()`` (fields and required flag), built once
+        per class and checked by ``validate_element_rules``."""
+        required_fields = tuple(
+            (cls.__fields__[name].alias, cls.__fields__[ext])
+            for name, ext in cls.required_primitive_fields()
+        )
+        one_of_many_fields = list()
+        for prefix, fields in cls.one_of_many_fields().items():
+            extra = cls.__fields__[fields[0]].field_info.extra
+            if extra["one_of_many"] != prefix:
+                raise ConfigError(
+                    f"{cls} field '{fields[0]}' doesn't belong to "
+                    f"choice element '{prefix}'."
+                )
+            one_of_many_fields.append((fields, extra["one_of_many_required"] is True))
+        return required_fields, tuple(one_of_many_fields)
+
+    @root_validator(pre=True, allow_reuse=True)
+    def validate_element_rules(
+        cls, values: typing.Dict[str, typing.Any]
+    ) -> typing.Dict[str, typing.Any]:
+        """Checks class level rules from ``get_element_rules()``.
+
+        https://www.hl7.org/fhir/extensibility.html#Special-Case
+        In some cases, implementers might find that they do not have appropriate data for
+        an element with minimum cardinality = 1. In this case, the element must be present,
+        but unless the resource or a profile on it has made the actual value of the primitive
+        data type mandatory, it is possible to provide an extension that explains why
+        the primitive value is not present.
+
+        https://www.hl7.org/fhir/formats.html#choice
+        Elements that have a choice of data type cannot repeat - they must have a
+        maximum cardinality of 1. When constructing an instance of an element with a
+        choice of types, the authoring system must create a single element with a
+        data type chosen from among the list of permitted data types.
+        """
+        required_fields, one_of_many_fields = cls.get_element_rules()
+        errors: typing.List[ErrorWrapper] = []
+        for alias, ext_field in required_fields:
+            if values.get(alias) is None:
+                errors.extend(
+                    _required_primitive_errors(
+                        alias, alias in values, ext_field, values
+                    )
+                )
+        if len(errors) > 0:
+            raise ValidationError(errors, cls)  # type: ignore
+
+        for fields, required in one_of_many_fields:
+            found = False
+            for field in fields:
+                if values.get(field) is not None:
+                    if found is True:
+                        raise ValueError(
+                            "Any of one field value is expected from "
+                            f"this list {fields}, but got multiple!"
+                        )
+                    found = True
+            if required is True and found is False:
+                raise ValueError(f"Expect any of field value from this list {fields}.")
+
+        return values
+
     @classmethod
     @lru_cache(maxsize=1024, typed=True)
     def has_resource_base(cls: typing.Type["Model"]) -> bool:
@@ -214,6 +578,46 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
             f.alias: fname for fname, f in cls.__fields__.items() if f.alias in aliases
         }
 
+    @classmethod
+    @lru_cache(maxsize=None, typed=True)
+    def get_serialization_plan(
+        cls: typing.Type["FHIRAbstractModel"],
+    ) -> typing.Tuple[typing.Tuple[typing.Any, ...], ...]:
+        """Serialization plan, built once per class from ``elements_sequence()``,
+        field aliases and primitive extension (``__ext``) companion fields.
+        Each item is ``(field name, alias, is model, is list, ext field name, ext alias)``,
+        "is model" is ``None`` when the field type is unknown to FHIR.
+        """
+        alias_maps = cls.get_alias_mapping()
+        plan = list()
+        for prop_name in cls.elements_sequence():
+            field_key = alias_maps[prop_name]
+            field = cls.__fields__[field_key]
+            is_primitive = getattr(field.type_, "is_primitive", None)
+            if field.type_ is bool:
+                is_model: typing.Optional[bool] = False
+            elif is_primitive is None:
+                is_model = None
+            else:
+                is_model = not is_primitive()
+
+            ext_key, ext_alias = None, None
+            if is_model is False and f"{field_key}__ext" in cls.__fields__:
+                ext_key = f"{field_key}__ext"
+                ext_alias = cls.__fields__[ext_key].alias
+
+            plan.append(
+                (
+                    field_key,
+                    field.alias,
+                    is_model,
+                    field.shape == SHAPE_LIST,
+                    ext_key,
+                    ext_alias,
+                )
+            )
+        return tuple(plan)
+
     @classmethod
     def get_json_encoder(cls) -> typing.Callable[[typing.Any], typing.Any]:
         """ """
@@ -268,6 +672,318 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
             raise ValidationError([ErrorWrapper(e, loc=ROOT_KEY)], cls)
         return cls.parse_obj(obj)
 
+    @classmethod
+    @lru_cache(maxsize=None, typed=True)
+    def get_construct_plan(
+        cls: typing.Type["FHIRAbstractModel"],
+    ) -> typing.Tuple[
+        typing.Dict[str, typing.Tuple[str, typing.Optional[typing.Callable], bool]],
+        typing.Dict[str, typing.Any],
+    ]:
+        """Plan for ``construct_trusted()``, built once per class. Mapping of alias
+        (and field name) to (field name, value converter, is list) and default
+        values of the fields."""
+        from . import fhirtypes, fhirtypesvalidators
+
+        plan = dict()
+        defaults = dict()
+        for name, field in cls.__fields__.items():
+            # all fields, so values are kept in fields order (as validation does)
+            defaults[name] = None if field.required else field.get_default()
+            if name == "resource_type":
+                continue
+            converter = _get_trusted_converter(
+                field.type_, fhirtypes, fhirtypesvalidators
+            )
+            plan[name] = plan[field.alias] = (
+                name,
+                converter,
+                field.shape == SHAPE_LIST,
+            )
+        return plan, defaults
+
+    @classmethod
+    @lru_cache(maxsize=None, typed=True)
+    def get_adoption_plan(
+        cls: typing.Type["FHIRAbstractModel"],
+    ) -> typing.Tuple[
+        typing.Dict[str, typing.Tuple[str, typing.Optional[str], bool]], bool
+    ]:
+        """Complex element fields those adopt model instances (see
+        ``fhir.resources.utils.adopt``), built once per class. Mapping of field name
+        and alias to (field name, model name, ``None`` for polymorphic ``Resource``,
+        is list) and whether the class has no required element at all (can be
+        initialized from adopted instances only). Choice elements are left out,
+        only one of them may have value."""
+        from . import fhirtypes
+
+        plan = dict()
+        for name, field in cls.__fields__.items():
+            type_ = field.type_
+            if not inspect.isclass(type_) or field.field_info.extra.get("one_of_many"):
+                continue
+            if issubclass(type_, fhirtypes.AbstractType):
+                model_name: typing.Optional[str] = type_.__resource_type__
+            elif issubclass(type_, fhirtypes.AbstractBaseType):
+                model_name = None
+            else:
+                continue
+            plan[name] = plan[field.alias] = (
+                name,
+                model_name,
+                field.shape == SHAPE_LIST,
+            )
+        required_fields, one_of_many_fields = cls.get_element_rules()
+        optional = (
+            not any(field.required for field in cls.__fields__.values())
+            and not required_fields
+            and not any(required for _, required in one_of_many_fields)
+        )
+        return plan, optional
+
+    @classmethod
+    @lru_cache(maxsize=None, typed=True)
+    def get_sparse_plan(
+        cls: typing.Type["FHIRAbstractModel"],
+    ) -> typing.Tuple[
+        typing.Dict[str, typing.Tuple[int, ModelField]],
+        typing.Dict[str, typing.Tuple[int, ModelField]],
+        typing.Tuple[typing.Tuple[int, ModelField], ...],
+        typing.Dict[str, int],
+    ]:
+        """Plan for ``validate_sparse()``, built once per class. Fields (with
+        position) by alias and by field name, required fields and mapping of
+        choice element field to its index in ``get_element_rules()``."""
+        aliases = dict()
+        names = dict()
+        required = list()
+        for position, (name, field) in enumerate(cls.__fields__.items()):
+            aliases[field.alias] = (position, field)
+            if field.alt_alias:
+                names[name] = (position, field)
+            if field.required:
+                required.append((position, field))
+        choices = dict()
+        for index, (fields, _) in enumerate(cls.get_element_rules()[1]):
+            for name in fields:
+                choices[name] = index
+        return aliases, names, tuple(required), choices
+
+    @classmethod
+    def validate_sparse(
+        cls: typing.Type["FHIRAbstractModel"], data: typing.Dict[str, typing.Any]
+    ) -> typing.Tuple[
+        typing.Dict[str, typing.Any], typing.Set[str], typing.Optional[ValidationError]
+    ]:
+        """``validate_model()`` of classes with many optional elements (i.e.
+        ``Extension`` with 50 ``value[x]`` fields), only given elements are
+        validated and stored, not given ones fall back to the class level
+        default (see ``compact()``). Choice elements are checked by the given
+        keys, not by scanning all of the choice fields. Errors are the same."""
+        if len(cls.__pre_root_validators__) > 1 or cls.__post_root_validators__:
+            return validate_model(cls, data)
+        aliases, names, required, choices = cls.get_sparse_plan()
+        required_fields, one_of_many_fields = cls.get_element_rules()
+
+        # ``validate_element_rules``
+        try:
+            errors: typing.List[ErrorWrapper] = []
+            for alias, ext_field in required_fields:
+                if data.get(alias) is None:
+                    errors.extend(
+                        _required_primitive_errors(
+                            alias, alias in data, ext_field, data
+                        )
+                    )
+            if len(errors) > 0:
+                raise ValidationError(errors, cls)
+            found = [0] * len(one_of_many_fields)
+            for key, value in data.items():
+                index = choices.get(key)
+                if index is not None and value is not None:
+                    found[index] += 1
+            for (fields, is_required), count in zip(one_of_many_fields, found):
+                if count > 1:
+                    raise ValueError(
+                        "Any of one field value is expected from "
+                        f"this list {fields}, but got multiple!"
+                    )
+                if is_required is True and count == 0:
+                    raise ValueError(
+                        f"Expect any of field value from this list {fields}."
+                    )
+        except (ValueError, TypeError, AssertionError) as exc:
+            return {}, set(), ValidationError([ErrorWrapper(exc, loc=ROOT_KEY)], cls)
+
+        given = list()
+        extra = list()
+        for key in data:
+            item = aliases.get(key)
+            if item is None:
+                item = names.get(key)
+                if item is None or item[1].alias in data:
+                    extra.append(key)
+                    continue
+            given.append((item[0], item[1], key))
+        for position, field in required:
+            if field.alias not in data and field.name not in data:
+                given.append((position, field, None))
+        given.sort(key=lambda item: item[0])
+
+        values: typing.Dict[str, typing.Any] = dict()
+        fields_set = set()
+        errors = []
+        for _, field, key in given:
+            if key is None:
+                errors.append(ErrorWrapper(MissingError(), loc=field.alias))
+                continue
+            fields_set.add(field.name)
+            value, errors_ = field.validate(data[key], values, loc=field.alias, cls=cls)
+            if isinstance(errors_, ErrorWrapper):
+                errors.append(errors_)
+            elif isinstance(errors_, list):
+                errors.extend(errors_)
+            else:
+                values[field.name] = value
+        if extra:
+            fields_set.update(extra)
+            for key in sorted(extra):
+                errors.append(ErrorWrapper(ExtraError(), loc=key))
+        if errors:
+            return values, fields_set, ValidationError(errors, cls)
+        return values, fields_set, None
+
+    @classmethod
+    def construct_trusted(
+        cls: typing.Type["Model"],
+        data: typing.Union[typing.Dict[str, typing.Any], "StrBytes"],
+    ) -> "Model":
+        """Builds the whole model tree (unlike ``construct()``, nested elements,
+        primitive extensions, choice elements and contained resources are models
+        as well) from already validated data, i.e. read back from own FHIR store,
+        without any validation. Unknown elements are ignored.
+
+        Never use with untrusted input, invalid data results in invalid model.
+        """
+        if isinstance(data, FHIRAbstractModel):
+            return data
+        if isinstance(data, (str, bytes)):
+            data = cls.__config__.json_loads(data)
+
+        plan, defaults = cls.get_construct_plan()
+        values = dict(defaults)
+        fields_set = set()
+        for key, value in data.items():
+            item = plan.get(key)
+            if item is None:
+                continue
+            name, converter, is_list = item
+            if converter is not None and value is not None:
+                if is_list:
+                    value = [None if v is None else converter(v) for v in value]
+                else:
+                    value = converter(value)
+            values[name] = value
+            fields_set.add(name)
+
+        model = cls.__new__(cls)
+        object.__setattr__(model, "__dict__", values)
+        object.__setattr__(model, "__fields_set__", fields_set)
+        if cls.__private_attributes__:
+            model._init_private_attributes()
+        return model
+
+    @classmethod
+    @lru_cache(maxsize=None, typed=True)
+    def get_lazy_class(
+        cls: typing.Type["FHIRAbstractModel"],
+    ) -> typing.Type["FHIRAbstractModel"]:
+        """Subclass used by ``parse_obj_lazy()``, built once per class. Complex
+        element fields accept any value (aliases and element properties are
+        kept), those are validated against this class on first access."""
+        annotations = dict()
+        namespace: typing.Dict[str, typing.Any] = {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__annotations__": annotations,
+            # raw values of all fields are kept
+            "__fhir_sparse__": False,
+        }
+        lazy_fields = list()
+        for field_key, _, is_model, _, _, _ in cls.get_serialization_plan():
+            if is_model is not True:
+                continue
+            annotations[field_key] = typing.Any
+            namespace[field_key] = copy.copy(cls.__fields__[field_key].field_info)
+            lazy_fields.append(field_key)
+        namespace["__fhir_origin__"] = cls
+        namespace["__fhir_lazy_fields__"] = frozenset(lazy_fields)
+        return type(cls)(cls.__name__, (LazyModelMixin, cls), namespace)
+
+    @classmethod
+    def parse_obj_collect(
+        cls: typing.Type["Model"], obj: typing.Any, *, limit: int = None
+    ) -> typing.Tuple[typing.Optional["Model"], typing.List[FHIRPathError]]:
+        """Error collection mode of ``parse_obj``, returns the model and empty
+        list or ``None`` and flat list of errors with FHIRPath like location
+        (see ``fhir.resources.utils.errors``). Nested elements are not validated
+        anymore once ``limit`` errors have been found."""
+        return validate_collect(cls, obj, limit)  # type: ignore
+
+    @classmethod
+    def validate_with_outcome(
+        cls: typing.Type["Model"], obj: typing.Any, *, limit: int = None
+    ) -> typing.Tuple[typing.Optional["Model"], "FHIRAbstractModel"]:
+        """Validates ``obj`` like ``parse_obj_collect()``, but errors are returned
+        as ``OperationOutcome`` of the same FHIR release (single informational
+        issue if valid), ready to answer the submission."""
+        model, errors = validate_collect(cls, obj, limit)  # type: ignore
+        return model, make_operation_outcome(cls, errors)  # type: ignore
+
+    @classmethod
+    def parse_obj_lazy(
+        cls: typing.Type["Model"],
+        obj: typing.Union[typing.Dict[str, typing.Any], "StrBytes"],
+    ) -> "Model":
+        """Like ``parse_obj()`` but complex elements (nested elements, contained
+        resources, extensions) are kept as raw data and validated on first
+        attribute access, invalid sub-tree raises ``ValidationError`` there.
+        Primitive elements and element rules are validated immediately.
+
+        ``json()``/``dict()`` with default parameters pass never accessed raw
+        data through as it is (no validation, input member order), otherwise
+        all elements are validated first. Returned model is instance of a
+        subclass (see ``get_lazy_class()``), so ``isinstance`` check works,
+        ``materialize()`` gives the instance of this class.
+        """
+        if isinstance(obj, (str, bytes)):
+            obj = cls.__config__.json_loads(obj)
+        lazy_class = cls.get_lazy_class()
+        model = lazy_class.parse_obj(obj)
+
+        values = model.__dict__
+        errors = list()
+        for name in lazy_class.__fhir_lazy_fields__:
+            value = values[name]
+            if value is None:
+                field = cls.__fields__[name]
+                if field.required and name in model.__fields_set__:
+                    errors.append(
+                        ErrorWrapper(NoneIsNotAllowedError(), loc=field.alias)
+                    )
+                continue
+            values[name] = LazyValue(value)
+            if isinstance(value, dict) or (
+                value.__class__ is list
+                and all(isinstance(v, dict) or v is None for v in value)
+            ):
+                continue
+            # not raw data (i.e. model instance), nothing to defer
+            getattr(model, name)
+        if len(errors) > 0:
+            raise ValidationError(errors, cls)  # type: ignore
+        return model
+
     def yaml(  # type: ignore
         self,
         *,
@@ -307,9 +1023,26 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
         pretty_print=False,
         xml_declaration=True,
         return_bytes: bool = False,
+        stream: typing.Optional[typing.IO] = None,
         **dumps_kwargs: typing.Any,
-    ) -> typing.Union[str, bytes]:
-        """ """
+    ) -> typing.Union[str, bytes, None]:
+        """If ``stream`` (file like object) is provided, XML is written directly
+        while traversing the model (see ``fhir.resources.utils.xml.XMLStreamWriter``)
+        and ``None`` is returned."""
+        if stream is not None:
+            if len(dumps_kwargs) > 0:
+                logger.warning(
+                    "When ``stream`` is provided, all dumps kwargs are ignored."
+                )
+            xml_dump(
+                self,
+                stream,
+                pretty_print=pretty_print,
+                xml_declaration=xml_declaration,
+                with_comments=not exclude_comments,
+            )
+            return None
+
         params = {
             "with_comments": not exclude_comments,
             "xml_declaration": xml_declaration,
@@ -331,10 +1064,15 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
         exclude_comments: bool = False,
         encoder: typing.Optional[typing.Callable[[typing.Any], typing.Any]] = None,
         return_bytes: bool = False,
+        stream: typing.Optional[typing.IO] = None,
         **dumps_kwargs: typing.Any,
-    ) -> typing.Union[str, bytes]:
+    ) -> typing.Union[str, bytes, None]:
         """Fully overridden method but codes are copied from BaseMode and business logic added
         in according to support ``fhir_comments``filter and other FHIR specific requirments.
+
+        If ``stream`` (file like object) is provided, JSON bytes are written directly
+        while traversing the model, without building intermediate ``dict``
+        (compact output only, ``dumps_kwargs`` are ignored) and ``None`` is returned.
         """
         if by_alias is None:
             by_alias = True
@@ -342,6 +1080,17 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
         if exclude_none is None:
             exclude_none = True
 
+        if stream is not None:
+            self._fhir_json_dump(
+                stream,
+                by_alias=by_alias,
+                exclude_none=exclude_none,
+                exclude_comments=exclude_comments,
+                encoder=encoder,
+                **dumps_kwargs,
+            )
+            return None
+
         if (
             getattr(self.__config__.json_dumps, "__qualname__", "")
             == "orjson_json_dumps"
@@ -396,6 +1145,45 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
 
         return result
 
+    def _fhir_json_dump(
+        self,
+        stream: typing.IO,
+        *,
+        by_alias: bool,
+        exclude_none: bool,
+        exclude_comments: bool,
+        encoder: typing.Optional[typing.Callable[[typing.Any], typing.Any]],
+        **dumps_kwargs: typing.Any,
+    ) -> None:
+        """ """
+        if len(dumps_kwargs) > 0:
+            logger.warning(
+                "When ``stream`` is provided, output is always compact "
+                "and all dumps kwargs are ignored."
+            )
+        encoder = typing.cast(
+            typing.Callable[[typing.Any], typing.Any], encoder or self.__json_encoder__
+        )
+        params: typing.Dict[str, typing.Any] = {"default": encoder}
+        if (
+            getattr(self.__config__.json_dumps, "__qualname__", "")
+            == "orjson_json_dumps"
+        ):
+            params["return_bytes"] = True
+            separators = (",", ":")
+        else:
+            separators = (", ", ": ")
+
+        json_dump(
+            self,
+            stream,
+            dumps=functools.partial(self.__config__.json_dumps, **params),
+            by_alias=by_alias,
+            exclude_none=exclude_none,
+            exclude_comments=exclude_comments,
+            separators=separators,
+        )
+
     @typing.no_type_check
     def dict(
         self,
@@ -404,6 +1192,8 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
         exclude_none: bool = True,
         exclude_comments: bool = False,
     ) -> OrderedDict:
+        """Elements in specification order, primitive extensions next to
+        their values. Uses the per class ``get_serialization_plan``."""
         return OrderedDict(
             self._fhir_iter(
                 by_alias=by_alias,
@@ -412,38 +1202,151 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
             )
         )
 
+    def compact(self: "Model") -> "Model":
+        """Opt-in memory compact (sparse) storage of the whole model tree, in
+        place. Only fields with value are stored, others fall back to the class
+        level default (``None``) on access; ``__fields_set__`` is shared between
+        instances with the same fields (copied on first assignment). Output
+        of ``dict()``, ``json()`` and ``xml()`` is not affected."""
+        fields = self.__class__.__fields__
+        values = dict()
+        for name, value in self.__dict__.items():
+            if value is None and name in fields and fields[name].default is None:
+                continue
+            if isinstance(value, FHIRAbstractModel):
+                value.compact()
+            elif value.__class__ is list:
+                for item in value:
+                    if isinstance(item, FHIRAbstractModel):
+                        item.compact()
+            values[name] = value
+        object.__setattr__(self, "__dict__", values)
+        object.__setattr__(self, "_fhir_compact", True)
+        fields_set = frozenset(self.__fields_set__)
+        object.__setattr__(
+            self,
+            "__fields_set__",
+            COMPACT_FIELDS_SETS.setdefault(fields_set, fields_set),
+        )
+        return self
+
+    def get_extension(self, url: str) -> typing.Optional["FHIRAbstractModel"]:
+        """First ``Extension`` of ``extension`` element with ``url``, ``None`` if
+        there is no such, see ``get_extensions()``."""
+        extensions, index = self._fhir_get_extension_index()
+        positions = index.get(url)
+        if positions is None:
+            return None
+        return extensions[positions[0]]
+
+    def get_extensions(self, url: str) -> typing.List["FHIRAbstractModel"]:
+        """All ``Extension`` of ``extension`` element with ``url``, in order.
+        Lookup is backed by URL index of the instance, built on first lookup
+        and rebuilt when ``extension`` is assigned or its items are added,
+        removed, replaced or reordered; changing ``url`` of already indexed
+        ``Extension`` in place is not seen. Nested extensions are looked up
+        through the ``Extension`` (``__ext`` element for primitive element),
+        i.e. ``patient.birthDate__ext.get_extension(url)``."""
+        extensions, index = self._fhir_get_extension_index()
+        return [extensions[position] for position in index.get(url, ())]
+
+    def get_extension_value(self, url: str, default: typing.Any = None) -> typing.Any:
+        """``value[x]`` of the first ``Extension`` with ``url``, ``default`` if
+        there is no such or it has no value (extension of nested extensions)."""
+        extensions, index = self._fhir_get_extension_index()
+        positions = index.get(url)
+        if positions is None:
+            return default
+        return _get_extension_value(extensions[positions[0]], default)
+
     # Private methods
+    def _fhir_get_extension_index(
+        self,
+    ) -> typing.Tuple[
+        typing.List["FHIRAbstractModel"], typing.Dict[str, typing.List[int]]
+    ]:
+        """``extension`` and URL index (positions) of it. The index is reused while
+        ``extension`` compares equal to the list it was built from; items are
+        compared by identity first, replaced by equal ``Extension`` has the same
+        ``url`` at the same position."""
+        # raw value of lazy model is validated
+        extensions = getattr(self, "extension", None)
+        if not extensions:
+            return [], {}
+        try:
+            cached = self._fhir_extension_index
+        except AttributeError:
+            cached = None
+        if cached is not None and cached[0] == extensions:
+            return extensions, cached[1]
+        index: typing.Dict[str, typing.List[int]] = dict()
+        for position, extension in enumerate(extensions):
+            if extension.url in index:
+                index[extension.url].append(position)
+            else:
+                index[extension.url] = [position]
+        object.__setattr__(self, "_fhir_extension_index", (list(extensions), index))
+        return extensions, index
+
     def _fhir_iter(
         self, *, by_alias: bool, exclude_none: bool, exclude_comments: bool
     ) -> "TupleGenerator":
         if self.__class__.has_resource_base():
             yield "resourceType", self.resource_type
 
-        alias_maps = self.get_alias_mapping()
-        for prop_name in self.elements_sequence():
-            field_key = alias_maps[prop_name]
-            v = self.__dict__.get(field_key, None)
+        values = self.__dict__
+        for (
+            field_key,
+            alias,
+            is_model,
+            is_list,
+            ext_key,
+            ext_alias,
+        ) in self.get_serialization_plan():
+            v = values.get(field_key, None)
             if v is None and exclude_none is True:
                 continue
-            field = self.__fields__[field_key]
-            dict_key = by_alias and field.alias or field_key
-            v = self._fhir_get_value(
-                v,
-                by_alias=by_alias,
-                exclude_none=exclude_none,
-                exclude_comments=exclude_comments,
-            )
+            dict_key = by_alias and alias or field_key
+            if v is None:
+                pass
+            elif is_list is True and v.__class__ is list:
+                if is_model is True:
+                    v = [
+                        v_._fhir_dict(by_alias, exclude_none, exclude_comments)
+                        if isinstance(v_, FHIRAbstractModel)
+                        else self._fhir_get_value(
+                            v_,
+                            by_alias=by_alias,
+                            exclude_none=exclude_none,
+                            exclude_comments=exclude_comments,
+                        )
+                        for v_ in v
+                    ]
+                else:
+                    v = list(v)
+                if exclude_none is True and len(v) == 0:
+                    v = None
+            elif is_model is True and isinstance(v, FHIRAbstractModel):
+                v = v._fhir_dict(by_alias, exclude_none, exclude_comments)
+            elif is_model is not False or is_list is True:
+                if v.__class__ is LazyValue:
+                    # never accessed raw data of lazy model, already in JSON form
+                    v = v.raw or None
+                else:
+                    # unexpected value shape, i.e. constructed without validation
+                    v = self._fhir_get_value(
+                        v,
+                        by_alias=by_alias,
+                        exclude_none=exclude_none,
+                        exclude_comments=exclude_comments,
+                    )
             if v is not None or (exclude_none is False and v is None):
                 yield dict_key, v
             # looking for comments or primitive extension for primitive data type
-            if (
-                getattr(field.type_, "is_primitive", lambda: False)()
-                or field.type_ is bool
-            ):
-                ext_key = f"{field_key}__ext"
-                ext_val = self.__dict__.get(ext_key, None)
+            if ext_key is not None:
+                ext_val = values.get(ext_key, None)
                 if ext_val is not None:
-                    dict_key_ = by_alias and self.__fields__[ext_key].alias or ext_key
+                    dict_key_ = by_alias and ext_alias or ext_key
                     ext_val = self._fhir_get_value(
                         ext_val,
                         by_alias=by_alias,
@@ -453,17 +1356,36 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
                     if ext_val is not None and len(ext_val) > 0:
                         yield dict_key_, ext_val
         # looking for comments
-        comments = self.__dict__.get(FHIR_COMMENTS_FIELD_NAME, None)
+        comments = values.get(FHIR_COMMENTS_FIELD_NAME, None)
         if comments is not None and not exclude_comments:
             yield FHIR_COMMENTS_FIELD_NAME, comments
 
+    def _fhir_dict(
+        self, by_alias: bool, exclude_none: bool, exclude_comments: bool
+    ) -> typing.Optional[OrderedDict]:
+        """``dict()`` of a nested element, ``None`` in place of empty result
+        when ``exclude_none`` is enabled."""
+        value = OrderedDict(
+            self._fhir_iter(
+                by_alias=by_alias,
+                exclude_none=exclude_none,
+                exclude_comments=exclude_comments,
+            )
+        )
+        if exclude_none is True and len(value) == 0:
+            return None
+        return value
+
     @classmethod
     @typing.no_type_check
     def _fhir_get_value(
         cls, v: typing.Any, by_alias: bool, exclude_none: bool, exclude_comments: bool
     ) -> typing.Any:
 
-        if isinstance(v, (FHIRAbstractModel, BaseModel)):
+        if isinstance(v, FHIRAbstractModel):
+            return v._fhir_dict(by_alias, exclude_none, exclude_comments)
+
+        if isinstance(v, BaseModel):
             v_dict = v.dict(
                 by_alias=by_alias,
                 exclude_none=exclude_none,
@@ -514,3 +1436,151 @@ class FHIRAbstractModel(BaseModel, abc.ABC):
         extra = Extra.forbid
         validate_assignment = True
         error_msg_templates = {"value_error.extra": "extra fields not permitted"}
+
+
+class LazyModelMixin:
+    """Base of ``FHIRAbstractModel.get_lazy_class()`` subclasses, validates raw
+    value (``LazyValue``) of complex element against the origin class on first
+    attribute access and keeps the result."""
+
+    __fhir_origin__: typing.Type[FHIRAbstractModel]
+    __fhir_lazy_fields__: typing.FrozenSet[str]
+
+    def __getattribute__(self, name: str) -> typing.Any:
+        """ """
+        value = object.__getattribute__(self, name)
+        if value.__class__ is LazyValue:
+            value = object.__getattribute__(self, "_fhir_lazy_validate")(
+                name, value.raw
+            )
+            object.__getattribute__(self, "__dict__")[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        """ """
+        if name in self.__fhir_lazy_fields__ and value is not None:
+            value = self._fhir_lazy_validate(name, value)
+        super().__setattr__(name, value)  # type: ignore
+
+    @classmethod
+    def _fhir_lazy_validate(cls, name: str, value: typing.Any) -> typing.Any:
+        """Raw complex element(s) become lazy models as well (only the accessed
+        sub-tree is validated), anything else is validated by the origin field."""
+        from . import fhirtypes, fhirtypesvalidators
+
+        origin = cls.__fhir_origin__
+        field = origin.__fields__[name]
+        is_list = field.shape == SHAPE_LIST
+        items = value if is_list else [value]
+        type_ = field.type_
+        if (
+            items.__class__ is not list
+            or not inspect.isclass(type_)
+            or not issubclass(
+                type_, (fhirtypes.AbstractType, fhirtypes.AbstractBaseType)
+            )
+            or not all(item.__class__ is dict for item in items)
+        ):
+            return cls._fhir_validate_field(field, value)
+
+        get_fhir_model_class = fhirtypesvalidators.get_fhir_model_class
+        base_class = get_fhir_model_class(type_.__resource_type__)
+        result = list()
+        errors = list()
+        for index, item in enumerate(items):
+            klass = base_class
+            if issubclass(type_, fhirtypes.AbstractBaseType):
+                try:
+                    klass = get_fhir_model_class(
+                        item.get("resourceType", type_.__resource_type__)
+                    )
+                except KeyError:
+                    klass = None
+                if klass is None or not issubclass(klass, base_class):
+                    # let the origin field report the error
+                    return cls._fhir_validate_field(field, value)
+            try:
+                result.append(klass.parse_obj_lazy(item))
+            except ValidationError as exc:
+                loc = (field.alias, index) if is_list else field.alias
+                errors.append(ErrorWrapper(exc, loc=loc))
+        if errors:
+            raise ValidationError(errors, origin)
+        return result if is_list else result[0]
+
+    @classmethod
+    def _fhir_validate_field(cls, field: ModelField, value: typing.Any) -> typing.Any:
+        """ """
+        origin = cls.__fhir_origin__
+        value, errors = field.validate(value, {}, loc=field.alias, cls=origin)
+        if errors:
+            raise ValidationError([errors], origin)
+        return value
+
+    def _fhir_lazy_validate_all(self) -> None:
+        """ """
+        for name in self.__fhir_lazy_fields__:
+            getattr(self, name)
+
+    @classmethod
+    def get_lazy_class(cls) -> typing.Type[FHIRAbstractModel]:
+        """ """
+        return cls  # type: ignore
+
+    @classmethod
+    def get_serialization_plan(
+        cls,
+    ) -> typing.Tuple[typing.Tuple[typing.Any, ...], ...]:
+        """Plan of the origin class, so materialized elements take fast paths."""
+        return cls.__fhir_origin__.get_serialization_plan()
+
+    def materialize(self) -> FHIRAbstractModel:
+        """Validates all never accessed elements (the whole tree), returns the
+        instance of the origin class without any lazy element."""
+        values = dict(self.__dict__)
+        for name in self.__fhir_lazy_fields__:
+            value = getattr(self, name)
+            if value.__class__ is list:
+                value = [
+                    v.materialize() if isinstance(v, LazyModelMixin) else v
+                    for v in value
+                ]
+            elif isinstance(value, LazyModelMixin):
+                value = value.materialize()
+            values[name] = value
+        origin = self.__fhir_origin__
+        model = origin.__new__(origin)
+        object.__setattr__(model, "__dict__", values)
+        object.__setattr__(model, "__fields_set__", set(self.__fields_set__))
+        if getattr(self, "_fhir_compact", False):
+            object.__setattr__(model, "_fhir_compact", True)
+        if origin.__private_attributes__:
+            model._init_private_attributes()
+        return model
+
+    def xml(self, **kwargs: typing.Any) -> typing.Union[str, bytes, None]:
+        """ """
+        return self.materialize().xml(**kwargs)
+
+    def _fhir_iter(
+        self, *, by_alias: bool, exclude_none: bool, exclude_comments: bool
+    ) -> "TupleGenerator":
+        if not (by_alias and exclude_none and not exclude_comments):
+            # raw data is only passed through when output is the JSON form
+            self._fhir_lazy_validate_all()
+        return super()._fhir_iter(  # type: ignore
+            by_alias=by_alias,
+            exclude_none=exclude_none,
+            exclude_comments=exclude_comments,
+        )
+
+    def _fhir_json_dump(self, stream: typing.IO, **kwargs: typing.Any) -> None:
+        """ """
+        if (
+            kwargs["by_alias"]
+            and kwargs["exclude_none"]
+            and not kwargs["exclude_comments"]
+        ):
+            super()._fhir_json_dump(stream, **kwargs)  # type: ignore
+        else:
+            self.materialize()._fhir_json_dump(stream, **kwargs)
@@ -7,9 +7,12 @@ from typing import Union
 
 from pydantic.class_validators import make_generic_validator
 from pydantic.error_wrappers import ErrorWrapper, ValidationError
+from pydantic.main import validate_model
 from pydantic.types import StrBytes
 from pydantic.utils import ROOT_KEY
 
+from fhir.resources.utils.errors import get_error_collector
+
 from .fhirabstractmodel import FHIRAbstractModel
 
 if typing.TYPE_CHECKING:
@@ -784,6 +787,10 @@ def fhir_model_validator(
             typing.Type[BaseModel], typing.Type[FHIRAbstractModel]
         ]
     model_class = get_fhir_model_class(model_name)
+    collector = get_error_collector()
+    if collector is not None and collector.is_full():
+        # error collection mode, don't validate anymore
+        raise collector.limit_error(model_class)
 
     if isinstance(v, (str, bytes)):
         try:
@@ -849,7 +856,14 @@ def fhir_model_validator(
             )
 
     elif isinstance(v, dict):
-        v = model_class.parse_obj(v)
+        if collector is None:
+            v = model_class.parse_obj(v)
+        else:
+            try:
+                v = model_class.parse_obj(v)
+            except ValidationError as exc:
+                collector.add(exc)
+                raise
 
     if not isinstance(v, model_class):
         raise ValidationError(
@@ -880,6 +894,56 @@ def fhir_model_validator(
     return v
 
 
+def make_fhir_type_validator(
+    model_name: str,
+) -> typing.Callable[[typing.Any], FHIRAbstractModel]:
+    """Validator of complex element (and ``Resource``) fields bound to the model
+    class, see ``FHIR_TYPE_VALIDATORS``. Plain ``dict`` (parsed JSON, by far the
+    most common value) is validated right into the class, i.e. without the
+    ``fhir_model_validator`` (registry lookup, ``str``/``bytes``/``Path``
+    branches), ``parse_obj()`` and ``FHIRAbstractModel.__init__()`` frames;
+    instance of the class itself is taken as it is, any other value goes through
+    ``fhir_model_validator``."""
+    model_class: typing.Optional[typing.Type[FHIRAbstractModel]] = None
+
+    def validator(v: typing.Any) -> FHIRAbstractModel:
+        nonlocal model_class
+        if model_class is None:
+            # resolved on first use, model modules import each other
+            model_class = get_fhir_model_class(model_name)
+        if v.__class__ is not dict or "resource_type" in v:
+            if v.__class__ is model_class:
+                # instance of the class itself, taken by reference as it is
+                return v
+            return fhir_model_validator(model_name, v)
+        if "resourceType" in v:
+            if v["resourceType"] != model_name:
+                return fhir_model_validator(model_name, v)
+            v = v.copy()
+            del v["resourceType"]
+
+        collector = get_error_collector()
+        if collector is not None and collector.is_full():
+            raise collector.limit_error(model_class)
+        if model_class.__fhir_sparse__:
+            values, fields_set, error = model_class.validate_sparse(v)
+        else:
+            values, fields_set, error = validate_model(model_class, v)
+        if error is not None:
+            if collector is not None:
+                collector.add(error)
+            raise error
+        model = model_class.__new__(model_class)
+        object.__setattr__(model, "__dict__", values)
+        object.__setattr__(model, "__fields_set__", fields_set)
+        if model_class.__private_attributes__:
+            model._init_private_attributes()
+        return model
+
+    validator.__name__ = validator.__qualname__ = model_name.lower() + "_validator"
+    return validator
+
+
 def fhirprimitiveextension_validator(v: Union[StrBytes, dict, Path, FHIRAbstractModel]):
 
     return fhir_model_validator("FHIRPrimitiveExtension", v)
@@ -5557,3 +5621,11 @@ __all__ = [
     "visionprescriptionlensspecification_validator",
     "visionprescriptionlensspecificationprism_validator",
 ]
+
+
+# model name to validator of the model class, complex element fields are bound
+# to it (``AbstractType.__get_validators__``) and polymorphic (``Resource``,
+# ``Element``) values are dispatched through it (``AbstractBaseType.validate``)
+FHIR_TYPE_VALIDATORS: typing.Dict[
+    str, typing.Callable[[typing.Any], FHIRAbstractModel]
+] = {name: make_fhir_type_validator(name) for name in MODEL_CLASSES}
@@ -0,0 +1,246 @@
+# _*_ coding: utf-8 _*_
+"""NDJSON (newline delimited JSON) reader and writer, the format of FHIR Bulk
+Data export. Each line is one resource which is dispatched to its model class
+by ``resourceType``. Optionally the file could be split by byte offset into
+shards those are validated in parallel by worker processes."""
+import collections
+import errno
+import importlib
+import io
+import os
+import pathlib
+import typing
+from concurrent.futures import ProcessPoolExecutor
+
+from pydantic.error_wrappers import ErrorWrapper, ValidationError
+
+from . import FHIR_RELEASES
+from .fhirabstractmodel import FHIRAbstractModel
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+DEFAULT_SHARD_SIZE = 4 * 1024 * 1024
+
+
+def _get_model_class_getter(
+    fhir_release: str,
+) -> typing.Callable[[str], typing.Type[FHIRAbstractModel]]:
+    """ """
+    try:
+        package = FHIR_RELEASES[fhir_release]
+    except KeyError:
+        raise LookupError(
+            f"'{fhir_release}' is not valid FHIR release, "
+            f"possible values are {', '.join(FHIR_RELEASES)}."
+        )
+    return importlib.import_module(package).get_fhir_model_class
+
+
+def _load_line(
+    line: typing.Union[str, bytes],
+    get_model_class: typing.Callable[[str], typing.Type[FHIRAbstractModel]],
+    resource_type: typing.Optional[str],
+) -> FHIRAbstractModel:
+    """ """
+    data = FHIRAbstractModel.__config__.json_loads(line)
+    if not isinstance(data, dict):
+        raise ValueError("Each line must be JSON object.")
+    resource_type_ = resource_type or data.get("resourceType")
+    try:
+        klass = get_model_class(resource_type_)
+    except KeyError:
+        klass = None
+    if klass is None or not klass.has_resource_base():
+        raise LookupError(f"'{resource_type_}' is not valid FHIR resource type!")
+    return klass.parse_obj(data)
+
+
+def _line_error(exc: Exception, lineno: int) -> ValidationError:
+    """ """
+    model = getattr(exc, "model", FHIRAbstractModel)
+    return ValidationError([ErrorWrapper(exc, loc=("line", lineno))], model)
+
+
+def _load_shard(
+    path: str,
+    start: int,
+    end: int,
+    fhir_release: str,
+    resource_type: typing.Optional[str],
+) -> typing.Tuple[
+    typing.List[FHIRAbstractModel],
+    int,
+    typing.Optional[typing.Tuple[int, Exception]],
+]:
+    """Validates all lines those start within ``[start, end)`` byte range.
+    Returns models, number of lines and (relative line number, error) if any,
+    as line numbers are only known to the caller."""
+    get_model_class = _get_model_class_getter(fhir_release)
+    models = list()
+    lines = 0
+    with open(path, "rb") as fp:
+        position = start
+        if start > 0:
+            # skip the line that is started at previous shard.
+            fp.seek(start - 1)
+            if fp.read(1) != b"\n":
+                fp.readline()
+            position = fp.tell()
+        while position < end:
+            line = fp.readline()
+            if not line:
+                break
+            position += len(line)
+            lines += 1
+            if not line.strip():
+                continue
+            try:
+                models.append(_load_line(line, get_model_class, resource_type))
+            except (ValidationError, ValueError, LookupError) as exc:
+                return models, lines, (lines, exc)
+    return models, lines, None
+
+
+def _iter_ndjson_parallel(
+    path: str,
+    resource_type: typing.Optional[str],
+    fhir_release: str,
+    workers: int,
+    shard_size: int,
+) -> typing.Iterator[FHIRAbstractModel]:
+    """ """
+    size = os.path.getsize(path)
+    offsets = iter(range(0, size, shard_size))
+    pending: typing.Deque = collections.deque()
+    lineno = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def submit_next() -> None:
+            start = next(offsets, None)
+            if start is None:
+                return
+            pending.append(
+                executor.submit(
+                    _load_shard,
+                    path,
+                    start,
+                    min(start + shard_size, size),
+                    fhir_release,
+                    resource_type,
+                )
+            )
+
+        # keep the window bounded, so memory doesn't grow with the file size.
+        for _ in range(workers * 2):
+            submit_next()
+        try:
+            while pending:
+                models, lines, error = pending.popleft().result()
+                submit_next()
+                yield from models
+                if error is not None:
+                    raise _line_error(error[1], lineno + error[0])
+                lineno += lines
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def iter_ndjson(
+    source: typing.Union[str, pathlib.Path, typing.IO],
+    resource_type: str = None,
+    *,
+    fhir_release: str = "R4",
+    workers: int = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> typing.Iterator[FHIRAbstractModel]:
+    """Yields validated model for each line of NDJSON file (path or file like
+    object), in the same order as in the file. Blank lines are ignored.
+
+    :param resource_type: when given all lines are validated against this
+        resource type (as Bulk Data export files are per resource type),
+        otherwise model class is picked by ``resourceType`` of each line.
+
+    :param fhir_release: one of ``R4``, ``STU3``, ``DSTU2``.
+
+    :param workers: number of worker processes, file is split by byte offset
+        into shards of ``shard_size`` those are validated in parallel.
+        Only applicable when ``source`` is file path.
+
+    Arguments are checked right away (unknown release raises ``LookupError``,
+    missing file ``FileNotFoundError``), not on the first iteration.
+    Invalid line raises ``ValidationError`` with location ``("line", number)``.
+    """
+    get_model_class = _get_model_class_getter(fhir_release)
+    is_path = isinstance(source, (str, pathlib.Path))
+    if is_path and not os.path.isfile(source):
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(source))
+    if workers is not None and workers > 1:
+        if not is_path:
+            raise ValueError("Multiprocess mode requires file path as source.")
+        return _iter_ndjson_parallel(
+            str(source), resource_type, fhir_release, workers, shard_size
+        )
+    return _iter_ndjson(source, get_model_class, resource_type)
+
+
+def _iter_ndjson(
+    source: typing.Union[str, pathlib.Path, typing.IO],
+    get_model_class: typing.Callable[[str], typing.Type[FHIRAbstractModel]],
+    resource_type: typing.Optional[str],
+) -> typing.Iterator[FHIRAbstractModel]:
+    """ """
+    if isinstance(source, (str, pathlib.Path)):
+        fp = open(source, "rb")
+    else:
+        fp = source
+    try:
+        for lineno, line in enumerate(fp, start=1):
+            if not line.strip():
+                continue
+            try:
+                model = _load_line(line, get_model_class, resource_type)
+            except (ValidationError, ValueError, LookupError) as exc:
+                raise _line_error(exc, lineno)
+            yield model
+    finally:
+        if fp is not source:
+            fp.close()
+
+
+def write_ndjson(
+    models: typing.Iterable[FHIRAbstractModel],
+    target: typing.Union[str, pathlib.Path, typing.IO],
+    *,
+    exclude_comments: bool = False,
+) -> int:
+    """Writes each model as single line JSON into ``target`` (file path or file
+    like object), returns the number of lines written."""
+    if isinstance(target, (str, pathlib.Path)):
+        fp = open(target, "wb")
+    else:
+        fp = target
+    is_text = isinstance(fp, io.TextIOBase)
+    newline = "\n" if is_text else b"\n"
+    count = 0
+    try:
+        for model in models:
+            if hasattr(model, "_fhir_json_dump"):
+                model.json(stream=fp, exclude_comments=exclude_comments)
+            else:
+                # DSTU2 model, JSON is not written to stream
+                fp.write(
+                    model.json(
+                        return_bytes=not is_text, exclude_comments=exclude_comments
+                    )
+                )
+            fp.write(newline)
+            count += 1
+    finally:
+        if fp is not target:
+            fp.close()
+    return count
+
+
+__all__ = ["iter_ndjson", "write_ndjson"]
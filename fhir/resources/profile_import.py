@@ -0,0 +1,178 @@
+# _*_ coding: utf-8 _*_
+"""Import time profiling of model classes registry (``MODEL_CLASSES``).
+
+Each module is imported in a fresh interpreter, on top of already imported
+release package and ``fhirtypes`` (reported separately), so the numbers are the
+cost of the module including its not yet imported dependencies.
+
+Usage::
+
+    python -m fhir.resources.profile_import --release R4 --top 20
+    python -m fhir.resources.profile_import --json > import-profile.json
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+from . import FHIR_RELEASES
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+FHIRTYPES_MODULE = ".fhirtypes"
+
+
+def measure(release: str, module_name: str, memory: bool = True) -> typing.Dict:
+    """Imports the module and returns wall time, memory delta and created fields
+    per model class. Must be called from a fresh interpreter."""
+    package = FHIR_RELEASES[release]
+    importlib.import_module(package)
+    if module_name != FHIRTYPES_MODULE:
+        importlib.import_module(FHIRTYPES_MODULE, package=package)
+    validators = importlib.import_module(".fhirtypesvalidators", package=package)
+
+    if memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    module = importlib.import_module(module_name, package=package)
+    elapsed = time.perf_counter() - started
+    memory_delta = None
+    if memory:
+        memory_delta = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+    classes = dict()
+    for name, (_, name_) in validators.MODEL_CLASSES.items():
+        if name_ == module_name:
+            classes[name] = len(getattr(module, name).__fields__)
+    return {
+        "release": release,
+        "module": module_name,
+        "time": elapsed,
+        "memory": memory_delta,
+        "fields": sum(classes.values()),
+        "classes": classes,
+    }
+
+
+def get_modules(release: str) -> typing.List[str]:
+    """ """
+    validators = importlib.import_module(
+        ".fhirtypesvalidators", package=FHIR_RELEASES[release]
+    )
+    modules = [FHIRTYPES_MODULE]
+    for _, module_name in validators.MODEL_CLASSES.values():
+        if module_name not in modules:
+            modules.append(module_name)
+    return modules
+
+
+def run_isolated(release: str, module_name: str, memory: bool) -> typing.Dict:
+    """ """
+    args = [sys.executable, "-m", "fhir.resources.profile_import"]
+    args.extend(["--measure", module_name, "--release", release])
+    if not memory:
+        args.append("--no-memory")
+    # child interpreter must resolve the same ``fhir.resources`` as this one.
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    output = subprocess.run(args, check=True, stdout=subprocess.PIPE, env=env).stdout
+    return json.loads(output)
+
+
+def write_report(results: typing.List[typing.Dict], per_class: bool) -> None:
+    """ """
+    sys.stdout.write(
+        f"{'release':<8}{'module':<40}{'time (ms)':>12}{'memory (KiB)':>14}"
+        f"{'classes':>9}{'fields':>8}\n"
+    )
+    for result in results:
+        memory = result["memory"]
+        memory = "-" if memory is None else f"{memory / 1024:.1f}"
+        sys.stdout.write(
+            f"{result['release']:<8}{result['module']:<40}"
+            f"{result['time'] * 1000:>12.1f}{memory:>14}"
+            f"{len(result['classes']):>9}{result['fields']:>8}\n"
+        )
+        if per_class:
+            for name, fields in result["classes"].items():
+                sys.stdout.write(f"{'':<10}{name:<62}{fields:>8}\n")
+    sys.stdout.write(
+        f"total: {len(results)} modules, "
+        f"{sum(r['time'] for r in results) * 1000:.1f} ms, "
+        f"{sum(r['fields'] for r in results)} fields\n"
+    )
+
+
+def main(argv: typing.Sequence[str] = None) -> int:
+    """ """
+    parser = argparse.ArgumentParser(
+        prog="python -m fhir.resources.profile_import",
+        description="Reports import time, memory delta and number of "
+        "pydantic fields of each module listed in ``MODEL_CLASSES``.",
+    )
+    parser.add_argument(
+        "--release",
+        action="append",
+        choices=list(FHIR_RELEASES),
+        help="FHIR release(s) to profile, default all.",
+    )
+    parser.add_argument(
+        "--module",
+        action="append",
+        help="Profile only given module(s), i.e. '.observation'.",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Don't trace memory allocation, tracing adds overhead to import time.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of modules profiled concurrently (affects timing).",
+    )
+    parser.add_argument("--top", type=int, help="Show only N slowest modules.")
+    parser.add_argument(
+        "--per-class", action="store_true", help="Show fields count per class."
+    )
+    parser.add_argument("--json", action="store_true", help="Output as JSON.")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    releases = args.release or list(FHIR_RELEASES)
+    memory = not args.no_memory
+    if args.measure is not None:
+        json.dump(measure(releases[0], args.measure, memory), sys.stdout)
+        return 0
+
+    tasks = list()
+    for release in releases:
+        for module_name in get_modules(release):
+            if args.module is None or module_name in args.module:
+                tasks.append((release, module_name))
+
+    with ThreadPoolExecutor(max_workers=max(args.jobs, 1)) as executor:
+        results = list(
+            executor.map(lambda task: run_isolated(task[0], task[1], memory), tasks)
+        )
+    results.sort(key=lambda r: r["time"], reverse=True)
+    if args.top is not None:
+        results = results[: args.top]
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        write_report(results, args.per_class)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
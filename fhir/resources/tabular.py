@@ -0,0 +1,414 @@
+# _*_ coding: utf-8 _*_
+"""Columnar (bulk) extraction of element values from many resources in single pass,
+i.e. for analytics. Element paths (``subject.reference``, ``code.coding[0].code``)
+are resolved once against the model class (``__fields__``, aliases), each resource
+is visited once for all columns. Columns are python lists, NumPy arrays or
+pyarrow ``Table`` (both optional dependencies)."""
+import functools
+import importlib
+import itertools
+import operator
+import re
+import typing
+
+from pydantic.fields import SHAPE_LIST
+
+from . import FHIR_RELEASES
+from .fhirabstractmodel import FHIRAbstractModel, _get_extension_value
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+PATH_STEP = re.compile(r"^(?P<name>[A-Za-z_][A-Za-z0-9_]*)(\[(?P<index>\d+)\])?$")
+OUTPUT_FORMATS = ("list", "numpy", "arrow")
+
+
+class PathStep(typing.NamedTuple):
+    """Single step of ``ElementPath``; ``name`` (field name) and ``is_list`` are
+    ``None`` when the step is resolved per value, i.e. elements of polymorphic
+    ``Resource`` (contained, ``Bundle.entry.resource``)."""
+
+    name: typing.Optional[str]
+    alias: str
+    index: typing.Optional[int]
+    is_list: typing.Optional[bool]
+
+
+class ElementPath:
+    """Element path resolved against the model class, see ``compile_path()``."""
+
+    __slots__ = ("path", "steps", "model_getters", "dict_getters")
+
+    def __init__(self, path: str, steps: typing.Tuple[PathStep, ...]):
+        """ """
+        self.path = path
+        self.steps = steps
+        self.model_getters = _make_getters(steps, False)
+        self.dict_getters = _make_getters(steps, True)
+
+    def __repr__(self) -> str:
+        """ """
+        return f"<ElementPath {self.path}>"
+
+    def extract(self, value: typing.Any) -> typing.Any:
+        """Value of the element of the model (or raw ``dict``), ``None`` if any
+        step is missing. Repeating element without index gives list of values
+        (flattened, empty values are dropped) like FHIRPath collection."""
+        getters = self.dict_getters if isinstance(value, dict) else self.model_getters
+        try:
+            for getter in getters:
+                value = getter(value)
+                if value is None:
+                    break
+        except AttributeError:
+            return None
+        return value
+
+
+def _get_release_module(klass: typing.Type[FHIRAbstractModel], name: str) -> typing.Any:
+    """ """
+    release = klass.__fields__["id"].type_.__fhir_release__
+    return importlib.import_module(f"{FHIR_RELEASES[release]}.{name}")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_alias_mapping(klass: typing.Type[FHIRAbstractModel]) -> typing.Dict[str, str]:
+    """Mapping of alias and field name, DSTU2 models have no ``get_alias_mapping()``."""
+    if hasattr(klass, "get_alias_mapping"):
+        return klass.get_alias_mapping()
+    return {field.alias: name for name, field in klass.__fields__.items()}
+
+
+def compile_path(klass: typing.Type[FHIRAbstractModel], path: str) -> ElementPath:
+    """Resolves element path (dot separated element names, optionally with list
+    index i.e. ``code.coding[0].code``, resource type prefix is allowed) against
+    ``klass``, raises ``ValueError`` for unknown element, index of not repeating
+    element or child of primitive element."""
+    names = path.split(".")
+    if names[0] == klass.get_resource_type() and len(names) > 1:
+        names = names[1:]
+    fhirtypes = _get_release_module(klass, "fhirtypes")
+    get_fhir_model_class = _get_release_module(
+        klass, "fhirtypesvalidators"
+    ).get_fhir_model_class
+
+    steps = list()
+    current: typing.Optional[typing.Type[FHIRAbstractModel]] = klass
+    primitive: typing.Optional[str] = None
+    for name in names:
+        match = PATH_STEP.match(name)
+        if match is None:
+            raise ValueError(f"'{path}': invalid element path step '{name}'.")
+        name = match.group("name")
+        index = None if match.group("index") is None else int(match.group("index"))
+        if primitive is not None:
+            raise ValueError(f"'{path}': primitive element '{primitive}' has no child.")
+        if current is None:
+            # polymorphic, resolved per value
+            steps.append(PathStep(None, name, index, None))
+            continue
+
+        fields = current.__fields__
+        field = fields.get(_get_alias_mapping(current).get(name, name))
+        if field is None or field.name == "resource_type":
+            raise ValueError(
+                f"'{path}': '{current.get_resource_type()}' has no element '{name}'."
+            )
+        if index is not None and field.shape != SHAPE_LIST:
+            raise ValueError(f"'{path}': element '{name}' is not repeating.")
+        steps.append(
+            PathStep(field.name, field.alias, index, field.shape == SHAPE_LIST)
+        )
+
+        type_ = field.type_
+        if not hasattr(type_, "__resource_type__"):
+            primitive = name
+        elif issubclass(type_, fhirtypes.AbstractBaseType):
+            current = None
+        else:
+            current = get_fhir_model_class(type_.__resource_type__)
+    return ElementPath(path, tuple(steps))
+
+
+def _extract(value: typing.Any, steps: typing.Tuple[PathStep, ...], start: int):
+    """ """
+    for pos in range(start, len(steps)):
+        if value is None:
+            return None
+        name, alias, index, _ = steps[pos]
+        if isinstance(value, dict):
+            value = value.get(alias)
+        elif name is not None:
+            value = getattr(value, name)
+        else:
+            value = getattr(
+                value, _get_alias_mapping(value.__class__).get(alias, alias), None
+            )
+
+        if value.__class__ is list:
+            if index is not None:
+                value = value[index] if index < len(value) else None
+                continue
+            values = list()
+            for item in value:
+                item = _extract(item, steps, pos + 1)
+                if item.__class__ is list:
+                    values.extend(item)
+                elif item is not None:
+                    values.append(item)
+            return values
+        if index is not None:
+            # not repeating element of polymorphic resource
+            return None
+    return value
+
+
+def _make_getters(
+    steps: typing.Tuple[PathStep, ...], for_dict: bool
+) -> typing.Tuple[typing.Callable[[typing.Any], typing.Any], ...]:
+    """Chain of getters, applied one after another until value is ``None``.
+    Path of single valued steps only is made of C level getters, consecutive
+    attributes of model share one ``attrgetter`` (``AttributeError`` of ``None``
+    in between means missing value); any other path is single ``_extract`` call."""
+    if any(
+        step.name is None or (step.is_list and step.index is None) for step in steps
+    ):
+        return (lambda value: _extract(value, steps, 0),)
+
+    getters: typing.List[typing.Callable[[typing.Any], typing.Any]] = list()
+    names: typing.List[str] = list()
+    for step in steps:
+        if for_dict:
+            getters.append(operator.methodcaller("get", step.alias))
+        else:
+            names.append(step.name)  # type: ignore
+        if step.index is not None:
+            if names:
+                getters.append(operator.attrgetter(".".join(names)))
+                names = list()
+            getters.append(_make_index_getter(step.index))
+    if names:
+        getters.append(operator.attrgetter(".".join(names)))
+    return tuple(getters)
+
+
+def _make_index_getter(index: int) -> typing.Callable[[typing.Any], typing.Any]:
+    """ """
+
+    def get_item(value):
+        return value[index] if len(value) > index else None
+
+    return get_item
+
+
+def extract_columns(
+    items: typing.Iterable[
+        typing.Union[FHIRAbstractModel, typing.Dict[str, typing.Any]]
+    ],
+    paths: typing.Iterable[str],
+    *,
+    model_class: typing.Optional[typing.Type[FHIRAbstractModel]] = None,
+    release: str = "R4",
+    output: str = "list",
+) -> typing.Any:
+    """Extracts values of ``paths`` from models (or raw parsed JSON ``dict``) of
+    the same resource type in single pass.
+
+    :param items: models or raw ``dict``; raw values are as they are in JSON
+        (i.e. ``dateTime`` is ``str``), values of models are validated values.
+    :param paths: element paths, see ``compile_path()``.
+    :param model_class: class the paths are resolved against, taken from the first
+        item (``resourceType`` of ``dict`` in ``release``) when not provided.
+    :param output: ``list`` (mapping of path to list), ``numpy`` (mapping of path
+        to ``numpy.ndarray``) or ``arrow`` (``pyarrow.Table``).
+    """
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"'{output}' is not valid output, possible values are "
+            f"{', '.join(OUTPUT_FORMATS)}."
+        )
+    iterator = iter(items)
+    first = next(iterator, None)
+    if model_class is None:
+        model_class = _get_model_class(first, release)
+
+    compiled = [compile_path(model_class, path) for path in paths]
+    columns: typing.List[typing.List[typing.Any]] = [list() for _ in compiled]
+    if first is not None:
+        model_plan = [
+            (path.model_getters, column.append)
+            for path, column in zip(compiled, columns)
+        ]
+        dict_plan = [
+            (path.dict_getters, column.append)
+            for path, column in zip(compiled, columns)
+        ]
+        for item in itertools.chain((first,), iterator):
+            plan = dict_plan if isinstance(item, dict) else model_plan
+            for getters, append in plan:
+                value = item
+                try:
+                    for getter in getters:
+                        value = getter(value)
+                        if value is None:
+                            break
+                except AttributeError:
+                    value = None
+                append(value)
+
+    result = {path.path: column for path, column in zip(compiled, columns)}
+    if output == "numpy":
+        return _to_numpy(result)
+    if output == "arrow":
+        return _to_arrow(result)
+    return result
+
+
+def extract_extension(
+    items: typing.Iterable[
+        typing.Union[FHIRAbstractModel, typing.Dict[str, typing.Any]]
+    ],
+    url: typing.Union[str, typing.Sequence[str]],
+    *,
+    path: typing.Optional[str] = None,
+    model_class: typing.Optional[typing.Type[FHIRAbstractModel]] = None,
+    release: str = "R4",
+    value: bool = True,
+) -> typing.List[typing.Any]:
+    """Extracts one extension from models (or raw parsed JSON ``dict``) in single
+    pass, ``value[x]`` of the first extension with ``url`` (or the ``Extension``
+    itself, raw ``dict`` for raw item, when ``value`` is ``False``) per item,
+    ``None`` when missing. Extensions are scanned as they are, per instance URL
+    index (see ``FHIRAbstractModel.get_extensions()``) is not built.
+
+    :param url: extension URL or sequence of URLs of nested extensions, i.e.
+        ``(US_CORE_RACE, "ombCategory")``.
+    :param path: element path of the element the extension belongs to (see
+        ``compile_path()``), ``__ext`` field for primitive element, i.e.
+        ``birthDate__ext``; the item itself when not provided. Path of repeating
+        element gives list of values of the elements having the extension.
+    :param model_class: class the ``path`` is resolved against, taken from the
+        first item (``resourceType`` of ``dict`` in ``release``) when not provided.
+    """
+    urls = (url,) if isinstance(url, str) else tuple(url)
+    if not urls:
+        raise ValueError("At least one extension URL is required.")
+    iterator = iter(items)
+    first = next(iterator, None)
+    compiled = None
+    if path is not None and first is not None:
+        if model_class is None:
+            model_class = _get_model_class(first, release)
+        compiled = compile_path(model_class, path)
+
+    result: typing.List[typing.Any] = list()
+    if first is None:
+        return result
+    append = result.append
+    for item in itertools.chain((first,), iterator):
+        if compiled is not None:
+            item = compiled.extract(item)
+        if item is None:
+            append(None)
+        elif item.__class__ is list:
+            values = list()
+            for element in item:
+                found = _find_extension(element, urls, value)
+                if found is not None:
+                    values.append(found)
+            append(values)
+        else:
+            append(_find_extension(item, urls, value))
+    return result
+
+
+def _find_extension(
+    element: typing.Any, urls: typing.Tuple[str, ...], value: bool
+) -> typing.Any:
+    """ """
+    is_dict = isinstance(element, dict)
+    for url in urls:
+        if is_dict:
+            extensions = element.get("extension")
+        else:
+            extensions = getattr(element, "extension", None)
+        element = None
+        if extensions:
+            for extension in extensions:
+                if (extension.get("url") if is_dict else extension.url) == url:
+                    element = extension
+                    break
+        if element is None:
+            return None
+    if not value:
+        return element
+    if not is_dict:
+        return _get_extension_value(element, None)
+    for name, value_ in element.items():
+        if name[:5] == "value":
+            return value_
+    return None
+
+
+def _get_model_class(first: typing.Any, release: str) -> typing.Type[FHIRAbstractModel]:
+    """ """
+    if first is None:
+        raise ValueError("'model_class' is required for empty items.")
+    if not isinstance(first, dict):
+        # origin class of lazy model
+        return getattr(first, "__fhir_origin__", first.__class__)
+    return importlib.import_module(FHIR_RELEASES[release]).get_fhir_model_class(
+        first["resourceType"]
+    )
+
+
+def _to_numpy(
+    columns: typing.Dict[str, typing.List[typing.Any]]
+) -> typing.Dict[str, typing.Any]:
+    """Column dtype is inferred by NumPy, ``object`` when missing values or
+    collections are included."""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "NumPy library not found! Make sure ``numpy`` is installed "
+            "for ``output='numpy'``."
+        )
+    arrays = dict()
+    for path, column in columns.items():
+        if any(v is None or v.__class__ is list for v in column):
+            array = numpy.empty(len(column), dtype=object)
+            array[:] = column
+        else:
+            array = numpy.array(column)
+        arrays[path] = array
+    return arrays
+
+
+def _to_arrow(columns: typing.Dict[str, typing.List[typing.Any]]) -> typing.Any:
+    """Column type is inferred by pyarrow, column with mixed types (i.e. partial
+    dates of ``dateTime`` are kept as ``str``) is converted to ISO strings."""
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "pyarrow library not found! Make sure ``pyarrow`` is installed "
+            "for ``output='arrow'``."
+        )
+    arrays = dict()
+    for path, column in columns.items():
+        try:
+            arrays[path] = pyarrow.array(column)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            arrays[path] = pyarrow.array([_to_string(v) for v in column])
+    return pyarrow.table(arrays)
+
+
+def _to_string(value: typing.Any) -> typing.Any:
+    """ """
+    if value is None:
+        return None
+    if value.__class__ is list:
+        return [_to_string(v) for v in value]
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
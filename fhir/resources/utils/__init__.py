@@ -1,13 +1,15 @@
 # _*_ coding: utf-8 _*_
 import json
 import pathlib
-from typing import TYPE_CHECKING, Any, Callable, Union, cast, no_type_check
+from typing import IO, TYPE_CHECKING, Any, Callable, Type, Union, cast, no_type_check
 
 from pydantic.parse import Protocol
 from pydantic.parse import load_file as default_load_file
 from pydantic.parse import load_str_bytes as default_load_str_bytes
 from pydantic.types import StrBytes
 
+from .jsonstream import BundleEntryStream
+
 try:
     from .yaml import yaml_dumps, yaml_loads
 except ImportError:
@@ -37,7 +39,7 @@ except ImportError:
 
 
 try:
-    from .xml import xml_dumps, xml_loads
+    from .xml import XMLBundleEntryStream, xml_dump, xml_dumps, xml_loads
 except ImportError:
 
     def raise_lxml_import_error():
@@ -58,10 +60,25 @@ except ImportError:
     ):
         raise_lxml_import_error()
 
+    @no_type_check
+    def xml_dump(
+        model: "FHIRAbstractModel",  # noqa: F821
+        stream,
+        *,
+        pretty_print=False,
+        xml_declaration=True,
+        with_comments=True,
+    ):
+        raise_lxml_import_error()
+
     @no_type_check
     def xml_loads(cls, b, xmlparser=None):
         raise_lxml_import_error()
 
+    @no_type_check
+    def XMLBundleEntryStream(source, bundle_class, entry_class):  # noqa: N802
+        raise_lxml_import_error()
+
 
 __author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
 
@@ -143,3 +160,21 @@ def load_file(
             json_loads=json_loads,
         )
     return obj
+
+
+def bundle_entry_stream(
+    source: Union[str, pathlib.Path, IO],
+    bundle_class: "Type[FHIRAbstractModel]",  # noqa: F821
+    entry_class: "Type[FHIRAbstractModel]",  # noqa: F821
+    *,
+    chunk_size: int = 64 * 1024,
+    content_type: str = None,
+) -> Union[BundleEntryStream, "XMLBundleEntryStream"]:
+    """XML stream for ``.xml`` file or ``content_type`` ends with ``xml``,
+    otherwise JSON stream."""
+    if (content_type and content_type.endswith("xml")) or (
+        isinstance(source, (str, pathlib.Path))
+        and pathlib.Path(source).suffix.lower() == ".xml"
+    ):
+        return XMLBundleEntryStream(source, bundle_class, entry_class)
+    return BundleEntryStream(source, bundle_class, entry_class, chunk_size=chunk_size)
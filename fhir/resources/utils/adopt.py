@@ -0,0 +1,40 @@
+# _*_ coding: utf-8 _*_
+"""Adoption mode, composing models (i.e. ``Bundle`` from resources at hand) out of
+already validated instances. Inside ``adopting()``, model instance of the exact
+target class (or list of those) given to complex element field is stored by
+reference, on assignment without field validation and without running class
+(root) validators over the whole model again; class without required elements
+(i.e. ``BundleEntry``) initialized from such instances only is not validated.
+
+Aliasing: adopted value is shared, not copied. The very same object (adopted list
+as well) is reachable through the original reference and through the new parent,
+and any other parent it has been adopted by; mutation through one is seen by all
+of them, ``compact()`` of the parent compacts it in place. Use ``copy(deep=True)``
+where independent instance is required. Instances are not re-checked, instance
+made by ``construct()`` is adopted as it is.
+
+Instance of subclass or of other FHIR release, choice (``value[x]``) elements and
+classes with additional root validators are validated as usual."""
+import contextlib
+import threading
+import typing
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+_local = threading.local()
+
+
+def is_adopting() -> bool:
+    """Whether adoption mode is active in current thread."""
+    return getattr(_local, "adopting", False)
+
+
+@contextlib.contextmanager
+def adopting() -> typing.Iterator[None]:
+    """ """
+    previous = is_adopting()
+    _local.adopting = True
+    try:
+        yield
+    finally:
+        _local.adopting = previous
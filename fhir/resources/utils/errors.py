@@ -0,0 +1,240 @@
+# _*_ coding: utf-8 _*_
+"""Cheap error collection mode of validation. Errors are reported as flat list
+of FHIRPath like locations (``Bundle.entry[17].resource.code.coding[0].system``)
+instead of formatting ``ValidationError.errors()``, optionally validation of
+nested elements is stopped once the error limit has been reached."""
+import contextlib
+import importlib
+import threading
+import typing
+
+from pydantic.error_wrappers import ErrorWrapper, ValidationError, get_exc_type
+from pydantic.errors import PydanticValueError
+from pydantic.utils import ROOT_KEY
+
+if typing.TYPE_CHECKING:
+    from fhir.resources.fhirabstractmodel import FHIRAbstractModel
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+_local = threading.local()
+
+
+class ErrorLimitReached(PydanticValueError):
+    code = "error_limit"
+    msg_template = "Validation is stopped, {limit} error(s) have been found."
+
+
+class FHIRPathError(typing.NamedTuple):
+    """Single validation error, ``path`` is FHIRPath like location and ``type``
+    is pydantic error type (i.e. ``value_error.missing``)."""
+
+    path: str
+    type: str
+    msg: str
+
+
+class ErrorCollector:
+    """Counts errors of nested models while validation is in progress, see
+    ``fhirtypesvalidators.fhir_model_validator``."""
+
+    __slots__ = ("limit", "count")
+
+    def __init__(self, limit: typing.Optional[int] = None):
+        """ """
+        self.limit = limit
+        self.count = 0
+
+    def is_full(self) -> bool:
+        """ """
+        return self.limit is not None and self.count >= self.limit
+
+    def add(self, exc: ValidationError) -> None:
+        """Counts own errors of the model, errors of nested models are already
+        counted when their validation failed."""
+        self.count += _count_leaf_errors(exc.raw_errors)
+
+    def limit_error(self, model: typing.Type["FHIRAbstractModel"]) -> ValidationError:
+        """ """
+        return ValidationError(
+            [ErrorWrapper(ErrorLimitReached(limit=self.limit), loc=ROOT_KEY)], model
+        )
+
+
+def _count_leaf_errors(raw_errors: typing.Sequence[typing.Any]) -> int:
+    """ """
+    count = 0
+    for error in raw_errors:
+        if isinstance(error, ErrorWrapper):
+            if not isinstance(error.exc, (ValidationError, ErrorLimitReached)):
+                count += 1
+        else:
+            count += _count_leaf_errors(error)
+    return count
+
+
+def get_error_collector() -> typing.Optional[ErrorCollector]:
+    """Collector of the validation that is in progress in current thread."""
+    return getattr(_local, "collector", None)
+
+
+@contextlib.contextmanager
+def collect_errors(
+    limit: typing.Optional[int] = None,
+) -> typing.Iterator[ErrorCollector]:
+    """ """
+    previous = get_error_collector()
+    collector = ErrorCollector(limit)
+    _local.collector = collector
+    try:
+        yield collector
+    finally:
+        _local.collector = previous
+
+
+def _join_path(path: str, loc: typing.Tuple[typing.Union[int, str], ...]) -> str:
+    """ """
+    for item in loc:
+        if isinstance(item, int):
+            path = f"{path}[{item}]"
+        elif item != ROOT_KEY:
+            path = f"{path}.{item}"
+    return path
+
+
+def iter_errors(
+    raw_errors: typing.Sequence[typing.Any], path: str
+) -> typing.Iterator[typing.Union[FHIRPathError, ErrorLimitReached]]:
+    """Walks the error tree of ``ValidationError.raw_errors`` depth first,
+    yields leaf errors (``ErrorLimitReached`` as it is)."""
+    for error in raw_errors:
+        if not isinstance(error, ErrorWrapper):
+            yield from iter_errors(error, path)
+            continue
+        exc = error.exc
+        if isinstance(exc, ValidationError):
+            yield from iter_errors(exc.raw_errors, _join_path(path, error.loc_tuple()))
+        elif isinstance(exc, ErrorLimitReached):
+            yield exc
+        else:
+            yield FHIRPathError(
+                _join_path(path, error.loc_tuple()),
+                get_exc_type(exc.__class__),
+                str(exc),
+            )
+
+
+def flatten_errors(
+    exc: ValidationError, path: str, limit: typing.Optional[int] = None
+) -> typing.List[FHIRPathError]:
+    """Flat list of (at most ``limit``) errors, ``path`` is root element name.
+    When the limit has been reached, the last item is ``value_error.error_limit``
+    error of the root element."""
+    errors: typing.List[FHIRPathError] = []
+    limit_reached = False
+    for error in iter_errors(exc.raw_errors, path):
+        if isinstance(error, ErrorLimitReached):
+            limit_reached = True
+            continue
+        if limit is not None and len(errors) >= limit:
+            limit_reached = True
+            break
+        errors.append(error)
+    if limit_reached:
+        errors.append(
+            FHIRPathError(
+                path,
+                get_exc_type(ErrorLimitReached),
+                str(ErrorLimitReached(limit=limit)),
+            )
+        )
+    return errors
+
+
+def validate_collect(
+    klass: typing.Type["FHIRAbstractModel"],
+    obj: typing.Any,
+    limit: typing.Optional[int] = None,
+) -> typing.Tuple[typing.Optional["FHIRAbstractModel"], typing.List[FHIRPathError]]:
+    """Validates ``obj`` (dict or JSON str/bytes) against ``klass``, returns the
+    model and empty list or ``None`` and flat list of errors."""
+    path = klass.get_resource_type()
+    if isinstance(obj, (str, bytes)):
+        try:
+            obj = klass.__config__.json_loads(obj)  # type: ignore
+        except ValueError as exc:
+            return None, [FHIRPathError(path, "value_error.jsondecode", str(exc))]
+    with collect_errors(limit) as collector:
+        try:
+            return klass.parse_obj(obj), []
+        except ValidationError as exc:
+            collector.add(exc)
+            return None, flatten_errors(exc, path, limit)
+
+
+OUTCOME_ISSUE_TYPES = {
+    "value_error.missing": "required",
+    "type_error.none.not_allowed": "required",
+    "value_error.extra": "structure",
+    "value_error.jsondecode": "structure",
+    "value_error.wrong.resource_type": "structure",
+    "value_error.error_limit": "too-costly",
+}
+
+
+def make_outcome_issues(
+    errors: typing.Iterable[FHIRPathError], location: str = "expression"
+) -> typing.List[typing.Dict[str, typing.Any]]:
+    """``OperationOutcome.issue`` values of the errors, FHIRPath goes to
+    ``location`` element (``location`` for DSTU2, otherwise ``expression``)."""
+    issues = []
+    for error in errors:
+        code = OUTCOME_ISSUE_TYPES.get(error.type, "value")
+        issues.append(
+            {
+                "severity": code == "too-costly" and "information" or "error",
+                "code": code,
+                "diagnostics": error.msg,
+                location: [error.path],
+            }
+        )
+    return issues
+
+
+def make_operation_outcome(
+    klass: typing.Type["FHIRAbstractModel"], errors: typing.List[FHIRPathError]
+) -> "FHIRAbstractModel":
+    """``OperationOutcome`` (of the same FHIR release as ``klass``) of the errors,
+    single informational issue if there is no error. Issues are made here, so
+    the outcome is built without validation where possible."""
+    validators = importlib.import_module(
+        klass.__module__.rsplit(".", 1)[0] + ".fhirtypesvalidators"
+    )
+    outcome_class = validators.get_fhir_model_class("OperationOutcome")
+    if len(errors) > 0:
+        issue_class = validators.get_fhir_model_class("OperationOutcomeIssue")
+        location = "expression" in issue_class.__fields__ and "expression"
+        issues = make_outcome_issues(errors, location or "location")
+    else:
+        issues = [
+            {
+                "severity": "information",
+                "code": "informational",
+                "diagnostics": "No issues detected during validation.",
+            }
+        ]
+    data = {"resourceType": "OperationOutcome", "issue": issues}
+    if hasattr(outcome_class, "construct_trusted"):
+        return outcome_class.construct_trusted(data)
+    return outcome_class.parse_obj(data)
+
+
+__all__ = [
+    "ErrorLimitReached",
+    "FHIRPathError",
+    "collect_errors",
+    "flatten_errors",
+    "make_operation_outcome",
+    "make_outcome_issues",
+    "validate_collect",
+]
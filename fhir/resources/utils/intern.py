@@ -0,0 +1,120 @@
+# _*_ coding: utf-8 _*_
+"""Opt-in interning of repeated primitive values at parse time. Real data repeats
+the same ``Coding.system``, ``Coding.code``, ``meta.profile`` values thousands of
+times per ``Bundle``, once interning is enabled all equal values of selected
+primitive types share one ``str`` instance (bounded, least recently used values
+are evicted)."""
+import collections
+import contextlib
+import typing
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+DEFAULT_INTERN_TYPES: typing.FrozenSet[str] = frozenset(
+    ["uri", "canonical", "code", "id"]
+)
+DEFAULT_MAXSIZE = 10000
+
+
+class StringInterner:
+    """Bounded LRU table of interned values, shared by all threads of the process.
+    Table operations are not locked, concurrent eviction at worst costs a miss."""
+
+    __slots__ = ("maxsize", "types", "hits", "misses", "_table")
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        types: typing.Iterable[str] = DEFAULT_INTERN_TYPES,
+    ):
+        """ """
+        if maxsize < 1:
+            raise ValueError("Maximum size must be more than 0.")
+        self.maxsize = maxsize
+        self.types = frozenset(types)
+        self.hits = 0
+        self.misses = 0
+        self._table: "collections.OrderedDict[str, str]" = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        """ """
+        return len(self._table)
+
+    def intern(self, value: str) -> str:
+        """Returns the already known equal value, remembers ``value`` otherwise."""
+        table = self._table
+        try:
+            known = table[value]
+        except KeyError:
+            table[value] = value
+            self.misses += 1
+            if len(table) > self.maxsize:
+                try:
+                    table.popitem(last=False)
+                except KeyError:
+                    pass
+            return value
+        try:
+            table.move_to_end(value)
+        except KeyError:
+            pass
+        self.hits += 1
+        return known
+
+    def clear(self) -> None:
+        """ """
+        self._table.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_interner: typing.Optional[StringInterner] = None
+
+
+def intern_value(value: str, type_name: typing.Optional[str]) -> str:
+    """Called by validators of string based primitive types (``fhirtypes``),
+    returns ``value`` as it is while interning is not enabled."""
+    interner = _interner
+    if interner is None or type_name not in interner.types:
+        return value
+    return interner.intern(value)
+
+
+def get_interner() -> typing.Optional[StringInterner]:
+    """ """
+    return _interner
+
+
+def enable_interning(
+    maxsize: int = DEFAULT_MAXSIZE,
+    types: typing.Iterable[str] = DEFAULT_INTERN_TYPES,
+) -> StringInterner:
+    """Enables interning (process wide) for FHIR primitive type names ``types``
+    (``fhir_type_name()``, i.e. ``"uri"``), all releases are covered.
+    ``Reference.reference`` is ``string``, add ``"string"`` to cover it as well,
+    with the cost of interning narrative and free text values too."""
+    global _interner
+    _interner = StringInterner(maxsize=maxsize, types=types)
+    return _interner
+
+
+def disable_interning() -> None:
+    """ """
+    global _interner
+    _interner = None
+
+
+@contextlib.contextmanager
+def interning(
+    maxsize: int = DEFAULT_MAXSIZE,
+    types: typing.Iterable[str] = DEFAULT_INTERN_TYPES,
+) -> typing.Iterator[StringInterner]:
+    """Interning is enabled only inside of ``with`` block, previous interner
+    (if any) is restored afterwards."""
+    global _interner
+    previous = _interner
+    interner = enable_interning(maxsize=maxsize, types=types)
+    try:
+        yield interner
+    finally:
+        _interner = previous
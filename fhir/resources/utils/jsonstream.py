@@ -0,0 +1,462 @@
+# _*_ coding: utf-8 _*_
+"""Incremental JSON writer, emits FHIR JSON bytes while traversing the model,
+without building intermediate ``dict`` tree. And incremental reader for large
+documents, i.e. ``Bundle`` entries could be validated one by one."""
+import codecs
+import io
+import json
+import pathlib
+import typing
+
+from pydantic.error_wrappers import ErrorWrapper, ValidationError
+
+from .lazy import LazyValue
+
+if typing.TYPE_CHECKING:
+    from fhir.resources.fhirabstractmodel import FHIRAbstractModel
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+FHIR_COMMENTS_FIELD_NAME = "fhir_comments"
+
+
+class JSONStreamWriter:
+    """Writes model as JSON into file like ``stream`` (binary or text) in
+    ``elements_sequence()`` order, same output as ``FHIRAbstractModel.json()``.
+    Writes are small, so provide buffered stream (i.e. ``open(path, "wb")``,
+    ``socket.makefile("wb")``) for good performance.
+    """
+
+    def __init__(
+        self,
+        stream: typing.IO,
+        *,
+        dumps: typing.Callable[[typing.Any], typing.Union[str, bytes]],
+        by_alias: bool = True,
+        exclude_none: bool = True,
+        exclude_comments: bool = False,
+        separators: typing.Tuple[str, str] = (",", ":"),
+    ):
+        """ """
+        if isinstance(stream, io.TextIOBase):
+            self._write = lambda b: stream.write(b.decode())
+        else:
+            self._write = stream.write
+        self._dumps = dumps
+        self.by_alias = by_alias
+        self.exclude_none = exclude_none
+        self.exclude_comments = exclude_comments
+        self._comma = separators[0].encode()
+        self._colon = separators[1].encode()
+        self._keys: typing.Dict[str, bytes] = dict()
+
+    def write(self, model: "FHIRAbstractModel") -> None:
+        """ """
+        self.write_model(model, b"", b"{}")
+
+    def dumps(self, value: typing.Any) -> bytes:
+        """Encodes leaf value."""
+        result = self._dumps(value)
+        if isinstance(result, str):
+            result = result.encode("utf-8", errors="strict")
+        return result
+
+    def key(self, name: str) -> bytes:
+        """ """
+        try:
+            return self._keys[name]
+        except KeyError:
+            key = self._keys[name] = self.dumps(name) + self._colon
+            return key
+
+    def write_model(
+        self,
+        model: "FHIRAbstractModel",
+        prefix: bytes,
+        empty: typing.Optional[bytes],
+    ) -> bool:
+        """Writes ``prefix`` followed by JSON object of ``model``. The ``prefix``
+        is only written if there is something to write, when the object has no
+        member ``empty`` is written instead, unless it is ``None``.
+        Returns ``True`` if anything has been written.
+        """
+        write = self._write
+        by_alias = self.by_alias
+        exclude_none = self.exclude_none
+        values = model.__dict__
+        opening = prefix + b"{"
+        wrote = False
+
+        if model.__class__.has_resource_base():
+            write(opening + self.key("resourceType") + self.dumps(model.resource_type))
+            wrote = True
+
+        for (
+            field_key,
+            alias,
+            is_model,
+            is_list,
+            ext_key,
+            ext_alias,
+        ) in model.get_serialization_plan():
+            v = values.get(field_key, None)
+            if v is None and exclude_none is True:
+                continue
+            head = (wrote and self._comma or opening) + self.key(
+                by_alias and alias or field_key
+            )
+            if self.write_value(model, v, head, is_model):
+                wrote = True
+            if ext_key is None:
+                continue
+            ext_val = values.get(ext_key, None)
+            if ext_val is None:
+                continue
+            head = (wrote and self._comma or opening) + self.key(
+                by_alias and ext_alias or ext_key
+            )
+            if self.write_value(model, ext_val, head, True, primitive_ext=True):
+                wrote = True
+
+        comments = values.get(FHIR_COMMENTS_FIELD_NAME, None)
+        if comments is not None and not self.exclude_comments:
+            write(
+                (wrote and self._comma or opening)
+                + self.key(FHIR_COMMENTS_FIELD_NAME)
+                + self.dumps(comments)
+            )
+            wrote = True
+
+        if wrote:
+            write(b"}")
+            return True
+        if empty is not None:
+            write(prefix + empty)
+            return True
+        return False
+
+    def write_value(
+        self,
+        parent: "FHIRAbstractModel",
+        value: typing.Any,
+        head: bytes,
+        is_model: typing.Optional[bool],
+        primitive_ext: bool = False,
+    ) -> bool:
+        """Writes ``head`` followed by the JSON value, returns ``False`` if
+        nothing written (value is considered as empty)."""
+        write = self._write
+        exclude_none = self.exclude_none
+
+        if value is None:
+            write(head + b"null")
+            return True
+
+        if is_model is not None and hasattr(value, "get_serialization_plan"):
+            if primitive_ext or exclude_none:
+                empty = None
+            else:
+                empty = b"{}"
+            return self.write_model(value, head, empty)
+
+        if is_model is not None and value.__class__ is list:
+            if len(value) == 0:
+                if primitive_ext or exclude_none:
+                    return False
+                write(head + b"[]")
+                return True
+            empty_item = exclude_none and b"null" or b"{}"
+            prefix = head + b"["
+            for item in value:
+                if item is None:
+                    write(prefix + b"null")
+                elif hasattr(item, "get_serialization_plan"):
+                    self.write_model(item, prefix, empty_item)
+                elif is_model is False:
+                    write(prefix + self.dumps(item))
+                else:
+                    self.write_any(parent, item, prefix, allow_empty=True)
+                prefix = self._comma
+            write(b"]")
+            return True
+
+        if is_model is False:
+            write(head + self.dumps(value))
+            return True
+
+        return self.write_any(parent, value, head, primitive_ext=primitive_ext)
+
+    def write_any(
+        self,
+        parent: "FHIRAbstractModel",
+        value: typing.Any,
+        head: bytes,
+        primitive_ext: bool = False,
+        allow_empty: bool = False,
+    ) -> bool:
+        """Fallback for values of unknown shape, goes through the generic
+        ``_fhir_get_value`` (materialized) conversion."""
+        if value.__class__ is LazyValue:
+            # never accessed raw data of lazy model, already in JSON form
+            value = value.raw or None
+        else:
+            value = parent._fhir_get_value(
+                value,
+                by_alias=self.by_alias,
+                exclude_none=self.exclude_none,
+                exclude_comments=self.exclude_comments,
+            )
+        if not allow_empty:
+            if value is None and self.exclude_none:
+                return False
+            if primitive_ext and (value is None or len(value) == 0):
+                return False
+        self._write(head + self.dumps(value))
+        return True
+
+
+def json_dump(
+    model: "FHIRAbstractModel",
+    stream: typing.IO,
+    *,
+    dumps: typing.Callable[[typing.Any], typing.Union[str, bytes]],
+    by_alias: bool = True,
+    exclude_none: bool = True,
+    exclude_comments: bool = False,
+    separators: typing.Tuple[str, str] = (",", ":"),
+) -> None:
+    """ """
+    writer = JSONStreamWriter(
+        stream,
+        dumps=dumps,
+        by_alias=by_alias,
+        exclude_none=exclude_none,
+        exclude_comments=exclude_comments,
+        separators=separators,
+    )
+    writer.write(model)
+
+
+class JSONStreamReader:
+    """Minimal pull parser on top of ``json.JSONDecoder.raw_decode``, reads
+    ``stream`` (binary or text) chunk by chunk. Only tokens of object/array
+    structure are walked by hand, every value is decoded as whole, so memory is
+    bounded by the largest single value (i.e. one ``Bundle.entry``).
+    """
+
+    WHITESPACE = " \t\n\r"
+
+    def __init__(self, stream: typing.IO, *, chunk_size: int = 64 * 1024):
+        """ """
+        self._stream = stream
+        self._chunk_size = chunk_size
+        if isinstance(stream, io.TextIOBase):
+            self._decoder = None
+        else:
+            self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int = None) -> bool:
+        """Reads next chunk into buffer, returns ``False`` on end of stream."""
+        if self._eof:
+            return False
+        chunk = self._stream.read(size or self._chunk_size)
+        if self._decoder is not None:
+            chunk = self._decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            self._eof = True
+            return False
+        if self._pos > 0:
+            # drop consumed part
+            self._buf = self._buf[self._pos :]
+            self._pos = 0
+        self._buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Returns next non whitespace character without consuming it,
+        empty string at the end of stream."""
+        while True:
+            buf, pos, length = self._buf, self._pos, len(self._buf)
+            while pos < length and buf[pos] in self.WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < length:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consumes next token, must be one of ``chars``."""
+        char = self.peek()
+        if char == "" or char not in chars:
+            raise ValueError(
+                f"Expecting any of '{chars}' at position {self._pos}, "
+                f"but got '{char or 'EOF'}'"
+            )
+        self._pos += 1
+        return char
+
+    def read_value(self) -> typing.Any:
+        """Decodes the next complete JSON value."""
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+                # avoid quadratic re-scan for large values
+                size *= 2
+                continue
+            if end == len(self._buf) and not self._eof:
+                # literal/number might be truncated by chunk boundary
+                if self._fill(size):
+                    size *= 2
+                    continue
+            self._pos = end
+            return value
+
+    def iter_object(
+        self, on_array: typing.Callable[[str], bool] = None
+    ) -> typing.Generator[typing.Tuple[str, typing.Any], None, None]:
+        """Iterates ``(key, value)`` of the next JSON object. If ``on_array(key)``
+        returns ``True`` for array value, value is yielded as ``Ellipsis``
+        and the caller has to consume the array with ``iter_array`` before
+        continuing."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expecting object key at position {self._pos}")
+            self.expect(":")
+            if on_array is not None and self.peek() == "[" and on_array(key):
+                yield key, ...
+            else:
+                yield key, self.read_value()
+            if self.expect(",}") == "}":
+                return
+
+    def iter_array(self) -> typing.Generator[typing.Any, None, None]:
+        """Iterates items of the next JSON array."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.read_value()
+            if self.expect(",]") == "]":
+                return
+
+
+class BundleEntryStream:
+    """Iterates validated ``BundleEntry`` models of ``Bundle`` JSON document one
+    by one, memory is bounded by the largest single entry.
+
+    ``header`` is the ``Bundle`` model (without ``entry``) built from all the
+    elements found before ``entry`` (i.e. ``type``, ``total``, ``link``), which
+    is available right after construction. Elements after ``entry`` (i.e.
+    ``signature``) are merged into ``header`` when iteration is completed.
+    When required elements (i.e. ``type``) are not found before ``entry``,
+    ``header`` is ``None`` and validated once iteration is completed.
+    """
+
+    def __init__(
+        self,
+        source: typing.Union[str, pathlib.Path, typing.IO],
+        bundle_class: typing.Type["FHIRAbstractModel"],
+        entry_class: typing.Type["FHIRAbstractModel"],
+        *,
+        chunk_size: int = 64 * 1024,
+    ):
+        """ """
+        if isinstance(source, (str, pathlib.Path)):
+            self._stream = open(source, "rb")
+            self._owns_stream = True
+        else:
+            self._stream = source
+            self._owns_stream = False
+        self.bundle_class = bundle_class
+        self.entry_class = entry_class
+        self._reader = JSONStreamReader(self._stream, chunk_size=chunk_size)
+        self._members = self._reader.iter_object(lambda key: key == "entry")
+        self._header_data: typing.Dict[str, typing.Any] = dict()
+        self._has_entry = False
+        try:
+            for key, value in self._members:
+                if value is ... and key == "entry":
+                    self._has_entry = True
+                    break
+                self._header_data[key] = value
+        except ValueError as exc:
+            self.close()
+            raise ValidationError([ErrorWrapper(exc, loc="__root__")], bundle_class)
+        self.header: typing.Optional["FHIRAbstractModel"] = None
+        try:
+            self.header = bundle_class.parse_obj(self._header_data)
+        except ValidationError as exc:
+            # required elements could follow ``entry``
+            if not self._has_entry or any(
+                error["type"] != "value_error.missing" for error in exc.errors()
+            ):
+                self.close()
+                raise
+
+    def __iter__(self) -> typing.Iterator["FHIRAbstractModel"]:
+        """ """
+        if not self._has_entry:
+            self.close()
+            return
+        self._has_entry = False
+        try:
+            items = self._reader.iter_array()
+            index = 0
+            while True:
+                try:
+                    item = next(items, ...)
+                except ValueError as exc:
+                    # malformed or truncated document
+                    raise ValidationError(
+                        [ErrorWrapper(exc, loc=("entry", index))], self.bundle_class
+                    )
+                if item is ...:
+                    break
+                try:
+                    yield self.entry_class.parse_obj(item)
+                except ValidationError as exc:
+                    raise ValidationError(
+                        [ErrorWrapper(exc, loc=("entry", index))], self.bundle_class
+                    )
+                index += 1
+            try:
+                trailer = dict(self._members)
+            except ValueError as exc:
+                raise ValidationError(
+                    [ErrorWrapper(exc, loc="__root__")], self.bundle_class
+                )
+            if len(trailer) > 0 or self.header is None:
+                self._header_data.update(trailer)
+                self.header = self.bundle_class.parse_obj(self._header_data)
+        finally:
+            self.close()
+
+    def close(self):
+        """ """
+        if self._owns_stream and not self._stream.closed:
+            self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+__all__ = ["JSONStreamWriter", "json_dump", "JSONStreamReader", "BundleEntryStream"]
@@ -0,0 +1,20 @@
+# _*_ coding: utf-8 _*_
+import typing
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+class LazyValue:
+    """Marker for never accessed raw (parsed JSON) value of complex element of
+    model created by ``parse_obj_lazy()``, it is validated and replaced by the
+    model on first attribute access."""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: typing.Any):
+        """ """
+        self.raw = raw
+
+    def __repr__(self) -> str:
+        """ """
+        return f"LazyValue({self.raw!r})"
@@ -0,0 +1,148 @@
+# _*_ coding: utf-8 _*_
+"""Cache of validated values of high cardinality primitive types (``code``, ``id``,
+``uri``, ``oid``, ``date``, ``dateTime``, ``instant``). Terminology heavy resources
+(``ValueSet`` expansions, ``CodeSystem`` concepts) repeat the same values constantly,
+repeated value is taken from the cache instead of running the whole validator
+chain (regex included) again. Invalid values are never cached."""
+import collections
+import typing
+
+from pydantic.class_validators import make_generic_validator
+from pydantic.types import ConstrainedStr
+
+from .intern import intern_value
+
+if typing.TYPE_CHECKING:
+    from pydantic import BaseConfig
+    from pydantic.class_validators import ValidatorCallable
+    from pydantic.fields import ModelField
+    from pydantic.types import CallableGenerator
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+DEFAULT_CACHE_MAXSIZE = 4096
+
+
+class ValueCache:
+    """Bounded LRU table of validated values keyed by raw string. Table operations
+    are not locked, concurrent eviction at worst costs a miss."""
+
+    __slots__ = ("maxsize", "hits", "misses", "_table")
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_MAXSIZE):
+        """ """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._table: "collections.OrderedDict[str, typing.Any]" = (
+            collections.OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        """ """
+        return len(self._table)
+
+    def get(self, key: str) -> typing.Any:
+        """Returns cached value or ``None``."""
+        try:
+            value = self._table[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        try:
+            self._table.move_to_end(key)
+        except KeyError:
+            pass
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: typing.Any) -> None:
+        """ """
+        if self.maxsize < 1:
+            return
+        table = self._table
+        table[key] = value
+        if len(table) > self.maxsize:
+            try:
+                table.popitem(last=False)
+            except KeyError:
+                pass
+
+    def clear(self) -> None:
+        """ """
+        self._table.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class ValueCacheMixin:
+    """Gives each (sub)class own ``ValueCache``, sized by ``value_cache_maxsize``
+    (``0`` disables caching)."""
+
+    value_cache_maxsize: int = DEFAULT_CACHE_MAXSIZE
+    __value_cache__: ValueCache
+
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        """ """
+        super().__init_subclass__(**kwargs)  # type: ignore
+        cls.__value_cache__ = ValueCache(cls.value_cache_maxsize)
+
+    @classmethod
+    def configure_value_cache(cls, maxsize: int) -> None:
+        """Resizes (and clears) the cache of this class."""
+        cls.value_cache_maxsize = maxsize
+        cls.__value_cache__ = ValueCache(maxsize)
+
+    @classmethod
+    def clear_value_cache(cls) -> None:
+        """Must be called when constraints of the class are changed."""
+        cls.__value_cache__.clear()
+
+
+class CachedConstrainedStr(ValueCacheMixin, ConstrainedStr):
+    """``ConstrainedStr`` whose whole validator chain is replaced by single validator,
+    raw ``str`` value found in the cache is returned right away. Cache is keyed by
+    value only, so it assumes the same model config (string constraints) for all
+    fields of the type, which is the case for FHIR models."""
+
+    __visit_name__: typing.Optional[str] = None
+    __validator_chain__: typing.Optional[typing.List["ValidatorCallable"]] = None
+
+    @classmethod
+    def __get_validators__(cls) -> "CallableGenerator":
+        """ """
+        yield cls.validate_cached
+
+    @classmethod
+    def validate_cached(
+        cls, value: typing.Any, field: "ModelField", config: "BaseConfig"
+    ) -> str:
+        """ """
+        if value.__class__ is not str:
+            return cls._run_validator_chain(value, field, config)
+        cache = cls.__value_cache__
+        cached = cache.get(value)
+        if cached is not None:
+            # raw value is kept (as without cache), unless validators changed it
+            if cached == value:
+                cached = value
+            return intern_value(cached, cls.__visit_name__)
+        validated = cls._run_validator_chain(value, field, config)
+        cache.set(value, validated)
+        return validated
+
+    @classmethod
+    def _run_validator_chain(
+        cls, value: typing.Any, field: "ModelField", config: "BaseConfig"
+    ) -> str:
+        """Regular ``ConstrainedStr`` validators."""
+        chain = cls.__dict__.get("__validator_chain__")
+        if chain is None:
+            chain = [
+                make_generic_validator(validator)
+                for validator in ConstrainedStr.__get_validators__.__func__(cls)
+            ]
+            cls.__validator_chain__ = chain
+        for validator in chain:
+            value = validator(cls, value, {}, field, config)
+        return value
@@ -1,12 +1,16 @@
 # _*_ coding: utf-8 _*_
+import codecs
 import importlib
+import io
 import typing
 from collections import OrderedDict, deque
 from copy import copy
+from functools import lru_cache
 from pathlib import Path
 
 from lxml import etree  # type: ignore
 from lxml.etree import QName  # type: ignore
+from pydantic.error_wrappers import ErrorWrapper, ValidationError
 from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
 
 if typing.TYPE_CHECKING:
@@ -95,6 +99,123 @@ def get_fhir_root_module(fhir_release: str):
     return FHIR_ROOT_MODULES[fhir_release]
 
 
+XML_PRIMITIVE = "primitive"
+XML_XHTML = "xhtml"
+XML_MODEL = "model"
+XML_RESOURCE = "resource"
+XML_PRIMITIVE_EXTENSION = "primitive_extension"
+
+
+@lru_cache(maxsize=None)
+def get_xml_field_type(type_: typing.Any) -> typing.Tuple[str, typing.Any]:
+    """Kind of XML element (one of ``XML_*``) and model class (``None`` for
+    primitives) of the field type, resolved once per type."""
+    if is_primitive_type(type_):
+        if get_fhir_type_name(type_) == "xhtml":
+            return XML_XHTML, None
+        return XML_PRIMITIVE, None
+    if getattr(type_, "__resource_type__", None) is None:
+        # ``typing.Optional[FHIRPrimitiveExtensionType]`` (``__ext`` of list)
+        for arg in getattr(type_, "__args__", ()):
+            if getattr(arg, "__name__", None) == "FHIRPrimitiveExtensionType":
+                type_ = arg
+                break
+        else:
+            raise NotImplementedError
+    target = get_fhir_model_class(type_, False)
+    resource_type = target.get_resource_type()
+    if resource_type == "Resource":
+        return XML_RESOURCE, target
+    if resource_type == "FHIRPrimitiveExtension":
+        return XML_PRIMITIVE_EXTENSION, target
+    return XML_MODEL, target
+
+
+class XMLField:
+    """XML metadata of single model field, see ``XMLModelDescriptor``."""
+
+    __slots__ = (
+        "field",
+        "name",
+        "alias",
+        "is_list",
+        "kind",
+        "target",
+        "ext_field",
+        "is_attribute",
+    )
+
+    def __init__(self, field: "ModelField", ext_field: "ModelField", is_attribute):
+        """ """
+        if field.shape not in (SHAPE_LIST, SHAPE_SINGLETON):
+            raise NotImplementedError
+        self.field = field
+        self.name = field.name
+        self.alias = field.alias
+        self.is_list = field.shape == SHAPE_LIST
+        self.kind, self.target = get_xml_field_type(field.type_)
+        self.ext_field = ext_field
+        self.is_attribute = is_attribute
+
+    def __repr__(self):
+        """ """
+        return f"<XMLField {self.alias} {self.kind}{self.is_list and '[]' or ''}>"
+
+
+class XMLModelDescriptor:
+    """Per model class XML metadata, computed once (see ``get_xml_descriptor``)
+    and shared by serialization (``Node.from_fhir_obj``, ``XMLStreamWriter``)
+    and deserialization (``Node.to_fhir``, ``model_from_element``)."""
+
+    __slots__ = (
+        "klass",
+        "resource_type",
+        "fields",
+        "sequence",
+        "root_module",
+        "primitive_ext_class",
+        "extension_class",
+    )
+
+    def __init__(self, klass: typing.Type["FHIRAbstractModel"]):
+        """ """
+        self.klass = klass
+        self.resource_type = klass.get_resource_type()
+        self.root_module = get_fhir_root_module(
+            klass.__fields__["id"].type_.__fhir_release__
+        )
+        self.primitive_ext_class = self.root_module.get_fhir_model_class(
+            "FHIRPrimitiveExtension"
+        )
+        self.extension_class = get_fhir_model_class(
+            self.primitive_ext_class.__fields__["extension"].type_, False
+        )
+        model_fields = klass.__fields__
+        # element name to field
+        self.fields: typing.Dict[str, XMLField] = dict()
+        for alias, name in klass.get_alias_mapping().items():
+            field = model_fields[name]
+            self.fields[alias] = XMLField(
+                field,
+                model_fields.get(f"{name}__ext", None),
+                self.resource_type == "Extension" and alias in ("url", "id"),
+            )
+        # fields in the order of elements
+        self.sequence: typing.Tuple[XMLField, ...] = tuple(
+            self.fields[alias] for alias in klass.elements_sequence()
+        )
+
+    def __repr__(self):
+        """ """
+        return f"<XMLModelDescriptor {self.klass.__module__}.{self.klass.__name__}>"
+
+
+@lru_cache(maxsize=None)
+def get_xml_descriptor(klass: typing.Type["FHIRAbstractModel"]) -> XMLModelDescriptor:
+    """ """
+    return XMLModelDescriptor(klass)
+
+
 class SimpleNodeStorage:
 
     __slots__ = ("__storage__", "node")
@@ -594,8 +715,8 @@ class Node:
     def add_fhir_element(parent, field, value, ext=None, ext_field=None):
         """"""
         child = Node.create(field.alias)
-        field_type = field.type_
-        if is_primitive_type(field_type):
+        kind, _ = get_xml_field_type(field.type_)
+        if kind in (XML_PRIMITIVE, XML_XHTML):
             if isinstance(value, list):
                 if ext and not isinstance(ext, list):
                     raise NotImplementedError
@@ -658,27 +779,15 @@ class Node:
                     ext_field=ext_field,
                 )
             return
-        # we see it's instance of 'FHIRAbstractModel'
-        if getattr(field_type, "__resource_type__", None) is None:
-            type_str = str(field_type)
-            if (
-                type_str.startswith(("typing.Union[", "typing.Optional["))
-                and "fhirtypes.FHIRPrimitiveExtensionType" in type_str
-            ):
-                for cls in field_type.__args__:
-                    if cls.__name__ == "FHIRPrimitiveExtensionType":
-                        field_type = cls
-            else:
-                raise NotImplementedError
 
         parent_child = None
-        if get_fhir_type_name(field_type) == "Resource":
+        if kind == XML_RESOURCE:
             # special case
             parent_child = child
             child = Node.create(value.resource_type)
             parent_child.children.append(child)
 
-        if get_fhir_type_name(field_type) == "FHIRPrimitiveExtension":
+        if kind == XML_PRIMITIVE_EXTENSION:
             # this is an special primitive extension
             del child
             # xxx: handle comments (add comment to main element, parent in this case)
@@ -698,23 +807,17 @@ class Node:
         comments = value.__dict__.get("fhir_comments", None)
         Node.inject_comments(parent, comments)
 
-        alias_maps = value.__class__.get_alias_mapping()
-        for prop_name in value.__class__.elements_sequence():
-            field_ = value.__class__.__fields__[alias_maps[prop_name]]
-            val = value.__dict__.get(field_.name)
-            if (
-                field_type.fhir_type_name() == "Extension"
-                and field_.alias in ("url", "id")
-                and val
-            ):
-                child.add_attribute(field_.alias, val)
+        for xml_field in get_xml_descriptor(value.__class__).sequence:
+            val = value.__dict__.get(xml_field.name)
+            if xml_field.is_attribute and val:
+                child.add_attribute(xml_field.alias, val)
                 continue
-            if get_fhir_type_name(field_.type_) == "xhtml" and val:
+            if xml_field.kind == XML_XHTML and val:
                 # xxx: fhir-xhtml.xsd validation
                 xhtml_element = etree.fromstring(val)
                 if not (
                     xhtml_element.nsmap[None] == XHTML_NS
-                    and str(etree.QName(XHTML_NS, field_.alias))
+                    and str(etree.QName(XHTML_NS, xml_field.alias))
                 ):
                     raise ValueError
                 else:
@@ -722,18 +825,17 @@ class Node:
                     continue
 
             value_ext, value_ext_field = None, None
-            if is_primitive_type(field_.type_):
-                ext_key = f"{field_.name}__ext"
-                value_ext = value.__dict__.get(ext_key, None)
+            if xml_field.ext_field is not None:
+                value_ext = value.__dict__.get(xml_field.ext_field.name, None)
                 if value_ext:
-                    value_ext_field = value.__class__.__fields__[ext_key]
+                    value_ext_field = xml_field.ext_field
 
             if value_ext is None and val is None:
                 continue
 
             Node.add_fhir_element(
                 child,
-                field_,
+                xml_field.field,
                 val,
                 ext=value_ext,
                 ext_field=value_ext_field,
@@ -747,23 +849,20 @@ class Node:
     def from_fhir_obj(cls, model: "FHIRAbstractModel"):
         """ """
         resource_node = cls(model.resource_type, namespaces=[Namespace(None, ROOT_NS)])
-        alias_maps = model.__class__.get_alias_mapping()
-        for prop_name in model.__class__.elements_sequence():
-            field = model.__class__.__fields__[alias_maps[prop_name]]
-            value = model.__dict__.get(field.name, None)
+        for xml_field in get_xml_descriptor(model.__class__).sequence:
+            value = model.__dict__.get(xml_field.name, None)
             value_ext, value_ext_field = None, None
-            if is_primitive_type(field.type_):
-                ext_key = f"{field.name}__ext"
-                value_ext = model.__dict__.get(ext_key, None)
+            if xml_field.ext_field is not None:
+                value_ext = model.__dict__.get(xml_field.ext_field.name, None)
                 if value_ext:
-                    value_ext_field = model.__class__.__fields__[ext_key]
+                    value_ext_field = xml_field.ext_field
 
             if value_ext is None and value is None:
                 continue
 
             Node.add_fhir_element(
                 resource_node,
-                field,
+                xml_field.field,
                 value,
                 ext=value_ext,
                 ext_field=value_ext_field,
@@ -889,19 +988,16 @@ class Node:
         obj: typing.Union["Node", etree._Element], field: "ModelField"
     ) -> typing.Any:
         """ """
-        if is_primitive_type(field.type_):
-            if field.type_.__name__ == "Xhtml":
-                if isinstance(obj, etree._Element):
-                    value = etree.tostring(obj)
-                else:
-                    # we assume Node
-                    value = obj.to_string(pretty_print=False, xml_declaration=False)
-                return value
-
+        kind, klass_ = get_xml_field_type(field.type_)
+        if kind == XML_XHTML:
+            if isinstance(obj, etree._Element):
+                value = etree.tostring(obj)
+            else:
+                # we assume Node
+                value = obj.to_string(pretty_print=False, xml_declaration=False)
+        elif kind == XML_PRIMITIVE:
             value = obj.value
-
         else:
-            klass_ = get_fhir_model_class(field.type_, False)
             # field.shape
             value = obj.to_fhir(klass_)
 
@@ -909,19 +1005,15 @@ class Node:
 
     def to_fhir(self, klass: typing.Type["FHIRAbstractModel"]) -> "FHIRAbstractModel":
         """ """
-        if klass.get_resource_type() == "Resource" and len(self.children) > 0:
-            # tiny hack to get FHIR release
-            f_release = klass.__fields__["id"].type_.__fhir_release__
+        descriptor = get_xml_descriptor(klass)
+        if descriptor.resource_type == "Resource" and len(self.children) > 0:
             child = self.children[0]
-            klass_ = get_fhir_root_module(f_release).get_fhir_model_class(child.name)
+            klass_ = descriptor.root_module.get_fhir_model_class(child.name)
             return child.to_fhir(klass_)
 
-        fhir_release = klass.__fields__["id"].type_.__fhir_release__
-
         params: typing.Dict[str, typing.Any] = {
-            "resource_type": klass.get_resource_type()
+            "resource_type": descriptor.resource_type
         }
-        alias_maps = klass.get_alias_mapping()
         primitive_ext_list_values: typing.Dict[str, typing.Any] = {}
         if len(self.comments) > 0:
             comments = [c.to_string() for c in self.comments]
@@ -930,7 +1022,7 @@ class Node:
             else:
                 params["fhir_comments"] = comments
 
-        if klass.get_resource_type() == "Extension":
+        if descriptor.resource_type == "Extension":
             for attribute in self.attributes:
                 name, val = attribute.to_xml()
                 params[name] = val
@@ -941,16 +1033,11 @@ class Node:
             else:
                 field_name = child.name
             # important!
-            field_name = alias_maps[field_name]
-            field = klass.__fields__[field_name]
-            if field.shape == SHAPE_LIST:
-                is_list = True
-            elif field.shape == SHAPE_SINGLETON:
-                is_list = False
-            else:
-                raise NotImplementedError
+            xml_field = descriptor.fields[field_name]
+            field_name = xml_field.name
+            is_list = xml_field.is_list
 
-            value = Node.get_fhir_value(child, field)
+            value = Node.get_fhir_value(child, xml_field.field)
 
             if is_list:
                 if field_name not in params:
@@ -961,18 +1048,13 @@ class Node:
                 params[field_name] = value
 
             if (
-                is_primitive_type(field.type_)
+                xml_field.ext_field is not None
                 and isinstance(child, Node)
                 and (len(child.children) > 0 or len(child.comments) > 0)
             ):
-                ext_field_name = f"{field_name}__ext"
-
-                primitive_ext_klass = get_fhir_root_module(
-                    fhir_release
-                ).get_fhir_model_class("FHIRPrimitiveExtension")
-                ext_klass = get_fhir_model_class(
-                    primitive_ext_klass.__fields__["extension"].type_, False
-                )
+                ext_field_name = xml_field.ext_field.name
+                primitive_ext_klass = descriptor.primitive_ext_class
+                ext_klass = descriptor.extension_class
                 primitive_ext_params = {}
                 if len(child.comments) > 0:
                     p_ext_comments = [c.to_string() for c in child.comments]
@@ -1022,6 +1104,478 @@ class Node:
         return self.to_string(pretty_print=False)
 
 
+def _comments_value(comments: typing.List[str]) -> typing.Union[str, typing.List[str]]:
+    """ """
+    return len(comments) == 1 and comments[0] or comments
+
+
+def _primitive_extension_from_element(
+    element: etree._Element,
+    comments: typing.Optional[typing.List[str]],
+    primitive_ext_class: typing.Type["FHIRAbstractModel"],
+    extension_class: typing.Type["FHIRAbstractModel"],
+) -> typing.Optional["FHIRAbstractModel"]:
+    """``__ext`` value of primitive element from its children (extensions) and
+    preceding comments, ``None`` if there is neither."""
+    extensions = list()
+    child_comments = None
+    for child in element:
+        if child.tag is etree.Comment:
+            if child_comments is None:
+                child_comments = list()
+            child_comments.append(child.text)
+        elif isinstance(child.tag, str):
+            extensions.append(
+                model_from_element(child, extension_class, child_comments)
+            )
+            child_comments = None
+    if len(extensions) == 0 and not comments:
+        return None
+    params: typing.Dict[str, typing.Any] = dict()
+    if comments:
+        params["fhir_comments"] = _comments_value(comments)
+    if len(extensions) > 0:
+        params["extension"] = extensions
+    return primitive_ext_class(**params)
+
+
+def model_from_element(
+    element: etree._Element,
+    klass: typing.Type["FHIRAbstractModel"],
+    comments: typing.List[str] = None,
+) -> "FHIRAbstractModel":
+    """Builds model of ``klass`` from lxml element in single pass (no intermediate
+    ``Node`` tree), ``comments`` (preceding the element) become ``fhir_comments``.
+    Comments preceding primitive element go to its ``__ext`` value."""
+    descriptor = get_xml_descriptor(klass)
+    fields = descriptor.fields
+    params: typing.Dict[str, typing.Any] = {"resource_type": descriptor.resource_type}
+    if comments:
+        params["fhir_comments"] = _comments_value(comments)
+    if descriptor.resource_type == "Extension":
+        for name, value in element.attrib.items():
+            if name != "value":
+                params[name] = value
+
+    list_names: typing.List[str] = list()
+    list_exts: typing.Dict[str, typing.Dict[int, typing.Any]] = dict()
+    child_comments: typing.Optional[typing.List[str]] = None
+    for child in element:
+        tag = child.tag
+        if tag is etree.Comment:
+            if child_comments is None:
+                child_comments = list()
+            child_comments.append(child.text)
+            continue
+        if not isinstance(tag, str):
+            # processing instruction, entity
+            continue
+        name = tag[tag.find("}") + 1 :]
+        xml_field = fields[name]
+        field_name, is_list, kind = xml_field.name, xml_field.is_list, xml_field.kind
+        ext = None
+        try:
+            if kind == XML_PRIMITIVE:
+                value = child.get("value")
+                ext = _primitive_extension_from_element(
+                    child,
+                    child_comments,
+                    descriptor.primitive_ext_class,
+                    descriptor.extension_class,
+                )
+            elif kind == XML_MODEL:
+                value = model_from_element(child, xml_field.target, child_comments)
+            elif kind == XML_XHTML:
+                value = etree.tostring(child)
+            else:
+                # contained resource is wrapped by the element
+                value = None
+                inner_comments = None
+                for inner in child:
+                    if inner.tag is etree.Comment:
+                        if inner_comments is None:
+                            inner_comments = list()
+                        inner_comments.append(inner.text)
+                    elif isinstance(inner.tag, str):
+                        value = model_from_element(
+                            inner,
+                            descriptor.root_module.get_fhir_model_class(
+                                inner.tag[inner.tag.find("}") + 1 :]
+                            ),
+                            inner_comments,
+                        )
+                        break
+                if value is None:
+                    value = model_from_element(child, xml_field.target, child_comments)
+        except ValidationError as exc:
+            loc: typing.Any = name
+            if is_list:
+                loc = (name, len(params.get(field_name, ())))
+            raise ValidationError([ErrorWrapper(exc, loc=loc)], klass)
+
+        if is_list:
+            values = params.get(field_name, None)
+            if values is None:
+                values = params[field_name] = list()
+                list_names.append(field_name)
+            values.append(value)
+            if ext is not None:
+                list_exts.setdefault(field_name, dict())[len(values) - 1] = ext
+        else:
+            params[field_name] = value
+            if ext is not None:
+                params[f"{field_name}__ext"] = ext
+        if kind != XML_XHTML:
+            child_comments = None
+
+    for field_name in list_names:
+        values = params[field_name]
+        if field_name in list_exts:
+            exts = list_exts[field_name]
+            params[f"{field_name}__ext"] = [exts.get(i) for i in range(len(values))]
+        elif all(v is None for v in values):
+            del params[field_name]
+    return klass(**params)
+
+
+class XMLBundleEntryStream:
+    """Same as ``jsonstream.BundleEntryStream`` but for ``Bundle`` XML document,
+    built on ``etree.iterparse``. Each ``entry`` element is turned into model as
+    soon as it is parsed and then removed from the tree, so memory is bounded by
+    the largest single entry.
+    """
+
+    def __init__(
+        self,
+        source: typing.Union[str, Path, typing.IO],
+        bundle_class: typing.Type["FHIRAbstractModel"],
+        entry_class: typing.Type["FHIRAbstractModel"],
+    ):
+        """ """
+        if isinstance(source, (str, Path)):
+            self._stream = open(source, "rb")
+            self._owns_stream = True
+        else:
+            self._stream = source
+            self._owns_stream = False
+        self.bundle_class = bundle_class
+        self.entry_class = entry_class
+        self._events = etree.iterparse(self._stream, events=("start", "end"))
+        self._depth = 0
+        self._root: typing.Optional[etree._Element] = None
+        # completed elements other than ``entry`` are moved here
+        self._header_element = etree.Element("Bundle")
+        self._has_entry = False
+        try:
+            for event, element in self._events:
+                if event == "start":
+                    self._depth += 1
+                    if self._depth == 1:
+                        self._root = element
+                    elif self._depth == 2 and self._is_entry(element):
+                        self._has_entry = True
+                        break
+                    continue
+                self._depth -= 1
+                if self._depth == 1:
+                    self._move_to_header(element)
+        except etree.XMLSyntaxError as exc:
+            self.close()
+            raise ValidationError([ErrorWrapper(exc, loc="__root__")], bundle_class)
+        self.header = model_from_element(self._header_element, bundle_class)
+
+    @staticmethod
+    def _is_entry(element: etree._Element) -> bool:
+        """ """
+        tag = element.tag
+        return tag[tag.find("}") + 1 :] == "entry"
+
+    @staticmethod
+    def _preceding_comments(element: etree._Element) -> typing.List[etree._Element]:
+        """ """
+        comments = list()
+        previous = element.getprevious()
+        while previous is not None and previous.tag is etree.Comment:
+            comments.insert(0, previous)
+            previous = previous.getprevious()
+        return comments
+
+    def _move_to_header(self, element: etree._Element) -> None:
+        """ """
+        for comment in self._preceding_comments(element):
+            self._header_element.append(comment)
+        self._header_element.append(element)
+
+    def __iter__(self) -> typing.Iterator["FHIRAbstractModel"]:
+        """ """
+        if not self._has_entry:
+            self.close()
+            return
+        self._has_entry = False
+        root = typing.cast(etree._Element, self._root)
+        index = 0
+        has_trailer = False
+        try:
+            for event, element in self._events:
+                if event == "start":
+                    self._depth += 1
+                    continue
+                self._depth -= 1
+                if self._depth != 1:
+                    continue
+                if not self._is_entry(element):
+                    self._move_to_header(element)
+                    has_trailer = True
+                    continue
+                comments = self._preceding_comments(element)
+                try:
+                    model = model_from_element(
+                        element, self.entry_class, [c.text for c in comments]
+                    )
+                except ValidationError as exc:
+                    raise ValidationError(
+                        [ErrorWrapper(exc, loc=("entry", index))], self.bundle_class
+                    )
+                for comment in comments:
+                    root.remove(comment)
+                root.remove(element)
+                index += 1
+                yield model
+            if has_trailer:
+                self.header = model_from_element(
+                    self._header_element, self.bundle_class
+                )
+        except etree.XMLSyntaxError as exc:
+            raise ValidationError(
+                [ErrorWrapper(exc, loc="__root__")], self.bundle_class
+            )
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """ """
+        if self._owns_stream:
+            self._stream.close()
+
+
+class _TextStreamAdapter:
+    """Binary ``write`` on top of text stream, for ``etree.xmlfile``."""
+
+    def __init__(self, stream: typing.IO):
+        """ """
+        self._stream = stream
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def write(self, data: bytes) -> None:
+        """ """
+        self._stream.write(self._decoder.decode(data))
+
+
+class XMLStreamWriter:
+    """Writes model as FHIR XML into file like ``stream`` (binary or text) with
+    ``etree.xmlfile``, element by element while traversing the model, without
+    building ``Node`` or lxml tree of the whole resource. Output is the same as
+    ``xml_dumps()`` (``fhir_comments``, primitive extensions, XHTML narrative).
+    """
+
+    def __init__(
+        self,
+        stream: typing.IO,
+        *,
+        pretty_print: bool = False,
+        xml_declaration: bool = True,
+        with_comments: bool = True,
+    ):
+        """ """
+        if isinstance(stream, io.TextIOBase):
+            stream = _TextStreamAdapter(stream)
+        self._stream = stream
+        self.pretty_print = pretty_print
+        self.xml_declaration = xml_declaration
+        self.with_comments = with_comments
+
+    def write(self, model: "FHIRAbstractModel") -> None:
+        """ """
+        with etree.xmlfile(self._stream, encoding="utf-8") as xf:
+            if self.xml_declaration:
+                xf.write_declaration()
+            attrib, children = self.get_children(model, None)
+            self.write_node(
+                xf, 0, model.resource_type, attrib, children, {None: ROOT_NS}
+            )
+        if self.pretty_print:
+            self._stream.write(b"\n")
+
+    def get_children(
+        self, model: "FHIRAbstractModel", field_type: typing.Any
+    ) -> typing.Tuple[typing.Dict[str, str], typing.List[typing.Tuple]]:
+        """XML attributes and (field, value, ext, ext field) items of elements of
+        the model, same selection as ``Node.from_fhir_obj``/``add_fhir_element``."""
+        attrib = OrderedDict()
+        children = list()
+        values = model.__dict__
+        for xml_field in get_xml_descriptor(model.__class__).sequence:
+            value = values.get(xml_field.name, None)
+            if field_type is not None and xml_field.is_attribute and value:
+                attrib[xml_field.alias] = value
+                continue
+            if value and xml_field.kind == XML_XHTML:
+                children.append((xml_field.field, value, None, None))
+                continue
+            value_ext, value_ext_field = None, None
+            if xml_field.ext_field is not None:
+                value_ext = values.get(xml_field.ext_field.name, None)
+                if value_ext:
+                    value_ext_field = xml_field.ext_field
+            if value_ext is None and value is None:
+                continue
+            children.append((xml_field.field, value, value_ext, value_ext_field))
+        return attrib, children
+
+    def write_node(
+        self,
+        xf: typing.Any,
+        depth: int,
+        name: str,
+        attrib: typing.Dict[str, str],
+        children: typing.List[typing.Tuple],
+        nsmap: typing.Dict[StrNone, str] = None,
+    ) -> None:
+        """ """
+        if self.pretty_print and depth > 0:
+            xf.write("\n" + "  " * depth)
+        if len(children) == 0:
+            element = etree.Element(name, attrib, nsmap=nsmap)
+            xf.write(element)
+            return
+        with xf.element(name, attrib, nsmap=nsmap):
+            for field, value, ext, ext_field in children:
+                self.write_element(xf, depth + 1, field, value, ext, ext_field)
+            if self.pretty_print:
+                xf.write("\n" + "  " * depth)
+
+    @classmethod
+    def indent(cls, element: etree._Element, depth: int) -> None:
+        """Indents (in place) the same way as libxml2 pretty print does, only
+        element without any text (mixed content) gets its children indented."""
+        children = list(element)
+        if len(children) == 0 or element.text or any(c.tail for c in children):
+            return
+        element.text = "\n" + "  " * (depth + 1)
+        for child in children:
+            child.tail = element.text
+            cls.indent(child, depth + 1)
+        children[-1].tail = "\n" + "  " * depth
+
+    def write_comments(
+        self, xf: typing.Any, depth: int, comments: typing.Union[str, typing.List[str]]
+    ) -> None:
+        """ """
+        if not comments or not self.with_comments:
+            return
+        if isinstance(comments, str):
+            comments = [comments]
+        for comment in comments:
+            if self.pretty_print:
+                xf.write("\n" + "  " * depth)
+            xf.write(etree.Comment(comment))
+
+    def write_element(
+        self,
+        xf: typing.Any,
+        depth: int,
+        field: "ModelField",
+        value: typing.Any,
+        ext: typing.Any = None,
+        ext_field: "ModelField" = None,
+    ) -> None:
+        """Writes element(s) of the field value, see ``Node.add_fhir_element``."""
+        field_type = field.type_
+        kind, _ = get_xml_field_type(field_type)
+        if kind in (XML_PRIMITIVE, XML_XHTML):
+            if isinstance(value, list):
+                if ext and not isinstance(ext, list):
+                    raise NotImplementedError
+                if ext and len(ext) != len(value):
+                    raise NotImplementedError
+                for idx, val in enumerate(value):
+                    ext_ = ext and ext[idx] or None
+                    if ext_ is None and val is None:
+                        continue
+                    self.write_element(xf, depth, field, val, ext_, ext_field)
+                return
+            if kind == XML_XHTML:
+                xhtml_element = etree.fromstring(value)
+                if not xhtml_element.nsmap[None] == XHTML_NS:
+                    raise ValueError
+                if self.pretty_print:
+                    xf.write("\n" + "  " * depth)
+                    self.indent(xhtml_element, depth)
+                xf.write(xhtml_element)
+                return
+            attrib = OrderedDict()
+            if value is not None:
+                value = xml_represent(field_type, value)
+                if value:
+                    attrib["value"] = value
+            exts = list()
+            if ext is not None:
+                for ext_ in isinstance(ext, list) and ext or [ext]:
+                    if ext_ is None:
+                        continue
+                    self.write_comments(
+                        xf, depth, ext_.__dict__.get("fhir_comments", None)
+                    )
+                    exts.append(ext_)
+                    if value is not None:
+                        break
+            children = list()
+            for ext_ in exts:
+                extensions = ext_.__dict__.get("extension", None)
+                if extensions:
+                    children.append(
+                        (ext_.__class__.__fields__["extension"], extensions, None, None)
+                    )
+            self.write_node(xf, depth, field.alias, attrib, children)
+            return
+
+        if isinstance(value, list):
+            for value_ in value:
+                self.write_element(xf, depth, field, value_, ext, ext_field)
+            return
+
+        self.write_comments(xf, depth, value.__dict__.get("fhir_comments", None))
+        attrib, children = self.get_children(value, field_type)
+        if kind == XML_RESOURCE:
+            # contained resource is wrapped by the element
+            if self.pretty_print:
+                xf.write("\n" + "  " * depth)
+            with xf.element(field.alias):
+                self.write_node(xf, depth + 1, value.resource_type, attrib, children)
+                if self.pretty_print:
+                    xf.write("\n" + "  " * depth)
+            return
+        self.write_node(xf, depth, field.alias, attrib, children)
+
+
+def xml_dump(
+    model: "FHIRAbstractModel",
+    stream: typing.IO,
+    *,
+    pretty_print=False,
+    xml_declaration=True,
+    with_comments=True,
+) -> None:
+    """ """
+    writer = XMLStreamWriter(
+        stream,
+        pretty_print=pretty_print,
+        xml_declaration=xml_declaration,
+        with_comments=with_comments,
+    )
+    writer.write(model)
+
+
 def xml_dumps(
     model: "FHIRAbstractModel",
     *,
@@ -1045,8 +1599,7 @@ def xml_loads(
 ) -> "FHIRAbstractModel":
     """ """
     root = etree.fromstring(b, parser=xmlparser)
-    node = Node.from_element(root)
-    return node.to_fhir(cls)
+    return model_from_element(root, cls)
 
 
-__all__ = ["xml_dumps", "xml_loads"]
+__all__ = ["xml_dumps", "xml_dump", "xml_loads", "XMLBundleEntryStream"]
@@ -25,6 +25,7 @@ test_requirements = [
     "coverage",
     "pytest>5.4.0;python_version>='3.6'",
     "pytest-cov>=2.10.0;python_version>='3.6'",
+    "pytest-benchmark",
     "flake8==3.8.3",
     "flake8-isort==3.0.0",
     "flake8-bugbear==20.1.4",
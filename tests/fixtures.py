@@ -1,8 +1,42 @@
+import json
 import os
 import pathlib
 from os.path import dirname
 
+import pytest  # type: ignore
+
+from fhir.resources import get_fhir_model_class
+
 TESTS_ROOT_PATH = pathlib.Path(dirname(os.path.abspath(__file__)))
 STATIC_PATH = TESTS_ROOT_PATH / "static"
 FHIR_XSD_DIR = STATIC_PATH / "xsd" / "fhir"
 IS_TRAVIS = "TRAVIS" in os.environ
+# R4 JSON fixtures of ``STATIC_PATH`` those are used across storage and
+# serialization tests, (resource type, file name)
+JSON_FIXTURES = (
+    ("Patient", "Patient-with-ext.json"),
+    ("Observation", "Observation.json"),
+)
+
+
+@pytest.fixture(params=JSON_FIXTURES, ids=[item[1] for item in JSON_FIXTURES])
+def json_fixture(request):
+    """(model class, path) of each of ``JSON_FIXTURES``."""
+    resource_type, filename = request.param
+    return get_fhir_model_class(resource_type), STATIC_PATH / filename
+
+
+def load_json_fixture(filename):
+    """JSON data (``dict``) of ``STATIC_PATH`` file, new object on each call."""
+    return json.loads((STATIC_PATH / filename).read_bytes())
+
+
+def make_bundle(*resources, bundle_type="collection", **members):
+    """``Bundle`` JSON data, an entry for each of ``resources``. ``members``
+    (i.e. ``total``, ``link``) come before ``entry``."""
+    return {
+        "resourceType": "Bundle",
+        "type": bundle_type,
+        **members,
+        "entry": [{"resource": resource} for resource in resources],
+    }
@@ -0,0 +1,73 @@
+# _*_ coding: utf-8 _*_
+import pickle
+
+import pytest  # type: ignore
+from pydantic import ValidationError
+
+from fhir.resources.patient import Patient
+
+from .fixtures import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def test_compact(json_fixture):
+    """ """
+    klass, path = json_fixture
+    expected = klass.parse_file(path)
+    model = klass.parse_file(path)
+    assert model.compact() is model
+    assert model == expected
+    for params in ({}, {"exclude_none": False}, {"by_alias": False}):
+        assert model.dict(**params) == expected.dict(**params)
+        assert model.json(**params) == expected.json(**params)
+    assert model.xml(pretty_print=True) == expected.xml(pretty_print=True)
+    assert pickle.loads(pickle.dumps(model)) == expected
+    assert model.copy(deep=True) == expected
+
+
+def test_compact_storage():
+    """ """
+    patient = Patient.parse_file(STATIC_PATH / "Patient-with-ext.json").compact()
+    assert "deceasedDateTime" not in patient.__dict__
+    assert "implicitRules" not in patient.name[0].__dict__
+    assert patient.deceasedDateTime is None
+    assert patient.name[0].family == "Chalmers"
+    assert patient.name[0].prefix is None
+    with pytest.raises(AttributeError):
+        patient.unknown
+    # copies are compact as well
+    for other in (
+        pickle.loads(pickle.dumps(patient)),
+        patient.copy(),
+        patient.copy(deep=True),
+    ):
+        assert "deceasedDateTime" not in other.__dict__
+        assert other.deceasedDateTime is None
+        assert other.name[0].prefix is None
+
+    # not stored field of other instance is not defaulted
+    patient = Patient.parse_file(STATIC_PATH / "Patient-with-ext.json")
+    del patient.__dict__["deceasedDateTime"]
+    with pytest.raises(AttributeError):
+        patient.deceasedDateTime
+
+
+def test_compact_assignment():
+    """ """
+    patient = Patient.parse_file(STATIC_PATH / "Patient-with-ext.json").compact()
+    patient2 = Patient.parse_file(STATIC_PATH / "Patient-with-ext.json").compact()
+    # same fields are shared
+    assert patient.__fields_set__ is patient2.__fields_set__
+    assert "language" not in patient.__fields_set__
+
+    patient.language = "en"
+    assert patient.language == "en"
+    assert "language" in patient.__fields_set__
+    assert "language" not in patient2.__fields_set__
+    assert patient2.language is None
+
+    # choice rule is still checked on assignment
+    patient.multipleBirthInteger = 2
+    with pytest.raises(ValidationError):
+        patient.deceasedDateTime = "2021-01-01"
@@ -0,0 +1,76 @@
+# _*_ coding: utf-8 _*_
+import json
+
+import pytest  # type: ignore
+from pydantic import ValidationError
+
+from fhir.resources import construct_fhir_elements
+
+from .fixtures import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def make_batch():
+    """ """
+    patient = json.loads((STATIC_PATH / "Patient-with-ext.json").read_bytes())
+    observation = json.loads((STATIC_PATH / "Observation.json").read_bytes())
+    invalid = dict(observation, status=["final"])
+    return [
+        patient,
+        observation,
+        invalid,
+        json.dumps(patient),
+        (STATIC_PATH / "Observation.json").read_bytes(),
+        STATIC_PATH / "Patient-with-ext.json",
+        {"resourceType": "HumanName", "family": "Doe"},
+        b"[1, 2]",
+        patient,
+    ]
+
+
+def check_results(results):
+    """ """
+    assert len(results) == 9
+    types = [model and model.resource_type for model, _ in results]
+    assert types == [
+        "Patient",
+        "Observation",
+        None,
+        "Patient",
+        "Observation",
+        "Patient",
+        None,
+        None,
+        "Patient",
+    ]
+    errors = [error for _, error in results]
+    assert all(isinstance(errors[i], ValidationError) for i in (2, 6, 7))
+    assert errors[2].errors()[0]["loc"] == ("status",)
+    assert errors[6].errors()[0]["loc"] == ("__root__",)
+    assert "HumanName" in errors[6].errors()[0]["msg"]
+
+
+def test_construct_fhir_elements():
+    """ """
+    results = construct_fhir_elements(make_batch())
+    check_results(results)
+    assert results[0][0].json() == results[3][0].json() == results[5][0].json()
+
+    with pytest.raises(ValueError):
+        construct_fhir_elements([], executor="fiber")
+    with pytest.raises(LookupError):
+        construct_fhir_elements([], release="R5")
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_construct_fhir_elements_workers(executor):
+    """ """
+    expected = [
+        model and model.json() for model, _ in construct_fhir_elements(make_batch())
+    ]
+    results = construct_fhir_elements(
+        make_batch(), workers=2, executor=executor, chunk_size=2
+    )
+    check_results(results)
+    assert [model and model.json() for model, _ in results] == expected
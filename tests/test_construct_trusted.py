@@ -0,0 +1,59 @@
+# _*_ coding: utf-8 _*_
+import datetime
+import decimal
+import json
+
+from fhir.resources.bundle import Bundle
+from fhir.resources.observation import Observation
+from fhir.resources.patient import Patient
+
+from .fixtures import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def test_construct_trusted(json_fixture):
+    """ """
+    klass, path = json_fixture
+    data = json.loads(path.read_bytes())
+    expected = klass.parse_obj(data)
+    model = klass.construct_trusted(data)
+    assert model == expected
+    assert model.json() == expected.json()
+    assert model.__fields_set__ == expected.__fields_set__
+    # raw JSON string as well
+    assert klass.construct_trusted(json.dumps(data)) == expected
+
+
+def test_construct_trusted_elements():
+    """ """
+    patient = Patient.construct_trusted(
+        json.loads((STATIC_PATH / "Patient-with-ext.json").read_bytes())
+    )
+    # primitive extension inside list
+    given_ext = patient.contact[0].name.given__ext
+    assert given_ext[0] is None
+    assert given_ext[1].extension[0].valueCode == "MID"
+    # contained resource
+    assert patient.contained[0].resource_type == "Binary"
+
+
+def test_construct_trusted_nested_resources():
+    """ """
+    observation = json.loads((STATIC_PATH / "Observation.json").read_bytes())
+    bundle = Bundle.construct_trusted(
+        {
+            "resourceType": "Bundle",
+            "type": "collection",
+            "unknownElement": True,
+            "entry": [{"resource": observation}],
+        }
+    )
+    assert bundle.type == "collection"
+    resource = bundle.entry[0].resource
+    assert isinstance(resource, Observation)
+    # primitives are converted into the same python types as validation does
+    assert isinstance(resource.effectiveDateTime, datetime.datetime)
+    coding = resource.component[0].valueCodeableConcept.coding[0]
+    assert isinstance(coding.extension[0].valueDecimal, decimal.Decimal)
+    assert "unknownElement" not in bundle.json()
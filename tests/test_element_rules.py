@@ -0,0 +1,59 @@
+# _*_ coding: utf-8 _*_
+import pytest  # type: ignore
+from pydantic import ValidationError
+
+from fhir.resources.DSTU2.annotation import Annotation as DSTU2Annotation
+from fhir.resources.observation import Observation
+from fhir.resources.STU3.observation import Observation as STU3Observation
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def test_element_rules_table():
+    """ """
+    required_fields, one_of_many_fields = Observation.get_element_rules()
+    assert required_fields == (("status", Observation.__fields__["status__ext"]),)
+    assert [fields[0] for fields, _ in one_of_many_fields] == [
+        "effectiveDateTime",
+        "valueBoolean",
+    ]
+    assert Observation.get_element_rules() is Observation.get_element_rules()
+    assert [v.__name__ for v in Observation.__pre_root_validators__] == [
+        "validate_element_rules"
+    ]
+
+
+def test_required_primitive_elements():
+    """ """
+    code = {"text": "code"}
+    for klass in (Observation, STU3Observation):
+        with pytest.raises(ValidationError) as exc_info:
+            klass.parse_obj({"resourceType": "Observation", "code": code})
+        assert exc_info.value.errors()[0]["loc"] == ("__root__", "status")
+        assert exc_info.value.errors()[0]["type"] == "value_error.missing"
+
+        with pytest.raises(ValidationError) as exc_info:
+            klass.parse_obj({"status": None, "code": code})
+        assert exc_info.value.errors()[0]["type"] == "type_error.none.not_allowed"
+
+        # extension explains absent value
+        extension = {"extension": [{"url": "http://ext", "valueCode": "unknown"}]}
+        obj = klass.parse_obj({"_status": extension, "code": code})
+        assert obj.status is None
+
+
+def test_one_of_many_fields():
+    """ """
+    data = {"status": "final", "code": {"text": "code"}}
+    with pytest.raises(ValidationError) as exc_info:
+        Observation.parse_obj(dict(data, valueString="1", valueBoolean=True))
+    assert "but got multiple" in exc_info.value.errors()[0]["msg"]
+
+    obj = Observation.parse_obj(dict(data, valueString="1"))
+    assert obj.valueString == "1"
+
+    with pytest.raises(ValidationError) as exc_info:
+        DSTU2Annotation.parse_obj(
+            {"text": "x", "authorString": "a", "authorReference": {}}
+        )
+    assert exc_info.value.errors()[0]["loc"] == ("__root__",)
@@ -0,0 +1,112 @@
+# _*_ coding: utf-8 _*_
+import pickle
+
+from fhir.resources.extension import Extension
+from fhir.resources.patient import Patient
+from fhir.resources.STU3.patient import Patient as PatientSTU3
+
+from .fixtures import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+EXT = "http://example.org/fhir/StructureDefinition/"
+
+
+def test_get_extension():
+    """ """
+    patient = Patient.parse_file(STATIC_PATH / "Patient-with-ext.json")
+    avatar = patient.get_extension(EXT + "patientAvatar")
+    assert avatar is patient.extension[0]
+    assert patient.get_extension_value(EXT + "patientAvatar").display == "Duck image"
+    assert patient.get_extensions(EXT + "patientAvatar") == [avatar]
+    assert patient.get_extension("unknown") is None
+    assert patient.get_extensions("unknown") == []
+    assert patient.get_extension_value("unknown", "default") == "default"
+
+    # nested, extension of complex and primitive elements
+    complex_ = patient.get_extension(EXT + "complexExtensionExample")
+    assert patient.get_extension_value(EXT + "complexExtensionExample") is None
+    assert complex_.get_extension("nestedB").get_extension_value("nestedB1") == "hello"
+    coding = complex_.get_extension_value("nestedA")
+    assert coding.get_extension_value(EXT + "extraforcodingWithValue") == 45
+    assert patient.active__ext.get_extension_value(EXT + "recordStatus") == "archived"
+    assert patient.maritalStatus.get_extension_value(EXT + "nullFlavor") == "ASKU"
+    assert patient.name[0].get_extension("unknown") is None
+
+    patient_stu3 = PatientSTU3.parse_obj(
+        {"resourceType": "Patient", "extension": [{"url": "a", "valueCode": "b"}]}
+    )
+    assert patient_stu3.get_extension_value("a") == "b"
+
+    lazy = Patient.parse_obj_lazy(patient.dict())
+    assert lazy.get_extension_value(EXT + "patientAvatar").display == "Duck image"
+
+
+def test_get_extension_index():
+    """Index is rebuilt on change of extension element."""
+    patient = Patient.parse_file(STATIC_PATH / "Patient-with-ext.json")
+    url = EXT + "patientAvatar"
+    assert patient.get_extension(url) is not None
+    index = patient._fhir_extension_index
+    assert patient.get_extension(url) is not None
+    assert patient._fhir_extension_index is index
+    assert "_fhir_extension_index" not in patient.__dict__
+
+    patient.extension = patient.extension[1:]
+    assert patient.get_extension(url) is None
+    patient.extension.append(Extension(url=url, valueString="a"))
+    patient.extension.append(Extension(url=url, valueString="b"))
+    assert patient.get_extension_value(url) == "a"
+    assert [e.valueString for e in patient.get_extensions(url)] == ["a", "b"]
+    patient.extension = None
+    assert patient.get_extension(url) is None
+
+    # index is neither pickled nor copied
+    patient.extension = [Extension(url=url, valueString="c")]
+    patient.get_extension(url)
+    for other in (pickle.loads(pickle.dumps(patient)), patient.copy(deep=True)):
+        assert other == patient
+        assert not hasattr(other, "_fhir_extension_index")
+        assert other.get_extension_value(url) == "c"
+
+
+def test_get_extension_index_items_changed():
+    """Index is rebuilt when items are replaced or reordered in place."""
+    patient = Patient.parse_obj(
+        {
+            "resourceType": "Patient",
+            "extension": [
+                {"url": "a", "valueString": "1"},
+                {"url": "b", "valueString": "2"},
+            ],
+        }
+    )
+    assert patient.get_extension_value("a") == "1"
+    patient.extension[0] = Extension(url="c", valueString="3")
+    assert patient.get_extension("a") is None
+    assert patient.get_extension("c") is patient.extension[0]
+
+    patient.extension.reverse()
+    assert patient.get_extension("c") is patient.extension[1]
+    patient.extension.sort(key=lambda e: e.url)
+    assert patient.get_extension("b") is patient.extension[0]
+
+    # replaced by equal extension
+    extension = Extension(url="c", valueString="3")
+    assert extension == patient.extension[1]
+    patient.extension[1] = extension
+    assert patient.get_extension("c") is extension
+
+
+def test_get_extension_value_primitive_extension():
+    """``value[x]__ext`` is not value of the extension."""
+    extension = Extension.construct(
+        url="a", valueString=None, valueString__ext={"id": "q"}, valueCode="b"
+    )
+    patient = Patient.construct(extension=[extension])
+    assert patient.get_extension_value("a") == "b"
+    extension = Extension.construct(
+        url="a", valueString=None, valueString__ext={"id": "q"}
+    )
+    patient = Patient.construct(extension=[extension])
+    assert patient.get_extension_value("a", "default") == "default"
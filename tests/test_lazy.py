@@ -0,0 +1,100 @@
+# _*_ coding: utf-8 _*_
+import io
+import json
+
+import pytest  # type: ignore
+from pydantic import ValidationError
+
+from fhir.resources.bundle import Bundle
+from fhir.resources.fhirabstractmodel import LazyModelMixin
+from fhir.resources.observation import Observation
+from fhir.resources.utils.lazy import LazyValue
+
+from .fixtures import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def test_parse_obj_lazy(json_fixture):
+    """ """
+    klass, path = json_fixture
+    data = path.read_bytes()
+    expected = klass.parse_raw(data)
+    model = klass.parse_obj_lazy(data)
+    assert isinstance(model, klass)
+    assert model.get_lazy_class() is model.__class__
+
+    for params in (
+        {"by_alias": False},
+        {"exclude_none": False},
+        {"exclude_comments": True},
+    ):
+        model = klass.parse_obj_lazy(data)
+        assert model.dict(**params) == expected.dict(**params)
+        stream = io.BytesIO()
+        model.json(stream=stream, **params)
+        assert stream.getvalue() == expected.json(return_bytes=True, **params)
+
+    model = klass.parse_obj_lazy(data)
+    assert model.xml() == expected.xml()
+    materialized = klass.parse_obj_lazy(data).materialize()
+    assert materialized.__class__ is klass
+    assert materialized == expected
+
+
+def test_parse_obj_lazy_access():
+    """ """
+    data = json.loads((STATIC_PATH / "Observation.json").read_bytes())
+    observation = Observation.parse_obj_lazy(data)
+    # primitives are validated up front
+    assert observation.status == "final"
+    assert isinstance(observation.__dict__["code"], LazyValue)
+
+    assert observation.code.coding[0].code == "9273-4"
+    assert isinstance(observation.__dict__["code"], LazyModelMixin)
+    assert observation.component[0].code.text == data["component"][0]["code"]["text"]
+    # never accessed sub-tree is passed through as it is
+    assert isinstance(observation.__dict__["contained"], LazyValue)
+    assert json.loads(observation.json())["contained"] == data["contained"]
+
+    observation.code = {"text": "Apgar"}
+    assert observation.code.text == "Apgar"
+    with pytest.raises(ValidationError):
+        observation.code = {"coding": "invalid"}
+
+
+def test_parse_obj_lazy_errors():
+    """ """
+    data = json.loads((STATIC_PATH / "Observation.json").read_bytes())
+    data["component"].append({"code": {"text": "x"}, "unknown": True})
+    observation = Observation.parse_obj_lazy(data)
+    with pytest.raises(ValidationError) as exc_info:
+        observation.component
+    errors = exc_info.value.errors()
+    assert errors[0]["loc"] == ("component", len(data["component"]) - 1, "unknown")
+
+    # primitive and required elements are not deferred
+    with pytest.raises(ValidationError):
+        Observation.parse_obj_lazy(dict(data, effectiveDateTime="invalid"))
+    with pytest.raises(ValidationError):
+        Observation.parse_obj_lazy(dict(data, code=None))
+
+
+def test_parse_obj_lazy_bundle():
+    """ """
+    observation = json.loads((STATIC_PATH / "Observation.json").read_bytes())
+    bundle = Bundle.parse_obj_lazy(
+        {
+            "resourceType": "Bundle",
+            "type": "collection",
+            "entry": [
+                {"resource": observation},
+                {"resource": {"resourceType": "Patient", "active": "invalid"}},
+            ],
+        }
+    )
+    # entries are validated one level at a time
+    assert bundle.entry[0].resource.resource_type == "Observation"
+    assert isinstance(bundle.entry[1].__dict__["resource"], LazyValue)
+    with pytest.raises(ValidationError):
+        bundle.entry[1].resource
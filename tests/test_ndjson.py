@@ -0,0 +1,108 @@
+# _*_ coding: utf-8 _*_
+import io
+
+import pytest  # type: ignore
+from pydantic import ValidationError
+
+from fhir.resources.ndjson import iter_ndjson, write_ndjson
+from fhir.resources.observation import Observation
+from fhir.resources.patient import Patient
+
+from .fixtures import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def make_models():
+    """ """
+    patient = Patient.parse_file(STATIC_PATH / "Patient-with-ext.json")
+    observation = Observation.parse_file(STATIC_PATH / "Observation.json")
+    return [patient, observation, patient]
+
+
+def test_write_iter_ndjson(tmp_path):
+    """ """
+    models = make_models()
+    path = tmp_path / "data.ndjson"
+    assert write_ndjson(models, path) == 3
+    assert len(path.read_bytes().splitlines()) == 3
+
+    result = list(iter_ndjson(path))
+    assert [m.resource_type for m in result] == ["Patient", "Observation", "Patient"]
+    assert [m.json() for m in result] == [m.json() for m in models]
+
+    stream = io.StringIO()
+    write_ndjson(models[:1], stream)
+    stream.seek(0)
+    assert list(iter_ndjson(stream, "Patient"))[0].json() == models[0].json()
+
+
+def test_iter_ndjson_errors():
+    """ """
+    models = make_models()
+    stream = io.BytesIO()
+    write_ndjson(models, stream)
+    lines = stream.getvalue().splitlines()
+    lines[1] = lines[1].replace(b'"status"', b'"unknown"')
+    data = b"\n".join(lines)
+
+    with pytest.raises(ValidationError) as exc_info:
+        list(iter_ndjson(io.BytesIO(data)))
+    assert exc_info.value.errors()[0]["loc"][:2] == ("line", 2)
+
+    # wrong resource type for the whole file
+    with pytest.raises(ValidationError) as exc_info:
+        list(iter_ndjson(io.BytesIO(lines[0] + b"\n" + lines[2]), "Observation"))
+    assert exc_info.value.errors()[0]["loc"][:2] == ("line", 1)
+
+    with pytest.raises(ValidationError) as exc_info:
+        list(iter_ndjson(io.BytesIO(b'\n{"resourceType": "HumanName"}\n')))
+    assert exc_info.value.errors()[0]["loc"] == ("line", 2)
+
+
+def test_iter_ndjson_workers(tmp_path):
+    """ """
+    models = make_models()
+    path = tmp_path / "data.ndjson"
+    write_ndjson(models * 2, path)
+    expected = [m.json() for m in iter_ndjson(path)]
+    # shard boundaries fall inside lines as well as on line breaks.
+    for shard_size in (300, len(path.read_bytes().splitlines()[0]) + 1):
+        result = iter_ndjson(path, workers=2, shard_size=shard_size)
+        assert [m.json() for m in result] == expected
+
+    lines = path.read_bytes().splitlines()
+    lines[4] = lines[4].replace(b'"status"', b'"unknown"')
+    path.write_bytes(b"\n".join(lines))
+    with pytest.raises(ValidationError) as exc_info:
+        list(iter_ndjson(path, workers=2, shard_size=1000))
+    assert exc_info.value.errors()[0]["loc"][:2] == ("line", 5)
+
+
+def test_iter_ndjson_arguments(tmp_path):
+    """Wrong arguments are reported on call, not on first iteration."""
+    with pytest.raises(LookupError):
+        iter_ndjson(io.BytesIO(b""), fhir_release="R5")
+    with pytest.raises(FileNotFoundError):
+        iter_ndjson(tmp_path / "missing.ndjson")
+    with pytest.raises(FileNotFoundError):
+        iter_ndjson(tmp_path / "missing.ndjson", workers=2)
+    with pytest.raises(ValueError):
+        iter_ndjson(io.BytesIO(b""), workers=2)
+
+
+def test_write_iter_ndjson_dstu2():
+    """DSTU2 models are written as well."""
+    from fhir.resources.DSTU2.patient import Patient as PatientDSTU2
+
+    models = [
+        PatientDSTU2.parse_obj(
+            {"resourceType": "Patient", "id": str(i), "gender": "female"}
+        )
+        for i in range(2)
+    ]
+    for stream in (io.BytesIO(), io.StringIO()):
+        assert write_ndjson(models, stream) == 2
+        stream.seek(0)
+        result = list(iter_ndjson(stream, fhir_release="DSTU2"))
+        assert [m.dict() for m in result] == [m.dict() for m in models]
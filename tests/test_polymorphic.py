@@ -0,0 +1,104 @@
+# _*_ coding: utf-8 _*_
+import json
+import sys
+
+import pytest  # type: ignore
+from pydantic import ValidationError
+
+from fhir.resources import fhirtypes, fhirtypesvalidators
+from fhir.resources.bundle import Bundle
+from fhir.resources.DSTU2 import fhirtypesvalidators as fhirtypesvalidators_dstu2
+from fhir.resources.DSTU2.bundle import Bundle as BundleDSTU2
+from fhir.resources.fhirabstractmodel import FHIRAbstractModel
+from fhir.resources.observation import Observation
+from fhir.resources.patient import Patient
+
+from .fixtures import make_bundle
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def test_dispatch_table():
+    """ """
+    for module in (fhirtypesvalidators, fhirtypesvalidators_dstu2):
+        assert set(module.FHIR_TYPE_VALIDATORS) == set(module.MODEL_CLASSES)
+    # complex element fields are bound to the same validator
+    assert fhirtypesvalidators.FHIR_TYPE_VALIDATORS["Patient"] is next(
+        fhirtypes.PatientType.__get_validators__()
+    )
+
+
+def test_bound_field_validator():
+    """ """
+    calls = list()
+
+    def profile(frame, event, arg):
+        if event == "call":
+            calls.append(frame.f_code)
+
+    data = {
+        "resourceType": "Observation",
+        "status": "final",
+        "code": {"coding": [{"system": "http://loinc.org", "code": "8867-4"}]},
+        "subject": {"reference": "Patient/p1"},
+    }
+    sys.setprofile(profile)
+    try:
+        model = Observation.parse_obj(data)
+    finally:
+        sys.setprofile(None)
+    assert model.code.coding[0].code == "8867-4"
+    # nested elements are validated right into the model class
+    assert fhirtypesvalidators.fhir_model_validator.__code__ not in calls
+    assert calls.count(FHIRAbstractModel.__init__.__code__) == 1
+
+    # other values are validated as before
+    coding = model.code.coding[0]
+    model = Observation.parse_obj(dict(data, code={"coding": [coding]}))
+    assert model.code.coding[0] is coding
+    with pytest.raises(ValidationError) as exc_info:
+        Observation.parse_obj(dict(data, code={"resourceType": "Patient"}))
+    assert exc_info.value.errors()[0]["type"] == "value_error.wrong.resource_type"
+
+
+def test_polymorphic_dispatch():
+    """ """
+    patient = {"resourceType": "Patient", "id": "p1", "gender": "male"}
+    observation = {
+        "resourceType": "Observation",
+        "status": "final",
+        "code": {"text": "heart rate"},
+    }
+    bundle = Bundle.parse_obj(
+        make_bundle(
+            patient, json.dumps(observation), Patient.parse_obj(patient), observation
+        )
+    )
+    assert [e.resource.resource_type for e in bundle.entry] == [
+        "Patient",
+        "Observation",
+        "Patient",
+        "Observation",
+    ]
+    assert isinstance(bundle.entry[1].resource, Observation)
+
+    model = Observation.parse_obj(dict(observation, contained=[patient]))
+    assert isinstance(model.contained[0], Patient)
+
+    bundle = BundleDSTU2.parse_obj(make_bundle(patient))
+    assert bundle.entry[0].resource.resource_type == "Patient"
+
+    with pytest.raises(ValidationError) as exc_info:
+        Bundle.parse_obj(
+            make_bundle(dict(patient, birthDate="not a date"), observation)
+        )
+    assert exc_info.value.errors()[0]["loc"][:3] == ("entry", 0, "resource")
+
+    with pytest.raises(ValidationError):
+        Bundle.parse_obj(make_bundle("{invalid json"))
+
+    with pytest.raises(ValidationError) as exc_info:
+        Bundle.parse_obj(make_bundle({"resourceType": "Unknown"}))
+    error = exc_info.value.errors()[0]
+    assert error["loc"] == ("entry", 0, "resource")
+    assert error["type"] == "value_error.wrong.resource_type"
@@ -0,0 +1,34 @@
+# _*_ coding: utf-8 _*_
+import json
+
+from fhir.resources import profile_import
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def test_get_modules():
+    """ """
+    modules = profile_import.get_modules("R4")
+    assert modules[0] == ".fhirtypes"
+    assert ".observation" in modules
+    assert len(modules) == len(set(modules))
+
+
+def test_profile_import_report(capsys):
+    """ """
+    argv = ["--release", "DSTU2", "--module", ".patient", "--module", ".fhirtypes"]
+    assert profile_import.main(argv + ["--json"]) == 0
+    results = json.loads(capsys.readouterr().out)
+    assert {r["module"] for r in results} == {".patient", ".fhirtypes"}
+    patient = [r for r in results if r["module"] == ".patient"][0]
+    assert patient["release"] == "DSTU2"
+    assert patient["time"] > 0
+    assert patient["memory"] > 0
+    assert patient["classes"]["Patient"] == patient["fields"] - sum(
+        v for k, v in patient["classes"].items() if k != "Patient"
+    )
+
+    assert profile_import.main(argv + ["--no-memory", "--per-class"]) == 0
+    output = capsys.readouterr().out
+    assert "PatientContact" in output
+    assert "total: 2 modules" in output
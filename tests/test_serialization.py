@@ -0,0 +1,85 @@
+# _*_ coding: utf-8 _*_
+import io
+
+from fhir.resources.patient import Patient
+
+from .fixtures import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def test_serialization_plan():
+    """ """
+    plan = Patient.get_serialization_plan()
+    assert [item[1] for item in plan] == Patient.elements_sequence()
+    assert Patient.get_serialization_plan() is plan
+
+    items = {item[0]: item for item in plan}
+    # primitive with extension companion
+    assert items["birthDate"] == (
+        "birthDate",
+        "birthDate",
+        False,
+        False,
+        "birthDate__ext",
+        "_birthDate",
+    )
+    # list of complex type
+    assert items["name"] == ("name", "name", True, True, None, None)
+
+
+def test_dict_primitive_extension_list():
+    """ """
+    patient = Patient.parse_obj(
+        {
+            "resourceType": "Patient",
+            "name": [
+                {
+                    "given": ["Peter", "James"],
+                    "_given": [
+                        None,
+                        {"extension": [{"url": "http://ext", "valueCode": "c"}]},
+                    ],
+                }
+            ],
+            "contact": [{}],
+        }
+    )
+    data = patient.dict()
+    assert data["name"][0]["given"] == ["Peter", "James"]
+    assert data["name"][0]["_given"][0] is None
+    assert data["name"][0]["_given"][1]["extension"][0]["valueCode"] == "c"
+    # empty element inside list is kept as null
+    assert data["contact"] == [None]
+    assert list(patient.dict(by_alias=False)["name"][0].keys()) == [
+        "given",
+        "given__ext",
+    ]
+
+
+def test_dict_json_roundtrip(json_fixture):
+    """ """
+    klass, path = json_fixture
+    model = klass.parse_file(path)
+    model2 = klass.parse_raw(model.json())
+    assert model2.dict() == model.dict()
+    assert model2.json() == model.json()
+    assert "fhir_comments" not in model.json(exclude_comments=True)
+
+
+def test_json_stream():
+    """ """
+    patient = Patient.parse_file(STATIC_PATH / "Patient-with-ext.json")
+    for params in (
+        {},
+        {"exclude_none": False},
+        {"by_alias": False},
+        {"exclude_comments": True},
+    ):
+        stream = io.BytesIO()
+        assert patient.json(stream=stream, **params) is None
+        assert stream.getvalue() == patient.json(return_bytes=True, **params)
+
+        text_stream = io.StringIO()
+        patient.json(stream=text_stream, **params)
+        assert text_stream.getvalue() == patient.json(**params)
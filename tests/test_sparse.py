@@ -0,0 +1,69 @@
+# _*_ coding: utf-8 _*_
+import pickle
+
+import pytest  # type: ignore
+from pydantic import ValidationError
+from pydantic.main import validate_model
+
+from fhir.resources.extension import Extension
+from fhir.resources.patient import Patient
+from fhir.resources.STU3.extension import Extension as ExtensionSTU3
+
+from .fixtures import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def test_sparse_extension():
+    """ """
+    data = {
+        "url": "http://example.org/fhir/StructureDefinition/birthPlace",
+        "valueCodeableConcept": {"coding": [{"code": "a"}]},
+        "extension": [{"url": "http://example.org/nested", "valueDate": "2021-01"}],
+    }
+    model = Extension.parse_obj(data)
+    assert set(model.__dict__) == {"url", "valueCodeableConcept", "extension"}
+    assert set(model.extension[0].__dict__) == {"url", "valueDate"}
+    assert model.__fields_set__ == {"url", "valueCodeableConcept", "extension"}
+    # same attribute API and output
+    assert model.valueString is None
+    assert model.resource_type == "Extension"
+    assert model.dict() == data
+    assert Extension(**data) == model
+    assert pickle.loads(pickle.dumps(model)) == model
+    assert '<valueDate value="2021-01"/>' in model.xml()
+    assert ExtensionSTU3.parse_obj({"url": "a", "valueString": "b"}).__dict__ == {
+        "url": "a",
+        "valueString": "b",
+    }
+
+    # choice rule is still checked on assignment
+    model.valueCodeableConcept = None
+    model.valueString = "b"
+    with pytest.raises(ValidationError):
+        model.valueBoolean = True
+    patient = Patient.parse_file(STATIC_PATH / "Patient-with-ext.json")
+    assert set(patient.extension[0].__dict__) == {"url", "valueReference"}
+
+
+def test_sparse_extension_errors():
+    """Errors are the same as of full validation."""
+    for data in (
+        {"url": "http://a", "valueString": "x", "valueCode": "y"},
+        {"url": "http://a", "valueString": "x", "foo": 1, "bar": 2},
+        {"url": 1, "valueInteger": "abc"},
+        {"id": "x y", "url": "a b", "valueQuantity": {"value": "x"}},
+        {"url": "http://a", "valueDateTime": "2021-13"},
+    ):
+        with pytest.raises(ValidationError) as exc_info:
+            Extension.parse_obj(data)
+        assert exc_info.value.errors() == validate_model(Extension, data)[2].errors()
+
+    with pytest.raises(ValidationError) as exc_info:
+        Patient.parse_obj(
+            {
+                "resourceType": "Patient",
+                "extension": [{"url": "a", "valueString": "x", "valueCode": "y"}],
+            }
+        )
+    assert exc_info.value.errors()[0]["loc"] == ("extension", 0, "__root__")
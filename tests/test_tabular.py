@@ -0,0 +1,188 @@
+# _*_ coding: utf-8 _*_
+import datetime
+import decimal
+import json
+
+import pytest  # type: ignore
+
+from fhir.resources.bundle import Bundle
+from fhir.resources.observation import Observation
+from fhir.resources.patient import Patient
+from fhir.resources.STU3.observation import Observation as ObservationSTU3
+from fhir.resources.tabular import compile_path, extract_columns, extract_extension
+
+from .fixtures import STATIC_PATH
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+PATHS = [
+    "Observation.subject.reference",
+    "code.coding[0].code",
+    "code.coding.system",
+    "valueQuantity.value",
+    "effectiveDateTime",
+    "referenceRange[3].low.value",
+]
+
+
+def load_data(count=3):
+    """ """
+    data = json.loads((STATIC_PATH / "Observation.json").read_bytes())
+    items = list()
+    for i in range(count):
+        item = dict(data, effectiveDateTime=f"2021-0{i + 1}-01")
+        items.append(item)
+    items[-1].pop("subject")
+    return items
+
+
+def test_compile_path():
+    """ """
+    path = compile_path(Observation, "Observation.code.coding[0].code")
+    assert [step.alias for step in path.steps] == ["code", "coding", "code"]
+    assert path.steps[1].index == 0
+    path = compile_path(Bundle, "entry[0].resource.id")
+    assert path.steps[-1].name is None
+
+    for invalid in (
+        "code.unknown",
+        "code[0].text",
+        "status.value",
+        "code.coding[x]",
+        "resourceType",
+    ):
+        with pytest.raises(ValueError):
+            compile_path(Observation, invalid)
+
+
+def test_extract_columns():
+    """ """
+    items = load_data()
+    models = [Observation.parse_obj(item) for item in items]
+    columns = extract_columns(models, PATHS)
+    assert list(columns) == PATHS
+    assert columns["Observation.subject.reference"] == ["#newborn", "#newborn", None]
+    assert columns["code.coding[0].code"] == ["9273-4"] * 3
+    assert columns["code.coding.system"] == [["http://loinc.org"]] * 3
+    assert columns["valueQuantity.value"] == [decimal.Decimal("5")] * 3
+    assert columns["effectiveDateTime"][1] == datetime.date(2021, 2, 1)
+    assert columns["referenceRange[3].low.value"] == [None] * 3
+
+    raw = extract_columns(items, PATHS)
+    assert raw["code.coding[0].code"] == columns["code.coding[0].code"]
+    assert raw["effectiveDateTime"][1] == "2021-02-01"
+    assert raw["valueQuantity.value"] == [5] * 3
+
+    # lazy models and polymorphic resource
+    lazy = [Observation.parse_obj_lazy(item) for item in items]
+    assert extract_columns(lazy, PATHS) == columns
+    bundle = Bundle.parse_obj(
+        {
+            "resourceType": "Bundle",
+            "type": "collection",
+            "entry": [{"resource": items[0]}],
+        }
+    )
+    assert extract_columns([bundle], ["entry[0].resource.subject.reference"]) == {
+        "entry[0].resource.subject.reference": ["#newborn"]
+    }
+
+    # other release
+    data = json.loads((STATIC_PATH / "Observation.json").read_bytes())
+    data.pop("code")
+    data["code"] = {"coding": [{"system": "http://loinc.org", "code": "29463-7"}]}
+    columns = extract_columns(
+        [data], ["code.coding[0].code"], release="STU3", output="list"
+    )
+    assert columns["code.coding[0].code"] == ["29463-7"]
+    assert extract_columns([], ["status"], model_class=ObservationSTU3) == {
+        "status": []
+    }
+    with pytest.raises(ValueError):
+        extract_columns(items, ["status"], output="csv")
+
+
+def test_extract_columns_numpy_arrow():
+    """ """
+    numpy = pytest.importorskip("numpy")
+    models = [Observation.parse_obj(item) for item in load_data()]
+    columns = extract_columns(models, PATHS, output="numpy")
+    assert isinstance(columns["code.coding[0].code"], numpy.ndarray)
+    assert columns["Observation.subject.reference"].dtype == object
+    assert columns["code.coding.system"].shape == (3,)
+
+    pytest.importorskip("pyarrow")
+    table = extract_columns(models, PATHS, output="arrow")
+    assert table.num_rows == 3
+    assert table.column("effectiveDateTime").to_pylist()[0] == datetime.date(2021, 1, 1)
+    mixed = [Observation.parse_obj(dict(load_data(1)[0], effectiveDateTime="2021"))]
+    table = extract_columns(models + mixed, ["effectiveDateTime"], output="arrow")
+    assert table.column("effectiveDateTime").to_pylist()[-2:] == [
+        "2021-03-01",
+        "2021",
+    ]
+
+
+def test_extract_extension():
+    """ """
+    data = json.loads((STATIC_PATH / "Patient-with-ext.json").read_bytes())
+    items = [data, {"resourceType": "Patient"}]
+    models = [Patient.parse_obj(item) for item in items]
+    ext = "http://example.org/fhir/StructureDefinition/"
+
+    complex_ = ext + "complexExtensionExample"
+    assert extract_extension(items, (complex_, "nestedB", "nestedB1")) == [
+        "hello",
+        None,
+    ]
+    assert extract_extension(models, (complex_, "nestedB", "nestedB1")) == [
+        "hello",
+        None,
+    ]
+    assert extract_extension(items, complex_) == [None, None]
+    assert extract_extension(models, complex_, value=False) == [
+        models[0].extension[1],
+        None,
+    ]
+    assert extract_extension(items, ext + "recordStatus", path="active__ext") == [
+        "archived",
+        None,
+    ]
+    assert extract_extension(
+        models, ext + "nullFlavor", path="Patient.maritalStatus"
+    ) == ["ASKU", None]
+    assert extract_extension(models, ext + "nullFlavor", path="name") == [[], None]
+    assert extract_extension([], "url") == []
+    with pytest.raises(ValueError):
+        extract_extension(items, ())
+
+
+def test_extract_columns_dict_output():
+    """``dict()`` output of models (``OrderedDict``) is raw input as well."""
+    observation = Observation.parse_obj(load_data(1)[0])
+    bundle = Bundle(type="collection", entry=[{"resource": observation}])
+    expected = extract_columns([bundle], ["entry.resource.status"])
+    assert expected == {"entry.resource.status": [["final"]]}
+    assert extract_columns([bundle.dict()], ["entry.resource.status"]) == expected
+    assert extract_columns([observation.dict()], ["code.coding[0].code"]) == (
+        extract_columns([observation], ["code.coding[0].code"])
+    )
+
+
+def test_extract_columns_dstu2():
+    """ """
+    from fhir.resources.DSTU2.patient import Patient as PatientDSTU2
+
+    patient = PatientDSTU2.parse_obj(
+        {
+            "resourceType": "Patient",
+            "gender": "male",
+            "name": [{"family": ["Chalmers"]}],
+            "extension": [{"url": "http://a", "valueString": "b"}],
+        }
+    )
+    paths = ["gender", "name[0].family"]
+    expected = {"gender": ["male"], "name[0].family": [["Chalmers"]]}
+    assert extract_columns([patient], paths) == expected
+    assert extract_columns([patient.dict()], paths, release="DSTU2") == expected
+    assert extract_extension([patient, patient.dict()], "http://a") == ["b", "b"]
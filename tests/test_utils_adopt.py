@@ -0,0 +1,75 @@
+# _*_ coding: utf-8 _*_
+import pytest  # type: ignore
+from pydantic import ValidationError
+
+from fhir.resources.bundle import Bundle, BundleEntry
+from fhir.resources.observation import Observation
+from fhir.resources.patient import Patient
+from fhir.resources.quantity import Quantity
+from fhir.resources.STU3.patient import Patient as PatientSTU3
+from fhir.resources.utils.adopt import adopting, is_adopting
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def make_resources():
+    """ """
+    patient = Patient.parse_obj({"resourceType": "Patient", "id": "p1"})
+    observation = Observation.parse_obj(
+        {
+            "resourceType": "Observation",
+            "status": "final",
+            "code": {"text": "heart rate"},
+            "valueString": "72",
+        }
+    )
+    return patient, observation
+
+
+def test_adopting():
+    """ """
+    patient, observation = make_resources()
+    assert is_adopting() is False
+    with adopting():
+        assert is_adopting() is True
+        entries = [BundleEntry(resource=patient), BundleEntry(resource=observation)]
+        bundle = Bundle(type="collection")
+        bundle.entry = entries
+    assert is_adopting() is False
+
+    # stored by reference, list included
+    assert bundle.entry is entries
+    assert bundle.entry[0].resource is patient
+    assert entries[0].__fields_set__ == {"resource"}
+    patient.gender = "female"
+    assert bundle.entry[0].resource.gender == "female"
+    assert bundle.dict()["entry"][0]["resource"]["gender"] == "female"
+
+    # default mode, items are validated (still by reference)
+    bundle = Bundle(type="collection")
+    bundle.entry = entries
+    assert bundle.entry is not entries
+    assert bundle.entry[1] is entries[1]
+
+
+def test_adopting_validates_others():
+    """ """
+    patient, observation = make_resources()
+    with adopting():
+        # instance of other class
+        with pytest.raises(ValidationError):
+            BundleEntry(request=patient)
+        with pytest.raises(ValidationError):
+            BundleEntry(link=[PatientSTU3.parse_obj({"resourceType": "Patient"})])
+        # raw values
+        entry = BundleEntry(resource={"resourceType": "Patient", "id": "p2"})
+        assert isinstance(entry.resource, Patient)
+        # required elements of the class
+        with pytest.raises(ValidationError):
+            Bundle(entry=[entry])
+        # choice element
+        with pytest.raises(ValidationError):
+            observation.valueQuantity = Quantity(value=72)
+        with pytest.raises(ValidationError):
+            observation.code = patient
+    assert observation.valueQuantity is None
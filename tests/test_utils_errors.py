@@ -0,0 +1,138 @@
+# _*_ coding: utf-8 _*_
+import json
+
+import pytest  # type: ignore
+from pydantic import ValidationError
+
+from fhir.resources.bundle import Bundle
+from fhir.resources.DSTU2.patient import Patient as PatientDSTU2
+from fhir.resources.observation import Observation
+from fhir.resources.utils import errors
+
+from .fixtures import STATIC_PATH, load_json_fixture, make_bundle
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def make_invalid_bundle(count):
+    """Every second entry is invalid."""
+    observation = load_json_fixture("Observation.json")
+    invalid = load_json_fixture("Observation.json")
+    invalid["code"]["coding"][0]["system"] = {"x": 1}
+    return make_bundle(
+        *[index % 2 and invalid or observation for index in range(count)]
+    )
+
+
+def test_parse_obj_collect():
+    """ """
+    data = make_invalid_bundle(6)
+    model, errors_ = Bundle.parse_obj_collect(data)
+    assert model is None
+    with pytest.raises(ValidationError) as exc_info:
+        Bundle.parse_obj(data)
+    assert len(errors_) == len(exc_info.value.errors()) == 3
+    assert errors_[0] == errors.FHIRPathError(
+        "Bundle.entry[1].resource.code.coding[0].system",
+        "type_error.str",
+        "str type expected",
+    )
+    assert errors_[2].path == "Bundle.entry[5].resource.code.coding[0].system"
+
+    data = load_json_fixture("Observation.json")
+    model, errors_ = Observation.parse_obj_collect(json.dumps(data))
+    assert model.resource_type == "Observation"
+    assert errors_ == []
+    del data["status"]
+    model, errors_ = Observation.parse_obj_collect(data)
+    assert errors_ == [
+        errors.FHIRPathError(
+            "Observation.status", "value_error.missing", "field required"
+        )
+    ]
+    issue = errors.make_outcome_issues(errors_, "location")[0]
+    assert (issue["code"], issue["location"]) == ("required", ["Observation.status"])
+
+    model, errors_ = Observation.parse_obj_collect(b"{")
+    assert [e.type for e in errors_] == ["value_error.jsondecode"]
+
+    # any release
+    model, errors_ = errors.validate_collect(PatientDSTU2, {"active": "x"})
+    assert errors_[0].path == "Patient.active"
+
+
+def test_parse_obj_collect_limit():
+    """ """
+    data = make_invalid_bundle(100)
+    with errors.collect_errors(3) as collector:
+        model, errors_ = Bundle.parse_obj_collect(data, limit=3)
+        assert errors.get_error_collector() is collector
+    assert errors.get_error_collector() is None
+    assert model is None
+    assert len(errors_) == 4
+    assert errors_[2].path == "Bundle.entry[5].resource.code.coding[0].system"
+    assert errors_[-1].path == "Bundle"
+    assert errors_[-1].type == "value_error.error_limit"
+
+    issues = errors.make_outcome_issues(errors_)
+    assert issues[0]["expression"] == ["Bundle.entry[1].resource.code.coding[0].system"]
+    assert [i["code"] for i in issues] == ["value", "value", "value", "too-costly"]
+    assert issues[-1]["severity"] == "information"
+
+
+def test_parse_obj_collect_unknown_resource_type():
+    """ """
+    from fhir.resources.DSTU2.bundle import Bundle as BundleDSTU2
+    from fhir.resources.STU3.bundle import Bundle as BundleSTU3
+
+    data = make_bundle({"resourceType": "Foo"})
+    for bundle_class in (Bundle, BundleSTU3, BundleDSTU2):
+        model, errors_ = errors.validate_collect(bundle_class, data)
+        assert model is None
+        assert [(e.path, e.type) for e in errors_] == [
+            ("Bundle.entry[0].resource", "value_error.wrong.resource_type")
+        ]
+
+    model, outcome = Bundle.validate_with_outcome(data)
+    assert model is None
+    assert [i.expression for i in outcome.issue] == [["Bundle.entry[0].resource"]]
+
+
+def test_validate_with_outcome():
+    """ """
+    from fhir.resources.DSTU2.operationoutcome import (
+        OperationOutcome as OperationOutcomeDSTU2,
+    )
+    from fhir.resources.operationoutcome import OperationOutcome
+    from fhir.resources.STU3.operationoutcome import (
+        OperationOutcome as OperationOutcomeSTU3,
+    )
+    from fhir.resources.STU3.patient import Patient as PatientSTU3
+
+    model, outcome = Bundle.validate_with_outcome(make_invalid_bundle(10), limit=2)
+    assert model is None
+    assert isinstance(outcome, OperationOutcome)
+    assert [i.code for i in outcome.issue] == ["value", "value", "too-costly"]
+    assert outcome.issue[1].expression == [
+        "Bundle.entry[3].resource.code.coding[0].system"
+    ]
+    # outcome is valid resource
+    assert OperationOutcome.parse_raw(outcome.json()).json() == outcome.json()
+
+    model, outcome = Observation.validate_with_outcome(
+        (STATIC_PATH / "Observation.json").read_bytes()
+    )
+    assert model.resource_type == "Observation"
+    assert [(i.severity, i.code) for i in outcome.issue] == [
+        ("information", "informational")
+    ]
+
+    model, outcome = PatientSTU3.validate_with_outcome({"active": "x"})
+    assert isinstance(outcome, OperationOutcomeSTU3)
+    assert outcome.issue[0].expression == ["Patient.active"]
+
+    outcome = errors.make_operation_outcome(
+        PatientDSTU2, errors.validate_collect(PatientDSTU2, {"active": "x"})[1]
+    )
+    assert isinstance(outcome, OperationOutcomeDSTU2)
+    assert outcome.issue[0].location == ["Patient.active"]
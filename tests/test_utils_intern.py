@@ -0,0 +1,86 @@
+# _*_ coding: utf-8 _*_
+import json
+
+import pytest  # type: ignore
+from pydantic import ValidationError
+
+from fhir.resources.bundle import Bundle
+from fhir.resources.DSTU2.coding import Coding as CodingDSTU2
+from fhir.resources.observation import Observation
+from fhir.resources.utils.intern import (
+    StringInterner,
+    disable_interning,
+    enable_interning,
+    get_interner,
+    interning,
+)
+
+from .fixtures import load_json_fixture, make_bundle
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def test_string_interner():
+    """ """
+    interner = StringInterner(maxsize=2)
+    first = "".join(["http://", "loinc.org"])
+    second = "".join(["http://", "loinc.org"])
+    assert first is not second
+    assert interner.intern(first) is first
+    assert interner.intern(second) is first
+    assert (interner.hits, interner.misses) == (1, 1)
+
+    interner.intern("a")
+    interner.intern(first)
+    # least recently used is evicted
+    interner.intern("b")
+    assert len(interner) == 2
+    assert interner.intern("".join(["a"])) == "a"
+    assert interner.misses == 4
+
+    interner.clear()
+    assert len(interner) == 0
+    with pytest.raises(ValueError):
+        StringInterner(maxsize=0)
+
+
+def test_interning_parse():
+    """ """
+    data = json.dumps(make_bundle(*[load_json_fixture("Observation.json")] * 3))
+    model = Bundle.parse_raw(data)
+    systems = [e.resource.code.coding[0].system for e in model.entry]
+    assert systems[0] is not systems[1]
+
+    with interning() as interner:
+        model = Bundle.parse_raw(data)
+        assert interner.hits > 0
+    assert get_interner() is None
+
+    entries = [e.resource for e in model.entry]
+    assert entries[0].code.coding[0].system is entries[1].code.coding[0].system
+    assert entries[0].code.coding[0].code is entries[2].code.coding[0].code
+    # narrative is not interned by default
+    assert entries[0].text.div is not entries[1].text.div
+    assert model.dict() == Bundle.parse_raw(data).dict()
+
+    # constraints are still validated
+    with interning():
+        with pytest.raises(ValidationError):
+            Observation.parse_obj(dict(entries[0].dict(), status="final  status"))
+
+
+def test_interning_types_and_release():
+    """ """
+    interner = enable_interning(maxsize=10, types=["code", "string"])
+    try:
+        data = json.dumps(
+            {"system": "http://loinc.org", "code": "8867-4", "display": "Heart rate"}
+        )
+        first = CodingDSTU2.parse_raw(data)
+        second = CodingDSTU2.parse_raw(data)
+        assert first.code is second.code
+        assert first.display is second.display
+        assert first.system is not second.system
+        assert len(interner) == 2
+    finally:
+        disable_interning()
@@ -0,0 +1,129 @@
+# _*_ coding: utf-8 _*_
+import io
+import json
+
+import pytest  # type: ignore
+from pydantic import ValidationError
+
+from fhir.resources import iter_bundle_entries
+from fhir.resources.utils.jsonstream import JSONStreamReader
+
+from .fixtures import load_json_fixture, make_bundle
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def make_searchset(**extra):
+    """``extra`` elements follow ``entry``."""
+    bundle = make_bundle(
+        load_json_fixture("Patient-with-ext.json"),
+        load_json_fixture("Observation.json"),
+        bundle_type="searchset",
+        total=2,
+        link=[{"relation": "self", "url": "http://example.org/Patient"}],
+    )
+    bundle["entry"][0]["fullUrl"] = "http://example.org/Patient/1"
+    bundle["entry"][1]["search"] = {"mode": "include"}
+    bundle.update(extra)
+    return bundle
+
+
+def test_json_stream_reader_small_chunks():
+    """ """
+    data = '{"a": 12345, "b": [true, null, "x\\u00e9"], "c": {"d": 1.5e3}}'
+    for chunk_size in (1, 2, 5, 1024):
+        reader = JSONStreamReader(io.BytesIO(data.encode()), chunk_size=chunk_size)
+        assert dict(reader.iter_object()) == json.loads(data)
+
+
+def test_iter_bundle_entries():
+    """ """
+    bundle = make_searchset()
+    stream = iter_bundle_entries(
+        io.BytesIO(json.dumps(bundle, indent=2).encode()), chunk_size=16
+    )
+    assert stream.header.type == "searchset"
+    assert stream.header.total == 2
+    assert stream.header.link[0].relation == "self"
+    assert stream.header.entry is None
+
+    entries = list(stream)
+    assert len(entries) == 2
+    assert entries[0].resource.resource_type == "Patient"
+    assert entries[1].resource.resource_type == "Observation"
+    assert entries[1].search.mode == "include"
+
+
+def test_iter_bundle_entries_from_file(tmp_path):
+    """ """
+    signature = {
+        "type": [{"system": "urn:iso-astm:E1762-95:2013", "code": "1.2.840.10065"}],
+        "when": "2021-01-01T00:00:00Z",
+        "who": {"reference": "Practitioner/1"},
+    }
+    path = tmp_path / "bundle.json"
+    path.write_text(json.dumps(make_searchset(signature=signature)))
+
+    stream = iter_bundle_entries(path)
+    assert stream.header.signature is None
+    assert [e.fullUrl for e in stream] == ["http://example.org/Patient/1", None]
+    # elements after entry are merged into header
+    assert stream.header.signature.who.reference == "Practitioner/1"
+
+
+def test_iter_bundle_entries_invalid_entry():
+    """ """
+    bundle = make_searchset()
+    bundle["entry"][1]["resource"]["unknown"] = True
+    stream = iter_bundle_entries(io.BytesIO(json.dumps(bundle).encode()))
+    with pytest.raises(ValidationError) as exc_info:
+        list(stream)
+    assert exc_info.value.errors()[0]["loc"][:3] == ("entry", 1, "resource")
+
+
+def test_iter_bundle_entries_entry_first():
+    """Required elements after ``entry``, header is validated at the end."""
+    bundle = make_searchset()
+    bundle = {"entry": bundle.pop("entry"), **bundle}
+    assert list(bundle)[:2] == ["entry", "resourceType"]
+    stream = iter_bundle_entries(io.BytesIO(json.dumps(bundle).encode()))
+    assert stream.header is None
+    assert len(list(stream)) == 2
+    assert stream.header.type == "searchset"
+    assert stream.header.total == 2
+
+    # still missing
+    del bundle["type"]
+    stream = iter_bundle_entries(io.BytesIO(json.dumps(bundle).encode()))
+    with pytest.raises(ValidationError) as exc_info:
+        list(stream)
+    assert exc_info.value.errors()[0]["type"] == "value_error.missing"
+
+    # invalid element is reported right away, when nothing is missing
+    bundle = make_searchset(total="many")
+    bundle = {"entry": bundle.pop("entry"), **bundle}
+    bundle = {"type": bundle.pop("type"), "total": bundle.pop("total"), **bundle}
+    with pytest.raises(ValidationError) as exc_info:
+        iter_bundle_entries(io.BytesIO(json.dumps(bundle).encode()))
+    assert exc_info.value.errors()[0]["loc"] == ("total",)
+
+
+def test_iter_bundle_entries_truncated():
+    """ """
+    data = json.dumps(make_searchset(signature={"when": "2021-01-01T00:00:00Z"}))
+    end_of_entry = data.index('"search"')
+    stream = iter_bundle_entries(io.BytesIO(data[:end_of_entry].encode()))
+    with pytest.raises(ValidationError) as exc_info:
+        list(stream)
+    assert exc_info.value.errors()[0]["loc"] == ("entry", 1)
+    assert exc_info.value.errors()[0]["type"] == "value_error.jsondecode"
+
+    stream = iter_bundle_entries(io.BytesIO(data[:-5].encode()))
+    with pytest.raises(ValidationError) as exc_info:
+        list(stream)
+    assert exc_info.value.errors()[0]["loc"] == ("__root__",)
+
+    # broken before entry
+    with pytest.raises(ValidationError) as exc_info:
+        iter_bundle_entries(io.BytesIO(data[:20].encode()))
+    assert exc_info.value.errors()[0]["loc"] == ("__root__",)
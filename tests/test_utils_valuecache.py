@@ -0,0 +1,109 @@
+# _*_ coding: utf-8 _*_
+import datetime
+
+import pytest  # type: ignore
+from pydantic import ValidationError
+
+from fhir.resources import fhirtypes
+from fhir.resources.coding import Coding
+from fhir.resources.DSTU2 import fhirtypes as fhirtypes_dstu2
+from fhir.resources.DSTU2.coding import Coding as CodingDSTU2
+from fhir.resources.observation import Observation
+from fhir.resources.utils.valuecache import ValueCache
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+
+def test_value_cache():
+    """ """
+    cache = ValueCache(maxsize=2)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    # least recently used is evicted
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache = ValueCache(maxsize=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_cached_constrained_str():
+    """ """
+    fhirtypes.Code.clear_value_cache()
+    data = {"system": "http://loinc.org", "code": "8867-4"}
+    for _ in range(3):
+        coding = Coding.parse_obj(data)
+        assert coding.code == "8867-4"
+        assert coding.system == "http://loinc.org"
+    assert fhirtypes.Code.__value_cache__.hits == 2
+    assert fhirtypes.Uri.__value_cache__ is not fhirtypes.Canonical.__value_cache__
+    # each release has own cache
+    CodingDSTU2.parse_obj(data)
+    assert len(fhirtypes_dstu2.Code.__value_cache__) > 0
+
+    # invalid values are never cached
+    for _ in range(2):
+        with pytest.raises(ValidationError) as exc_info:
+            Coding.parse_obj({"code": "8867  4"})
+        assert exc_info.value.errors()[0]["type"] == "value_error.str.regex"
+    assert "8867  4" not in fhirtypes.Code.__value_cache__._table
+    # non str values are converted as before
+    assert Coding.parse_obj({"code": 8867}).code == "8867"
+
+
+def test_cache_cleared_by_constraints():
+    """ """
+    data = {"resourceType": "Observation", "status": "final", "id": "a" * 70}
+    data["code"] = {"text": "heart rate"}
+    min_length, max_length = fhirtypes.Id.min_length, fhirtypes.Id.max_length
+    fhirtypes.Id.configure_constraints(max_length=100)
+    try:
+        assert Observation.parse_obj(data).id == "a" * 70
+        fhirtypes.Id.configure_constraints(max_length=64)
+        with pytest.raises(ValidationError):
+            Observation.parse_obj(data)
+    finally:
+        fhirtypes.Id.configure_constraints(min_length=min_length, max_length=max_length)
+
+
+def test_cached_date_time():
+    """ """
+    data = {"resourceType": "Observation", "status": "final"}
+    data["code"] = {"text": "heart rate"}
+    for _ in range(2):
+        for value, expected in (
+            ("2021", "2021"),
+            ("2021-03", "2021-03"),
+            ("2021-03-04", datetime.date(2021, 3, 4)),
+            (
+                "2021-03-04T10:11:12+01:00",
+                datetime.datetime(
+                    2021,
+                    3,
+                    4,
+                    10,
+                    11,
+                    12,
+                    tzinfo=datetime.timezone(datetime.timedelta(hours=1)),
+                ),
+            ),
+        ):
+            model = Observation.parse_obj(
+                dict(data, effectiveDateTime=value, issued="2021-03-04T10:11:12Z")
+            )
+            assert model.effectiveDateTime == expected
+            assert model.issued.tzinfo is not None
+        assert fhirtypes.Date.validate("2021-03") == "2021-03"
+        assert fhirtypes.Date.validate("2021-03-04") == datetime.date(2021, 3, 4)
+
+        with pytest.raises(ValidationError):
+            Observation.parse_obj(dict(data, effectiveDateTime="2021-13"))
+        with pytest.raises(ValidationError):
+            Observation.parse_obj(dict(data, issued="2021-03-04"))
+    assert fhirtypes.DateTime.__value_cache__.hits >= 4
+    assert fhirtypes.Instant.__value_cache__.hits >= 2
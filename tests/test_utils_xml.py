@@ -1,9 +1,13 @@
+import io
 import sys
 from http import client
 
 import lxml.etree  # type: ignore
+import pytest  # type: ignore
+from pydantic import ValidationError
 
-from fhir.resources import utils
+from fhir.resources import iter_bundle_entries, utils
+from fhir.resources.bundle import Bundle
 from fhir.resources.observation import Observation
 from fhir.resources.patient import Patient
 
@@ -82,7 +86,8 @@ def test_element_to_node():
     schema = lxml.etree.XMLSchema(file=str(FHIR_XSD_DIR / "patient.xsd"))
     xmlparser = lxml.etree.XMLParser(schema=schema)
     element = lxml.etree.fromstring(
-        (STATIC_PATH / "Patient-with-ext.xml").read_bytes(), parser=xmlparser,
+        (STATIC_PATH / "Patient-with-ext.xml").read_bytes(),
+        parser=xmlparser,
     )
     patient_node = utils.xml.Node.from_element(element)
     try:
@@ -107,3 +112,139 @@ def test_model_obj_xml_file():
     patient.contained[1].text = None
     patient3.contained[1].text = None
     assert patient3 == patient
+
+
+XML_WITH_COMMENTS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Patient xmlns="http://hl7.org/fhir">
+  <!-- patient id -->
+  <id value="example"/>
+  <text><status value="generated"/><div xmlns="http://www.w3.org/1999/xhtml">
+  <p>Peter</p></div></text>
+  <contained><!-- inner --><Patient><id value="p1"/></Patient></contained>
+  <active value="true"><!-- inside -->
+    <extension url="http://example.org/ext"><valueString value="v"/></extension>
+  </active>
+  <!-- first --><!-- second -->
+  <name>
+    <given value="Peter"/>
+    <given value="James">
+      <extension url="http://example.org/ext"><valueCode value="MID"/></extension>
+    </given>
+  </name>
+</Patient>"""
+
+
+def test_model_from_element():
+    """ """
+    for data in (
+        XML_WITH_COMMENTS,
+        (STATIC_PATH / "Patient-with-ext.xml").read_bytes(),
+        Patient.parse_file(STATIC_PATH / "Patient-with-ext.json").xml(
+            return_bytes=True, pretty_print=True
+        ),
+    ):
+        element = lxml.etree.fromstring(data)
+        expected = utils.xml.Node.from_element(element).to_fhir(Patient)
+        patient = utils.xml.model_from_element(element, Patient)
+        assert patient.json() == expected.json()
+
+    patient = Patient.parse_raw(XML_WITH_COMMENTS, content_type="text/xml")
+    assert patient.id__ext.fhir_comments == " patient id "
+    assert patient.contained[0].fhir_comments == " inner "
+    assert patient.active__ext.extension[0].fhir_comments == " inside "
+    assert patient.name[0].fhir_comments == [" first ", " second "]
+    assert patient.name[0].given__ext[0] is None
+    assert patient.name[0].given__ext[1].extension[0].valueCode == "MID"
+
+
+def test_xml_descriptor():
+    """ """
+    descriptor = utils.xml.get_xml_descriptor(Patient)
+    assert descriptor is utils.xml.get_xml_descriptor(Patient)
+    assert [f.alias for f in descriptor.sequence] == Patient.elements_sequence()
+
+    field = descriptor.fields["active"]
+    assert (field.kind, field.is_list) == (utils.xml.XML_PRIMITIVE, False)
+    assert field.ext_field.name == "active__ext"
+    field = descriptor.fields["name"]
+    assert (field.kind, field.is_list) == (utils.xml.XML_MODEL, True)
+    assert field.target.get_resource_type() == "HumanName"
+    assert field.ext_field is None
+    assert descriptor.fields["contained"].kind == utils.xml.XML_RESOURCE
+    assert descriptor.fields["text"].target.get_resource_type() == "Narrative"
+
+    descriptor = utils.xml.get_xml_descriptor(descriptor.extension_class)
+    assert descriptor.fields["url"].is_attribute is True
+    assert descriptor.fields["valueString"].is_attribute is False
+
+
+def test_iter_bundle_entries_xml(tmp_path):
+    """ """
+    observation = Observation.parse_file(STATIC_PATH / "Observation.json")
+    patient = Patient.parse_file(STATIC_PATH / "Patient-with-ext.json")
+    bundle = Bundle(
+        type="searchset",
+        total=2,
+        entry=[
+            {"fullUrl": "http://example.org/Patient/1", "resource": patient},
+            {"resource": observation, "search": {"mode": "include"}},
+        ],
+        signature={
+            "type": [{"system": "urn:iso-astm:E1762-95:2013", "code": "1.2"}],
+            "when": "2021-01-01T00:00:00Z",
+            "who": {"reference": "Practitioner/1"},
+        },
+    )
+    path = tmp_path / "bundle.xml"
+    path.write_bytes(bundle.xml(return_bytes=True, pretty_print=True))
+
+    stream = iter_bundle_entries(path)
+    assert stream.header.type == "searchset"
+    assert stream.header.entry is None
+    assert stream.header.signature is None
+    entries = list(stream)
+    assert [e.json() for e in entries] == [
+        e.json() for e in Bundle.parse_file(path).entry
+    ]
+    # elements after entry are merged into header
+    assert stream.header.signature.who.reference == "Practitioner/1"
+
+    data = path.read_bytes().replace(b"<fullUrl", b"<!-- first --><fullUrl", 1)
+    stream = iter_bundle_entries(io.BytesIO(data), content_type="application/fhir+xml")
+    assert next(iter(stream)).fullUrl__ext.fhir_comments == " first "
+
+    data = path.read_bytes().replace(
+        b'<mode value="include"/>', b'<mode value="include"/><score value="x"/>', 1
+    )
+    stream = iter_bundle_entries(io.BytesIO(data), content_type="application/xml")
+    with pytest.raises(ValidationError) as exc_info:
+        list(stream)
+    assert exc_info.value.errors()[0]["loc"] == ("entry", 1, "search", "score")
+
+
+def test_xml_dump_stream():
+    """ """
+    for model in (
+        Patient.parse_raw(XML_WITH_COMMENTS, content_type="text/xml"),
+        Patient.parse_file(STATIC_PATH / "Patient-with-ext.xml"),
+        Observation.parse_file(STATIC_PATH / "Observation.json"),
+    ):
+        for params in (
+            {},
+            {"pretty_print": True},
+            {"xml_declaration": False, "pretty_print": True},
+        ):
+            stream = io.BytesIO()
+            assert model.xml(stream=stream, **params) is None
+            assert stream.getvalue() == model.xml(return_bytes=True, **params)
+
+        # text stream
+        stream = io.StringIO()
+        model.xml(stream=stream, pretty_print=True)
+        assert stream.getvalue() == model.xml(pretty_print=True)
+
+    patient = Patient.parse_raw(XML_WITH_COMMENTS, content_type="text/xml")
+    stream = io.BytesIO()
+    utils.xml_dump(patient, stream, with_comments=False)
+    assert b"<!--" not in stream.getvalue()
+    assert Patient.parse_raw(stream.getvalue(), content_type="text/xml").id == "example"
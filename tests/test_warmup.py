@@ -0,0 +1,74 @@
+# _*_ coding: utf-8 _*_
+import pytest  # type: ignore
+
+from fhir.resources import fhirtypesvalidators, warmup
+from fhir.resources.fhirabstractmodel import FHIRAbstractModel
+
+__author__ = "Md Nazrul Islam<email2nazrul@gmail.com>"
+
+PREPARED_METHODS = (
+    "has_resource_base",
+    "get_resource_type",
+    "get_element_rules",
+    "get_alias_mapping",
+    "get_serialization_plan",
+    "get_construct_plan",
+    "get_adoption_plan",
+    "get_sparse_plan",
+)
+
+
+def test_warmup_selected_resource_types():
+    """ """
+    # caches are shared by all classes, filled by other tests as well
+    for method in PREPARED_METHODS:
+        getattr(FHIRAbstractModel, method).cache_clear()
+
+    count = warmup("R4", ["Patient"])
+    assert count > 1
+    for name in ("Patient", "PatientContact", "HumanName", "Extension"):
+        assert fhirtypesvalidators.MODEL_CLASSES[name][0] is not None
+
+    klass = fhirtypesvalidators.get_fhir_model_class("PatientContact")
+    for method in PREPARED_METHODS:
+        misses = getattr(klass, method).cache_info().misses
+        getattr(klass, method)()
+        assert getattr(klass, method).cache_info().misses == misses, method
+
+
+def test_warmup_lazy_xml():
+    """ """
+    from fhir.resources.utils.xml import get_xml_descriptor
+
+    FHIRAbstractModel.get_lazy_class.cache_clear()
+    get_xml_descriptor.cache_clear()
+    warmup("R4", ["Annotation"])
+    assert FHIRAbstractModel.get_lazy_class.cache_info().currsize == 0
+    assert get_xml_descriptor.cache_info().currsize == 0
+
+    count = warmup("R4", ["Annotation"], lazy=True, xml=True)
+    assert FHIRAbstractModel.get_lazy_class.cache_info().currsize == count
+    assert get_xml_descriptor.cache_info().currsize == count
+
+    klass = fhirtypesvalidators.get_fhir_model_class("Annotation")
+    lazy_misses = FHIRAbstractModel.get_lazy_class.cache_info().misses
+    xml_misses = get_xml_descriptor.cache_info().misses
+    klass.get_lazy_class()
+    get_xml_descriptor(klass)
+    assert FHIRAbstractModel.get_lazy_class.cache_info().misses == lazy_misses
+    assert get_xml_descriptor.cache_info().misses == xml_misses
+
+
+def test_warmup_release():
+    """ """
+    from fhir.resources.DSTU2 import fhirtypesvalidators as dstu2_validators
+
+    assert warmup("DSTU2") == len(dstu2_validators.MODEL_CLASSES)
+    assert all(
+        klass is not None for klass, _ in dstu2_validators.MODEL_CLASSES.values()
+    )
+
+    with pytest.raises(LookupError):
+        warmup("R5")
+    with pytest.raises(LookupError):
+        warmup("R4", ["NotExists"])